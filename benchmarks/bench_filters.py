@@ -0,0 +1,69 @@
+"""Ignore-list and percentile filtering: frequency dict versus vectorized table.
+
+Builds a result with Zipf distributed counts over interned words and
+times the dictionary filters against filter_table on the array-backed table.
+"dict s" includes building the frequency dict, as /keywords used to run;
+"filters s" is the dictionary filters alone. The outputs are checked to be
+equal.
+
+Usage:
+    python -m benchmarks.bench_filters --words 1000000 --percentiles 0 50 90 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.frequency import FrequencyTable
+from src.vocabulary import WordCounts
+from utils.filters import filter_by_ignore_list, filter_by_percentile, filter_table
+
+IGNORE_LIST = ["a", "az", "the", "és", "of", "w1", "w2a", "W3F"]
+
+
+def build_table(words: int, seed: int) -> FrequencyTable:
+    rng = np.random.default_rng(seed)
+    counts = rng.zipf(1.2, words) % 1_000_000 + 1
+    word_counts = WordCounts()
+    word_counts.update({f"w{index:x}": count for index, count in enumerate(counts)})
+    return FrequencyTable.from_counts(word_counts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=1_000_000)
+    parser.add_argument("--percentiles", type=int, nargs="+", default=[0, 50, 90, 100])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    table = build_table(args.words, args.seed)
+    print(f"{len(table)} unique words, {table.total} total")
+    print(
+        f"{'percentile':<12}{'dict s':>10}{'filters s':>11}{'table s':>10}{'kept':>10}"
+    )
+    for percentile in args.percentiles:
+        start = time.perf_counter()
+        frequency_dict = table.to_dict()
+        filters_start = time.perf_counter()
+        expected = filter_by_percentile(
+            filter_by_ignore_list(frequency_dict, IGNORE_LIST), percentile
+        )
+        dict_seconds = time.perf_counter() - start
+        filters_seconds = time.perf_counter() - filters_start
+        del frequency_dict
+
+        start = time.perf_counter()
+        result = filter_table(table, IGNORE_LIST, percentile)
+        table_seconds = time.perf_counter() - start
+
+        status = "" if result.to_dict() == expected else "  OUTPUTS DIFFER"
+        print(
+            f"{percentile:<12}{dict_seconds:>10.3f}{filters_seconds:>11.3f}"
+            f"{table_seconds:>10.3f}"
+            f"{len(result):>10}{status}"
+        )
+
+
+if __name__ == "__main__":
+    main()
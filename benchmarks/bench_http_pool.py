@@ -0,0 +1,62 @@
+"""Connection reuse: per-request clients versus the app-wide shared pool.
+
+Fires many short depth-1 requests at a local stand-in server and counts the
+TCP connections it accepts. Against real Wikipedia every new connection also
+costs a TLS handshake, so the savings there are larger than measured here.
+
+Usage:
+    python -m benchmarks.bench_http_pool --requests 200 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import config
+from benchmarks.standin import StandInServer
+from src.http_client import create_http_client
+from src.wiki_client import WikiFrequencyCounter
+
+PAGE = '<div id="mw-content-text"><p>Short benchmark article</p></div>'
+
+
+async def run_requests(requests: int, concurrency: int, shared: bool) -> float:
+    client = create_http_client() if shared else None
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one_request(i: int):
+        async with limit:
+            await WikiFrequencyCounter(f"Article_{i}", 1, client=client).run()
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(one_request(i) for i in range(requests)))
+    finally:
+        if client:
+            await client.aclose()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    pages = {f"Article_{i}": PAGE for i in range(args.requests)}
+    print(f"{'client':<14}{'seconds':>10}{'req/s':>10}{'connections':>13}")
+    for shared in (False, True):
+        with StandInServer(pages) as server:
+            config.WIKIPEDIA_DOMAIN = server.url
+            elapsed = asyncio.run(run_requests(args.requests, args.concurrency, shared))
+            label = "shared pool" if shared else "per-request"
+            print(
+                f"{label:<14}{elapsed:>10.2f}{args.requests / elapsed:>10.1f}"
+                f"{server.connections:>13}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Peak memory of aggregating word counts: Counter versus interned vocabularies.
+
+Each path runs in a fresh process over the same synthetic traversals of
+``--articles`` articles each (Zipf distributed words, fresh string objects per
+article as a parser produces them). Like a long-running server, one process
+runs ``--traversals`` traversals one after another, keeps per-level counts as a
+depth-incremental traversal does and retains the ``--keep`` latest results as
+the result cache would. The outputs are checked to be equal.
+
+- counter: Counter aggregates,
+- shared: one process-wide vocabulary that every traversal interns into,
+- per-traversal: a vocabulary per traversal, freed with it (what
+  WikiFrequencyCounter does).
+
+"counts MB" is the peak RSS growth while aggregating the first traversal,
+"peak MB" the peak growth over all traversals.
+
+Usage:
+    python -m benchmarks.bench_memory --traversals 6 --articles 300 --words 3000
+"""
+
+import argparse
+import hashlib
+import logging
+import multiprocessing
+import resource
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+
+def article_words(index: int, words: int, vocabulary: int, seed: int) -> Counter:
+    """Word counter of one synthetic article, with newly allocated strings."""
+    rng = np.random.default_rng(seed + index)
+    ranks = rng.zipf(1.1, words) % vocabulary
+    return Counter(f"w{rank:x}" for rank in ranks.tolist())
+
+
+def run_path(path: str, args: argparse.Namespace, results) -> None:
+    from src.vocabulary import Vocabulary, WordCounts
+    from src.wiki_client import WikiFrequencyCounter
+
+    logging.disable(logging.INFO)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    shared = Vocabulary()
+    kept = deque(maxlen=args.keep)
+    digest = hashlib.sha1()
+    words = 0
+    aggregated = 0
+    for traversal in range(args.traversals):
+        wiki = WikiFrequencyCounter(f"Bench_{traversal}", 1)
+        vocabulary = shared if path == "shared" else wiki.vocabulary
+        if path == "counter":
+            wiki.word_counter = Counter()
+        else:
+            wiki.word_counter = WordCounts(vocabulary)
+        levels = {}
+        for index in range(args.articles):
+            word_counter = article_words(
+                traversal * args.articles + index,
+                args.words,
+                args.vocabulary,
+                args.seed,
+            )
+            depth = index * args.depth // args.articles
+            if path == "counter":
+                wiki.word_counter += word_counter
+                levels.setdefault(depth, Counter()).update(word_counter)
+            else:
+                ids, counts = vocabulary.encode(word_counter)
+                wiki.word_counter.add(ids, counts)
+                levels.setdefault(depth, WordCounts(vocabulary)).add(ids, counts)
+        if path != "counter":
+            levels = {depth: level.nonzero() for depth, level in levels.items()}
+        if not traversal:
+            aggregated = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+        table = wiki.frequency_table()
+        alphabetical = table.take(table.order("word"))
+        digest.update(alphabetical.fingerprint.encode())
+        words += len(table)
+        kept.append(table)
+        del wiki, levels, table, alphabetical
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    results.put((elapsed, aggregated / 1024, peak / 1024, words, digest.hexdigest()))
+
+
+def measure(
+    path: str, args: argparse.Namespace
+) -> tuple[float, float, float, int, str]:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_path, args=(path, args, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traversals", type=int, default=6)
+    parser.add_argument("--articles", type=int, default=300)
+    parser.add_argument("--words", type=int, default=3000)
+    parser.add_argument("--vocabulary", type=int, default=2_000_000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--keep", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'path':<15}{'seconds':>10}{'counts MB':>12}{'peak MB':>10}{'words':>10}")
+    digests = set()
+    for path in ("counter", "shared", "per-traversal"):
+        elapsed, counts_mb, peak_mb, words, digest = measure(path, args)
+        digests.add(digest)
+        print(
+            f"{path:<15}{elapsed:>10.2f}{counts_mb:>12.1f}{peak_mb:>10.1f}{words:>10}"
+        )
+    print("outputs equal" if len(digests) == 1 else "OUTPUTS DIFFER")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Parse throughput of the extractors and parser backends as workers grow.
+
+Usage:
+    python -m benchmarks.bench_parse --pages 64 --workers 1 2 4 8
+    python -m benchmarks.bench_parse --extractors soup stream --backends inline
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+
+from src.parsing import ParserEngine
+
+SITES_PATH = Path(__file__).parent.parent / "tests" / "sites"
+
+
+def load_fixtures() -> list[str]:
+    return [
+        path.read_text(encoding="utf-8") for path in sorted(SITES_PATH.glob("*.html"))
+    ]
+
+
+async def measure(
+    backend: str, workers: int, pages: list[str], extractor: str = "soup"
+) -> float:
+    """Parse all pages concurrently and return the elapsed wall-clock time."""
+    engine = ParserEngine(backend, workers, extractor)
+    try:
+        # Warm up the pool so worker start-up is not part of the measurement
+        await asyncio.gather(*(engine.parse(pages[0], True) for _ in range(workers)))
+        start = time.perf_counter()
+        await asyncio.gather(*(engine.parse(html, True) for html in pages))
+        return time.perf_counter() - start
+    finally:
+        engine.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument(
+        "--backends", nargs="+", default=["inline", "thread", "process"]
+    )
+    parser.add_argument("--extractors", nargs="+", default=["soup", "stream"])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    pages = [fixtures[i % len(fixtures)] for i in range(args.pages)]
+    total_mb = sum(len(html.encode("utf-8")) for html in pages) / 1024 / 1024
+
+    print(
+        f"{'extractor':<10}{'backend':<10}{'workers':>8}"
+        f"{'seconds':>10}{'pages/s':>10}{'MB/s':>8}"
+    )
+    for extractor in args.extractors:
+        for backend in args.backends:
+            for workers in [1] if backend == "inline" else args.workers:
+                elapsed = asyncio.run(measure(backend, workers, pages, extractor))
+                print(
+                    f"{extractor:<10}{backend:<10}{workers:>8}{elapsed:>10.2f}"
+                    f"{len(pages) / elapsed:>10.1f}{total_mb / elapsed:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Synthetic article corpus built from the tests/sites fixtures.
+
+Each article is a handful of paragraphs drawn from the fixture pages, with
+their anchors rewired into a seeded random link graph over the corpus
+(``fanout`` links per article), so crawls of every depth stay inside it.
+The same arguments always build the same corpus; ``--out`` records it as
+gzipped JSON so a benchmark baseline can be rerun against identical input.
+
+Usage:
+    python -m benchmarks.corpus --articles 3000 --fanout 12 --out corpus.json.gz
+"""
+
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import random
+import re
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+SITES_PATH = Path(__file__).parent.parent / "tests" / "sites"
+ROOT = "Article_0"
+
+# Anchor text of a fixture paragraph, marked for rewiring
+_ANCHOR = re.compile("\x00(.*?)\x01", re.S)
+
+
+def fixture_paragraphs() -> list[str]:
+    """Non-empty paragraphs of the fixture articles with anchors marked."""
+    paragraphs = []
+    for path in sorted(SITES_PATH.glob("*.html")):
+        soup = BeautifulSoup(path.read_text(encoding="utf-8"), "lxml")
+        for paragraph in soup.find("div", id="mw-content-text").find_all("p"):
+            for anchor in paragraph.find_all("a"):
+                anchor.replace_with(f"\x00{anchor.get_text()}\x01")
+            if paragraph.get_text(strip=True):
+                paragraphs.append(paragraph.decode_contents())
+    return paragraphs
+
+
+def build_corpus(
+    articles: int, fanout: int = 12, paragraphs: int = 12, seed: int = 1
+) -> dict[str, str]:
+    """Rendered HTML of ``articles`` pages, Article_0 to Article_<n-1>."""
+    rng = random.Random(seed)
+    pool = fixture_paragraphs()
+    titles = [f"Article_{index}" for index in range(articles)]
+    pages = {}
+    for title in titles:
+        targets = iter(rng.sample(titles, min(fanout, articles)))
+
+        def rewire(match: re.Match) -> str:
+            target = next(targets, None)
+            if target is None:
+                return match.group(1)
+            return f'<a href="/wiki/{target}">{match.group(1)}</a>'
+
+        body = "".join(
+            f"<p>{_ANCHOR.sub(rewire, paragraph)}</p>"
+            for paragraph in rng.sample(pool, min(paragraphs, len(pool)))
+        )
+        see_also = "".join(
+            f'<li><a href="/wiki/{target}">{target.replace("_", " ")}</a></li>'
+            for target in targets
+        )
+        pages[title] = (
+            f"<html><head><title>{html.escape(title)}</title></head><body>"
+            f'<div id="mw-content-text"><div class="mw-parser-output">'
+            f"{body}<h2>See also</h2><ul>{see_also}</ul></div></div></body></html>"
+        )
+    return pages
+
+
+def corpus_digest(pages: dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for title in sorted(pages):
+        digest.update(title.encode())
+        digest.update(pages[title].encode())
+    return digest.hexdigest()
+
+
+def save_corpus(pages: dict[str, str], path: Path) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(pages, f)
+
+
+def load_corpus(path: Path) -> dict[str, str]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=3000)
+    parser.add_argument("--fanout", type=int, default=12)
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, required=True)
+    args = parser.parse_args()
+
+    pages = build_corpus(args.articles, args.fanout, args.paragraphs, args.seed)
+    save_corpus(pages, args.out)
+    size = sum(len(page.encode()) for page in pages.values())
+    print(
+        f"{len(pages)} articles, {size / 2**20:.1f} MB, "
+        f"sha256 {corpus_digest(pages)[:16]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
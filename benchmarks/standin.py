@@ -0,0 +1,66 @@
+"""Local stand-in Wikipedia server for benchmarks.
+
+Serves /wiki/<title> from an in-memory page map over keep-alive HTTP/1.1 and
+counts accepted TCP connections, so connection reuse can be measured. Each
+response can be delayed by a fixed latency plus its size over a simulated
+bandwidth (bytes per second; 0 is unlimited).
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, pages: dict[str, str], latency: float = 0.0, bandwidth: float = 0.0
+    ):
+        self.pages = pages
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.connections = 0
+        self.requests = 0
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        return request
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests += 1
+        body = self.server.pages.get(unquote(self.path.removeprefix("/wiki/")))
+        payload = b"" if body is None else body.encode("utf-8")
+        delay = self.server.latency
+        if self.server.bandwidth:
+            delay += len(payload) / self.server.bandwidth
+        if delay:
+            time.sleep(delay)
+        self.send_response(404 if body is None else 200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
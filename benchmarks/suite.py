@@ -0,0 +1,372 @@
+"""Reproducible benchmark suite: crawl, parse and filter throughput, peak memory.
+
+Serves a synthetic corpus (see benchmarks.corpus) from the local stand-in
+server with configurable latency and bandwidth, and measures
+
+- crawl: end-to-end traversals from Article_0 at each depth,
+- sharded: the deepest traversal split across a pool of ``--shards`` processes,
+- parse: extract_words_and_links throughput per MB of HTML for each extractor,
+- filters: filter_table throughput on a large Zipf distributed result,
+
+each in a fresh process, so "peak_rss_mb" is the peak memory of that
+measurement alone. Times are the best of ``--repeat`` runs. Results are
+written as JSON with the commit, environment and corpus digest; with
+``--baseline`` they are compared against an earlier results file.
+
+Usage:
+    python -m benchmarks.suite --out results.json
+    python -m benchmarks.suite --latency 0.02 --bandwidth 2000000 --depths 1 2 3 4
+    python -m benchmarks.suite --depths 4 --shards 1 2 4
+    python -m benchmarks.suite --out new.json --baseline results.json --fail-on-regression
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.corpus import ROOT, build_corpus, corpus_digest, load_corpus
+from benchmarks.standin import StandInServer
+
+EXTRACTORS = ("soup", "stream")
+PERCENTILES = (0, 50, 90, 100)
+# Seconds a measurement may take before its process is terminated
+MEASUREMENT_TIMEOUT = 1800.0
+POLL_INTERVAL = 1.0
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_crawl(url: str, depth: int, repeat: int) -> dict:
+    import config
+    from src.wiki_client import WikiFrequencyCounter
+
+    config.WIKIPEDIA_DOMAIN = url
+    times = []
+    for _ in range(repeat):
+        wiki = WikiFrequencyCounter(ROOT, depth)
+        start = time.perf_counter()
+        table = asyncio.run(wiki.traverse())
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+    articles = wiki.articles_processed
+    fetched_mb = wiki.bytes_fetched / 2**20
+    return {
+        "seconds": seconds,
+        "articles": articles,
+        "fetched_mb": round(fetched_mb, 3),
+        "unique_words": len(table),
+        "articles_per_second": articles / seconds,
+        "mb_per_second": fetched_mb / seconds,
+    }
+
+
+def measure_sharded_crawl(url: str, depth: int, shards: int, repeat: int) -> dict:
+    import config
+    from src.frequency import FrequencyTable
+    from src.sharding import ShardedCrawl, ShardPool
+
+    config.WIKIPEDIA_DOMAIN = url
+
+    async def crawls() -> tuple[list[float], ShardedCrawl, FrequencyTable]:
+        # Like the app, start the pool once; its startup is not timed
+        async with ShardPool(shards) as pool:
+            times = []
+            for _ in range(repeat):
+                crawl = ShardedCrawl(ROOT, depth, pool)
+                start = time.perf_counter()
+                table = await crawl.traverse()
+                times.append(time.perf_counter() - start)
+        return times, crawl, table
+
+    times, crawl, table = asyncio.run(crawls())
+    seconds = min(times)
+    articles = crawl.articles_processed
+    return {
+        "seconds": seconds,
+        "articles": articles,
+        "unique_words": len(table),
+        "articles_per_second": articles / seconds,
+    }
+
+
+def measure_parse(pages: list[str], extractor: str, repeat: int) -> dict:
+    from src.parsing import get_extractor
+
+    extract = get_extractor(extractor)
+    size_mb = sum(len(page.encode("utf-8")) for page in pages) / 2**20
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            extract(page, True)
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+    return {
+        "seconds": seconds,
+        "pages": len(pages),
+        "mb": round(size_mb, 3),
+        "mb_per_second": size_mb / seconds,
+        "pages_per_second": len(pages) / seconds,
+    }
+
+
+def measure_filters(words: int, percentile: int, repeat: int, seed: int) -> dict:
+    from benchmarks.bench_filters import IGNORE_LIST, build_table
+    from utils.filters import filter_table
+
+    table = build_table(words, seed)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kept = filter_table(table, IGNORE_LIST, percentile)
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+    return {
+        "seconds": seconds,
+        "rows": len(table),
+        "kept": len(kept),
+        "rows_per_second": len(table) / seconds,
+    }
+
+
+def _child(target, args, results) -> None:
+    logging.disable(logging.CRITICAL)
+    try:
+        result = target(*args)
+        result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    except Exception:
+        results.put((False, traceback.format_exc()))
+        return
+    results.put((True, result))
+
+
+def in_fresh_process(target, *args, timeout: float = MEASUREMENT_TIMEOUT) -> dict:
+    """Run ``target(*args)`` in a spawned process and return its result.
+
+    Raises RuntimeError if the measurement fails (with the child's
+    traceback), its process dies without a result or it exceeds ``timeout``
+    seconds.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_child, args=(target, args, results))
+    process.start()
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                succeeded, result = results.get(timeout=POLL_INTERVAL)
+                break
+            except queue.Empty:
+                pass
+            if process.exitcode is not None:
+                # The result may have been queued just before the exit
+                try:
+                    succeeded, result = results.get(timeout=POLL_INTERVAL)
+                    break
+                except queue.Empty:
+                    raise RuntimeError(
+                        f"{target.__name__} exited with code {process.exitcode} "
+                        f"without a result"
+                    ) from None
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{target.__name__} timed out after {timeout}s")
+    finally:
+        process.join(POLL_INTERVAL)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+    if not succeeded:
+        raise RuntimeError(f"{target.__name__} failed:\n{result}")
+    return result
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def higher_is_better(metric: str) -> bool | None:
+    """Direction of a compared metric; None for metrics that are not compared.
+
+    Only rates and peak memory are compared: seconds depend on the workload
+    size, which the parameters may change between runs.
+    """
+    if metric.endswith("_per_second"):
+        return True
+    if metric.endswith(".peak_rss_mb"):
+        return False
+    return None
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Print current results against a baseline; return the regressed metrics."""
+    before = flatten(baseline["results"])
+    after = flatten(current["results"])
+    regressions = []
+    print(f"\nagainst {baseline['environment'].get('commit') or 'baseline'}")
+    print(f"{'metric':<40}{'baseline':>12}{'current':>12}{'change':>9}")
+    for metric, value in after.items():
+        better = higher_is_better(metric)
+        if better is None or not before.get(metric):
+            continue
+        change = value / before[metric] - 1
+        worse = -change if better else change
+        flag = ""
+        if worse > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(metric)
+        print(f"{metric:<40}{before[metric]:>12.4g}{value:>12.4g}{change:>+9.1%}{flag}")
+    if baseline["corpus"]["digest"] != current["corpus"]["digest"]:
+        print("note: the baseline was measured on a different corpus")
+    if baseline["parameters"] != current["parameters"]:
+        print("note: the baseline was measured with different parameters")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="recorded corpus.json.gz")
+    parser.add_argument("--articles", type=int, default=3000)
+    parser.add_argument("--fanout", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="bytes/s")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--shards", type=int, nargs="*", default=[])
+    parser.add_argument("--parse-pages", type=int, default=500)
+    parser.add_argument("--filter-words", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        pages = build_corpus(args.articles, args.fanout, seed=args.seed)
+    corpus = {
+        "articles": len(pages),
+        "mb": round(sum(len(page.encode()) for page in pages.values()) / 2**20, 3),
+        "digest": corpus_digest(pages),
+        "source": str(args.corpus) if args.corpus else "generated",
+    }
+    report = {
+        "environment": environment(),
+        "corpus": corpus,
+        "parameters": {
+            "latency": args.latency,
+            "bandwidth": args.bandwidth,
+            "repeat": args.repeat,
+            "filter_words": args.filter_words,
+            "parse_pages": args.parse_pages,
+            "shards": args.shards,
+        },
+        "results": {"crawl": {}, "sharded": {}, "parse": {}, "filters": {}},
+    }
+    results = report["results"]
+
+    print(f"{'crawl':<12}{'seconds':>10}{'articles':>10}{'art/s':>10}{'peak MB':>10}")
+    with StandInServer(pages, args.latency, args.bandwidth) as server:
+        for depth in args.depths:
+            result = in_fresh_process(measure_crawl, server.url, depth, args.repeat)
+            results["crawl"][f"depth_{depth}"] = result
+            print(
+                f"{f'depth {depth}':<12}{result['seconds']:>10.3f}"
+                f"{result['articles']:>10}{result['articles_per_second']:>10.1f}"
+                f"{result['peak_rss_mb']:>10.1f}"
+            )
+
+        if args.shards:
+            depth = max(args.depths)
+            print(
+                f"\n{f'depth {depth}':<12}{'seconds':>10}{'articles':>10}{'art/s':>10}"
+            )
+            for shards in args.shards:
+                result = in_fresh_process(
+                    measure_sharded_crawl, server.url, depth, shards, args.repeat
+                )
+                results["sharded"][f"depth_{depth}_shards_{shards}"] = result
+                print(
+                    f"{f'{shards} shards':<12}{result['seconds']:>10.3f}"
+                    f"{result['articles']:>10}{result['articles_per_second']:>10.1f}"
+                )
+
+    sample = [pages[title] for title in sorted(pages)[: args.parse_pages]]
+    print(f"\n{'parse':<12}{'seconds':>10}{'MB/s':>10}{'pages/s':>10}{'peak MB':>10}")
+    for extractor in EXTRACTORS:
+        result = in_fresh_process(measure_parse, sample, extractor, args.repeat)
+        results["parse"][extractor] = result
+        print(
+            f"{extractor:<12}{result['seconds']:>10.3f}{result['mb_per_second']:>10.2f}"
+            f"{result['pages_per_second']:>10.1f}{result['peak_rss_mb']:>10.1f}"
+        )
+
+    print(f"\n{'filters':<12}{'seconds':>10}{'Mrows/s':>10}{'kept':>10}{'peak MB':>10}")
+    for percentile in PERCENTILES:
+        result = in_fresh_process(
+            measure_filters, args.filter_words, percentile, args.repeat, args.seed
+        )
+        results["filters"][f"p{percentile}"] = result
+        print(
+            f"{f'p{percentile}':<12}{result['seconds']:>10.3f}"
+            f"{result['rows_per_second'] / 1e6:>10.2f}{result['kept']:>10}"
+            f"{result['peak_rss_mb']:>10.1f}"
+        )
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nresults written to {args.out}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,108 @@ WIKIPEDIA_DOMAIN = f"https://{WIKIPEDIA_LANG}.wikipedia.org"
 
 REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "30.0"))
 MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
+# Shared HTTP connection pool
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30.0"))
+# Adaptive (AIMD) concurrency per host, shared by every request to it: starts at
+# MAX_CONCURRENT_REQUESTS, grows by one slot per window of responses faster than
+# CONCURRENCY_LATENCY_TARGET seconds up to CONCURRENCY_MAX (default: the pool
+# size) and is multiplied by CONCURRENCY_BACKOFF on throttling, 5xx and timeouts
+CONCURRENCY_MIN = int(os.getenv("CONCURRENCY_MIN", "1"))
+CONCURRENCY_MAX = int(os.getenv("CONCURRENCY_MAX", "0")) or HTTP_MAX_CONNECTIONS
+CONCURRENCY_LATENCY_TARGET = float(os.getenv("CONCURRENCY_LATENCY_TARGET", "2.0"))
+CONCURRENCY_BACKOFF = float(os.getenv("CONCURRENCY_BACKOFF", "0.5"))
+# Retries of throttled (429/503), failed (5xx) and timed out requests: up to
+# RETRY_ATTEMPTS per request after jittered exponential backoff from
+# RETRY_BASE_DELAY seconds, or the server's Retry-After up to RETRY_MAX_DELAY;
+# each host has a budget of RETRY_BUDGET retries, refilled by RETRY_BUDGET_RATIO
+# of a retry per request
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "30.0"))
+RETRY_BUDGET = float(os.getenv("RETRY_BUDGET", "10"))
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+# Crawl worker tasks; more than the request slots so parsing overlaps fetching
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "0")) or 2 * CONCURRENCY_MAX
+# Sharded crawls: with CRAWL_SHARDS > 1, traversals without a crawl budget and
+# at least CRAWL_SHARD_MIN_DEPTH deep run level by level across a pool of that
+# many worker processes, each shard with 1/CRAWL_SHARDS of the host limits (see
+# src.sharding). The pool runs one traversal at a time; traversals arriving
+# while it is busy run in-process instead of queueing
+CRAWL_SHARDS = int(os.getenv("CRAWL_SHARDS", "1"))
+CRAWL_SHARD_MIN_DEPTH = int(os.getenv("CRAWL_SHARD_MIN_DEPTH", "3"))
+
+# Persistent article HTML cache (disabled when ARTICLE_CACHE_PATH is empty)
+ARTICLE_CACHE_PATH = os.getenv("ARTICLE_CACHE_PATH", "")
+ARTICLE_CACHE_TTL = float(os.getenv("ARTICLE_CACHE_TTL", "86400"))
+ARTICLE_CACHE_MAX_BYTES = int(
+    os.getenv("ARTICLE_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+)
+
+# Persistent link graph (title -> outbound titles), disabled when LINK_GRAPH_PATH
+# is empty; entries older than LINK_GRAPH_TTL seconds are re-extracted
+LINK_GRAPH_PATH = os.getenv("LINK_GRAPH_PATH", "")
+LINK_GRAPH_TTL = float(os.getenv("LINK_GRAPH_TTL", str(ARTICLE_CACHE_TTL)))
+
+# Memoized parse results: in-memory LRU entries and optional SQLite tier
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "2048"))
+PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH", "")
+
+# Result cache of whole frequency results; RESULT_CACHE_TTL=0 disables it and
+# RESULT_CACHE_STALE_TTL > 0 enables stale-while-revalidate for that many seconds
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "600"))
+RESULT_CACHE_MAX_BYTES = int(
+    os.getenv("RESULT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+RESULT_CACHE_STALE_TTL = float(os.getenv("RESULT_CACHE_STALE_TTL", "0"))
+
+# Per-root crawl state (per-level counts, visited set, frontier) kept so deeper
+# requests only crawl the new levels; number of roots kept, 0 disables it
+CRAWL_STATE_SIZE = int(os.getenv("CRAWL_STATE_SIZE", "32"))
+# Seconds a root's stored levels are reused; defaults to the result cache TTL
+CRAWL_STATE_TTL = float(os.getenv("CRAWL_STATE_TTL", "0")) or RESULT_CACHE_TTL or 600
+
+# HTML parsing backend: "thread", "process" or "inline"; workers default to CPU count
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "thread")
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "0")) or os.cpu_count() or 1
+# HTML extractor: "soup" (BeautifulSoup pipeline) or "stream" (single-pass lxml)
+EXTRACTOR = os.getenv("EXTRACTOR", "soup")
+
+# Article fetch backend: "html" (one rendered page per request), "api" (MediaWiki
+# Action API: wikitext of up to API_TITLES_PER_QUERY titles per query, parsed like dump
+# pages, collected from concurrent loads for up to API_BATCH_WINDOW seconds) or
+# "dump" (the local store at DUMP_STORE_PATH, built with `python -m src.dump_ingest`)
+FETCH_BACKEND = os.getenv("FETCH_BACKEND", "html")
+DUMP_STORE_PATH = os.getenv("DUMP_STORE_PATH", "")
+API_TITLES_PER_QUERY = int(os.getenv("API_TITLES_PER_QUERY", "50"))
+API_BATCH_WINDOW = float(os.getenv("API_BATCH_WINDOW", "0.02"))
+# Link discovery: "content" takes links from the fetched article; "listing" runs
+# separate, lightweight API link queries concurrently with the text fetches. Listings
+# also hold the links of navboxes and other templates, which "content" leaves out,
+# so a listing crawl may reach more articles
+LINK_DISCOVERY = os.getenv("LINK_DISCOVERY", "content")
+
+# Background jobs (POST /jobs): jobs kept in memory, running or awaiting their
+# result fetch, and the interval between progress events on the SSE stream
+JOBS_MAX = int(os.getenv("JOBS_MAX", "100"))
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", "1.0"))
+
+# Per-request profiling (profile=true): allowed for requests that send ADMIN_TOKEN
+# in the X-Admin-Token header (an empty ADMIN_TOKEN disables it); stacks are
+# sampled every PROFILE_INTERVAL seconds and the last PROFILES_MAX profiles kept
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILES_MAX = int(os.getenv("PROFILES_MAX", "20"))
+
+# Crawl tracing: each traversal records its latest TRACE_SPANS spans (0 disables
+# tracing); the last TRACES_MAX traces are kept for download from /traces and,
+# with TRACE_OTLP_ENDPOINT set (an OTLP/HTTP collector such as
+# http://localhost:4318), also exported there
+TRACE_SPANS = int(os.getenv("TRACE_SPANS", "8192"))
+TRACES_MAX = int(os.getenv("TRACES_MAX", "10"))
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
 
 MAX_DEPTH = int(os.getenv("MAX_DEPTH", "5"))
 MIN_DEPTH = 1
@@ -22,8 +124,22 @@ USER_AGENT = os.getenv(
 HEADERS = {"User-Agent": USER_AGENT}
 
 
+def normalize_title(article: str) -> str:
+    """Normalize an article title the way MediaWiki does (spaces to underscores,
+    first letter upper-case), so equivalent titles share cache entries."""
+
+    title = article.strip().replace(" ", "_")
+    return title[:1].upper() + title[1:]
+
+
 def get_article_url(article: str) -> str:
     """Construct Wikipedia article URL."""
 
     encoded_article = article.replace(" ", "_")
     return f"{WIKIPEDIA_DOMAIN}/wiki/{encoded_article}"
+
+
+def get_api_url() -> str:
+    """Construct the MediaWiki Action API endpoint URL."""
+
+    return f"{WIKIPEDIA_DOMAIN}/w/api.php"
@@ -1,16 +1,145 @@
+import asyncio
+import hmac
+import json
 import logging
-from fastapi import FastAPI, Query, HTTPException, status
+import time
+from collections.abc import Callable
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, replace
+from typing import Literal
+from fastapi import Depends, FastAPI, Query, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from schema import KeywordSchema
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from schema import JobSchema, KeywordSchema
 
 
+from config import (
+    WIKIPEDIA_LANG,
+    normalize_title,
+    ARTICLE_CACHE_PATH,
+    ARTICLE_CACHE_TTL,
+    ARTICLE_CACHE_MAX_BYTES,
+    PARSE_CACHE_SIZE,
+    PARSE_CACHE_PATH,
+    PARSER_BACKEND,
+    RESULT_CACHE_TTL,
+    RESULT_CACHE_MAX_BYTES,
+    RESULT_CACHE_STALE_TTL,
+    CRAWL_STATE_SIZE,
+    CRAWL_STATE_TTL,
+    CRAWL_SHARDS,
+    CRAWL_SHARD_MIN_DEPTH,
+    LINK_GRAPH_PATH,
+    LINK_GRAPH_TTL,
+    DUMP_STORE_PATH,
+    PARSER_WORKERS,
+    EXTRACTOR,
+    JOBS_MAX,
+    JOB_PROGRESS_INTERVAL,
+    ADMIN_TOKEN,
+    PROFILE_INTERVAL,
+    PROFILES_MAX,
+    TRACE_SPANS,
+    TRACES_MAX,
+    TRACE_OTLP_ENDPOINT,
+)
+from src.article_cache import ArticleCache
+from src.budget import CrawlBudget
+from src.coalescing import SingleFlight
+from src.crawl_state import CrawlStateStore
+from src.dump_store import DumpStore
+from src.frequency import FrequencyTable, json_chunks, ndjson_chunks
+from src.http_client import create_http_client, pool_stats
+from src.limiter import limiter_stats
+from src.metrics import CACHES
+from src.jobs import Job, JobStore
+from src.link_graph import LinkGraph
+from src.pagination import PageQuery, decode_cursor, paginate
+from src.parse_cache import ParseCache
+from src.parsing import ParserEngine
+from src.profiling import PhaseTimer, Profile, ProfileStore, SamplingProfiler
+from src.result_cache import ResultCache
+from src.sharding import ShardedCrawl, ShardPool
+from src.tracing import CrawlTrace, TraceStore, export_otlp
 from src.wiki_client import WikiFrequencyCounter
 from logging_config import setup_logging
-from utils.filters import filter_by_ignore_list, filter_by_percentile
+from utils.filters import filter_table
 
 setup_logging(level=logging.INFO)
 
-app = FastAPI()
+article_cache = (
+    ArticleCache(ARTICLE_CACHE_PATH, ARTICLE_CACHE_TTL, ARTICLE_CACHE_MAX_BYTES)
+    if ARTICLE_CACHE_PATH
+    else None
+)
+parse_cache = (
+    ParseCache(PARSE_CACHE_SIZE, PARSE_CACHE_PATH) if PARSE_CACHE_SIZE else None
+)
+link_graph = LinkGraph(LINK_GRAPH_PATH, LINK_GRAPH_TTL) if LINK_GRAPH_PATH else None
+dump_store = DumpStore(DUMP_STORE_PATH, WIKIPEDIA_LANG) if DUMP_STORE_PATH else None
+result_cache = (
+    ResultCache(RESULT_CACHE_TTL, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_STALE_TTL)
+    if RESULT_CACHE_TTL
+    else None
+)
+
+crawl_states = (
+    CrawlStateStore(CRAWL_STATE_SIZE, CRAWL_STATE_TTL) if CRAWL_STATE_SIZE else None
+)
+
+for name, cache in (
+    ("article", article_cache),
+    ("parse", parse_cache),
+    ("link_graph", link_graph),
+    ("result", result_cache),
+):
+    if cache is not None:
+        CACHES.register(name, cache)
+
+job_store = JobStore(JOBS_MAX)
+
+profiles = ProfileStore(PROFILES_MAX)
+traces = TraceStore(TRACES_MAX)
+
+parser_engine = ParserEngine(PARSER_BACKEND, PARSER_WORKERS, EXTRACTOR)
+
+# Single-flight registries: whole traversals and individual article loads
+crawl_flights = SingleFlight()
+article_flights = SingleFlight()
+
+# Shared connection pool, created for the app lifetime in lifespan()
+http_client = None
+# Crawl shard processes, started in lifespan() when CRAWL_SHARDS > 1
+shard_pool = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client, shard_pool
+    http_client = create_http_client()
+    if CRAWL_SHARDS > 1:
+        shard_pool = ShardPool(CRAWL_SHARDS)
+        shard_pool.start()
+    yield
+    await job_store.aclose()
+    await http_client.aclose()
+    http_client = None
+    if shard_pool is not None:
+        await shard_pool.close()
+        shard_pool = None
+    parser_engine.shutdown()
+    if article_cache is not None:
+        article_cache.close()
+    if parse_cache is not None:
+        parse_cache.close()
+    if link_graph is not None:
+        link_graph.close()
+    if dump_store is not None:
+        dump_store.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS middleware
 app.add_middleware(
@@ -19,17 +148,174 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Crawl-Complete",
+        "X-Articles-Processed",
+        "X-Articles-Skipped",
+        "X-Cache",
+        "X-Total-Count",
+        "X-Next-Cursor",
+        "X-Profile-Id",
+        "X-Trace-Id",
+        "Server-Timing",
+    ],
 )
 
 
-async def _compute_frequency(article: str, depth: int) -> dict:
-    """Run WikiFrequencyCounter and return the frequency dict.
+CACHE_HEADER_VALUES = {"fresh": "HIT", "stale": "STALE"}
+
+
+async def _compute_frequency(
+    article: str,
+    depth: int,
+    budget: CrawlBudget | None = None,
+    observer: Callable[[WikiFrequencyCounter], None] | None = None,
+) -> tuple[FrequencyTable, dict]:
+    """Return the frequency table and crawl status for an article and depth.
+
+    Complete results are served from the result cache when possible; the crawl
+    status then carries the cache outcome ("HIT", "STALE" or "MISS"). Identical
+    concurrent computations (same language, title, depth and budget) share a
+    single traversal, so /keywords calls that differ only in their filters also
+    share the crawl. The shared result must not be mutated.
+
+    With an observer (background jobs), a traversal that is needed runs on its
+    own instead: the observer is handed its WikiFrequencyCounter to report
+    progress, and cancelling the caller stops exactly that traversal.
+    """
+    cache_key = (WIKIPEDIA_LANG, normalize_title(article), depth)
+    if result_cache is not None:
+        cached, freshness = result_cache.get(cache_key)
+        if freshness == "stale":
+            _refresh_in_background(article, depth)
+        if cached is not None:
+            frequency_table, crawl_status = cached
+            return frequency_table, {
+                **crawl_status,
+                "cache": CACHE_HEADER_VALUES[freshness],
+            }
+
+    if observer is not None:
+        frequency_table, crawl_status = await _run_and_cache(
+            article, depth, budget, observer
+        )
+        return frequency_table, {**crawl_status, "cache": "MISS"}
 
+    flight_key = (*cache_key, budget.limits() if budget else None)
+    frequency_table, crawl_status = await crawl_flights.do(
+        flight_key, lambda: _run_and_cache(article, depth, budget)
+    )
+    return frequency_table, {**crawl_status, "cache": "MISS"}
+
+
+_background_refreshes: set[asyncio.Task] = set()
+
+
+def _refresh_in_background(article: str, depth: int) -> None:
+    """Recompute a stale result without making the current request wait."""
+    flight_key = (WIKIPEDIA_LANG, normalize_title(article), depth, None)
+    if crawl_flights.in_flight(flight_key):
+        return
+    task = asyncio.create_task(
+        crawl_flights.do(flight_key, lambda: _run_and_cache(article, depth, None))
+    )
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+async def _run_and_cache(
+    article: str,
+    depth: int,
+    budget: CrawlBudget | None = None,
+    observer: Callable[[WikiFrequencyCounter], None] | None = None,
+    in_process: bool = False,
+) -> tuple[FrequencyTable, dict]:
+    frequency_table, crawl_status = await _run_traversal(
+        article, depth, budget, observer, in_process
+    )
+    # Partial (budget-limited) results are never cached. The trace id names
+    # this traversal, so responses served from the cache do not carry it
+    if result_cache is not None and crawl_status["complete"]:
+        cached_status = {
+            key: value for key, value in crawl_status.items() if key != "trace_id"
+        }
+        result_cache.put(
+            (WIKIPEDIA_LANG, normalize_title(article), depth),
+            (frequency_table, cached_status),
+            frequency_table.nbytes,
+        )
+    return frequency_table, crawl_status
+
+
+def _shardable(depth: int, budget: CrawlBudget | None) -> bool:
+    """Whether a traversal runs on the shard pool.
+
+    Only deep traversals without a budget are worth the features sharding
+    drops, and only while the pool is idle: a traversal never queues behind
+    another one's sharded crawl.
+    """
+    return (
+        shard_pool is not None
+        and depth >= CRAWL_SHARD_MIN_DEPTH
+        and (budget is None or budget.limits() == (None, None, None))
+        and not shard_pool.lock.locked()
+    )
+
+
+async def _run_traversal(
+    article: str,
+    depth: int,
+    budget: CrawlBudget | None = None,
+    observer: Callable[[WikiFrequencyCounter], None] | None = None,
+    in_process: bool = False,
+) -> tuple[FrequencyTable, dict]:
+    """Run WikiFrequencyCounter and return the frequency table and crawl status.
+
+    With ``in_process`` the traversal is never sharded (see _shardable).
     Raises HTTPException on empty result or unexpected errors.
     """
+    state_key = (WIKIPEDIA_LANG, normalize_title(article))
+    trace = None
     try:
-        wiki = WikiFrequencyCounter(article, depth)
-        result = await wiki.run()
+        # Requests for the same root take turns so each reuses the levels the
+        # previous one stored
+        lock = (
+            crawl_states.lock(state_key) if crawl_states is not None else nullcontext()
+        )
+        async with lock:
+            # Decided here, just before the traversal takes the idle pool
+            sharded = not in_process and _shardable(depth, budget)
+            # Sharded crawls run in other processes, untraced and without crawl state
+            if TRACE_SPANS and not sharded:
+                trace = CrawlTrace(TRACE_SPANS)
+            if sharded:
+                wiki = ShardedCrawl(article, depth, shard_pool)
+            else:
+                wiki = WikiFrequencyCounter(
+                    article,
+                    depth,
+                    article_cache=article_cache,
+                    parse_cache=parse_cache,
+                    parser=parser_engine,
+                    budget=budget,
+                    client=http_client,
+                    flights=article_flights,
+                    state=(
+                        crawl_states.get(state_key)
+                        if crawl_states is not None
+                        else None
+                    ),
+                    link_graph=link_graph,
+                    dump_store=dump_store,
+                    trace=trace,
+                )
+            if observer is not None:
+                observer(wiki)
+            try:
+                result = await wiki.traverse()
+            finally:
+                if trace is not None:
+                    _keep_trace(trace)
 
         if not result:
             raise HTTPException(
@@ -41,7 +327,10 @@ async def _compute_frequency(article: str, depth: int) -> dict:
                 },
             )
 
-        return result
+        crawl_status = wiki.crawl_status()
+        if trace is not None:
+            crawl_status["trace_id"] = trace.id
+        return result, crawl_status
 
     except HTTPException:
         raise
@@ -59,17 +348,310 @@ async def _compute_frequency(article: str, depth: int) -> dict:
         )
 
 
+_trace_exports: set[asyncio.Task] = set()
+
+
+def _keep_trace(trace: CrawlTrace) -> None:
+    """Store a finished trace and export it to the OTLP collector, if any."""
+    traces.add(trace)
+    if TRACE_OTLP_ENDPOINT and http_client is not None:
+        task = asyncio.create_task(export_otlp(http_client, TRACE_OTLP_ENDPOINT, trace))
+        _trace_exports.add(task)
+        task.add_done_callback(_trace_exports.discard)
+
+
+async def _profile_frequency(
+    article: str, depth: int, budget: CrawlBudget | None
+) -> tuple[FrequencyTable, dict, Profile]:
+    """Run the traversal under the sampling profiler, timing its phases.
+
+    The result cache and traversal coalescing are bypassed so the profile
+    covers an actual traversal; the complete result is still cached. The
+    traversal runs in-process, where its phases can be timed.
+    """
+    phases = PhaseTimer()
+
+    def time_phases(wiki: WikiFrequencyCounter) -> None:
+        wiki.phases = phases
+
+    start = time.perf_counter()
+    with SamplingProfiler(PROFILE_INTERVAL) as profiler:
+        frequency_table, crawl_status = await _run_and_cache(
+            article, depth, budget, time_phases, in_process=True
+        )
+    profile = Profile(
+        article=normalize_title(article),
+        depth=depth,
+        seconds=time.perf_counter() - start,
+        interval=PROFILE_INTERVAL,
+        samples=profiler.samples,
+        phases=phases.seconds,
+        stacks=profiler.stacks,
+    )
+    profiles.add(profile)
+    logging.info(f"Profiled '{article}' at depth {depth}: {profile.server_timing()}")
+    return frequency_table, {**crawl_status, "cache": "MISS"}, profile
+
+
+def _profile_headers(profile: Profile | None) -> dict[str, str]:
+    if profile is None:
+        return {}
+    return {"X-Profile-Id": profile.id, "Server-Timing": profile.server_timing()}
+
+
+def _require_admin(request: Request) -> None:
+    """Reject requests without the admin token; all are rejected if none is set."""
+    token = request.headers.get("X-Admin-Token", "")
+    if not ADMIN_TOKEN or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "error": "Forbidden",
+                "message": "Profiles and traces require a valid X-Admin-Token header",
+            },
+        )
+
+
+def _profile_param(
+    request: Request,
+    profile: bool = Query(
+        False,
+        description="Run the traversal under the sampling profiler (admin only); "
+        "the X-Profile-Id header names the stored profile",
+    ),
+) -> bool:
+    if profile:
+        _require_admin(request)
+    return profile
+
+
+async def _frequency_for(
+    article: str, depth: int, budget: CrawlBudget, profile: bool
+) -> tuple[FrequencyTable, dict, Profile | None]:
+    if profile:
+        return await _profile_frequency(article, depth, budget)
+    return *await _compute_frequency(article, depth, budget), None
+
+
+def _set_crawl_status_headers(response: Response, crawl_status: dict) -> None:
+    """Tell clients whether a budget cut the traversal short."""
+    response.headers["X-Crawl-Complete"] = str(crawl_status["complete"]).lower()
+    response.headers["X-Articles-Processed"] = str(crawl_status["articles_processed"])
+    response.headers["X-Articles-Skipped"] = str(crawl_status["articles_skipped"])
+    if "cache" in crawl_status:
+        response.headers["X-Cache"] = crawl_status["cache"]
+    if "trace_id" in crawl_status:
+        response.headers["X-Trace-Id"] = crawl_status["trace_id"]
+
+
+ResponseFormat = Literal["json", "json-stream", "ndjson"]
+SortOrder = Literal["count", "word"]
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson")
+
+
+def _response_format(request: Request, requested: ResponseFormat | None) -> str:
+    """The format query parameter wins; otherwise NDJSON if the Accept header asks for it."""
+    if requested is not None:
+        return requested
+    accept = request.headers.get("accept", "")
+    if any(media_type in accept for media_type in NDJSON_MEDIA_TYPES):
+        return "ndjson"
+    return "json"
+
+
+@dataclass
+class PageParams:
+    """Row selection query parameters shared by /word-frequency and /keywords."""
+
+    sort: SortOrder | None
+    min_count: int | None
+    top_k: int | None
+    offset: int | None
+    limit: int | None
+    cursor: str | None
+
+    @property
+    def paged(self) -> bool:
+        return any(
+            value is not None
+            for value in (
+                self.min_count,
+                self.top_k,
+                self.offset,
+                self.limit,
+                self.cursor,
+            )
+        )
+
+
+def _page_params(
+    sort: SortOrder | None = Query(
+        None, description="Order words by descending count or alphabetically"
+    ),
+    min_count: int | None = Query(
+        None, ge=1, description="Only words counted at least this many times"
+    ),
+    top_k: int | None = Query(
+        None, ge=1, description="Only the k most frequent words (sorted by count)"
+    ),
+    offset: int | None = Query(None, ge=0, description="Rows to skip"),
+    limit: int | None = Query(None, ge=1, description="Maximum rows to return"),
+    cursor: str | None = Query(
+        None,
+        description="X-Next-Cursor of the previous page; replaces the other paging parameters",
+    ),
+) -> PageParams:
+    return PageParams(sort, min_count, top_k, offset, limit, cursor)
+
+
+def _select_page(
+    frequency_table: FrequencyTable, params: PageParams
+) -> tuple[FrequencyTable, dict[str, str]]:
+    """Apply min_count, top_k and offset/limit or a cursor to a table.
+
+    Returns the selected rows and the X-Total-Count / X-Next-Cursor headers.
+    A cursor only continues against the result it was issued for; once that
+    result has been recomputed (or for uncached, partial results) it is
+    rejected with 410 Gone.
+    """
+    if params.top_k is not None and (
+        params.offset is not None or params.limit is not None or params.cursor
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Invalid paging parameters",
+                "message": "Use either top_k or offset/limit/cursor, not both",
+            },
+        )
+
+    if params.cursor is not None:
+        try:
+            fingerprint, query = decode_cursor(params.cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error": "Invalid cursor", "message": "Malformed cursor"},
+            )
+        if fingerprint != frequency_table.fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail={
+                    "error": "Cursor expired",
+                    "message": "The result changed since this cursor was issued; "
+                    "start again from the first page",
+                },
+            )
+        if params.limit is not None:
+            query = replace(query, limit=params.limit)
+    elif params.top_k is not None:
+        # The k most frequent words, whatever order they are returned in
+        query = PageQuery("count", params.min_count, 0, params.top_k)
+    else:
+        query = PageQuery(
+            params.sort, params.min_count, params.offset or 0, params.limit
+        )
+
+    page = paginate(frequency_table, query)
+    if params.top_k is not None and params.sort not in (None, "count"):
+        page.table = page.table.take(page.table.order(params.sort))
+    headers = {"X-Total-Count": str(page.matching)}
+    # top_k is a one-off selection; only offset/limit pages continue
+    if page.next_cursor is not None and params.top_k is None:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return page.table, headers
+
+
+def _frequency_response(
+    response: Response,
+    frequency_table: FrequencyTable,
+    crawl_status: dict,
+    response_format: str,
+    params: PageParams,
+    headers: dict[str, str] | None = None,
+) -> Response | dict:
+    """Serialize a frequency table in the requested format.
+
+    "json" builds the frequency dict and returns it in one piece. "json-stream"
+    encodes the same JSON object and "ndjson" one object per line, both
+    incrementally from the table, so memory and time to first byte do not
+    grow with the vocabulary.
+    """
+    sort, page_headers = params.sort, {}
+    if params.paged:
+        frequency_table, page_headers = _select_page(frequency_table, params)
+        sort = None  # the page is already in order
+    page_headers.update(headers or {})
+
+    if response_format == "json":
+        _set_crawl_status_headers(response, crawl_status)
+        response.headers.update(page_headers)
+        return frequency_table.to_dict(sort)
+
+    if response_format == "ndjson":
+        streamed = StreamingResponse(
+            ndjson_chunks(frequency_table, sort), media_type="application/x-ndjson"
+        )
+    else:
+        streamed = StreamingResponse(
+            json_chunks(frequency_table, sort), media_type="application/json"
+        )
+    _set_crawl_status_headers(streamed, crawl_status)
+    streamed.headers.update(page_headers)
+    return streamed
+
+
+FORMAT_QUERY = Query(
+    None,
+    alias="format",
+    description="Response format: json, json-stream or ndjson "
+    "(default: ndjson if the Accept header asks for application/x-ndjson, else json)",
+)
+
+
 @app.get("/word-frequency")
 async def word_frequency(
+    request: Request,
+    response: Response,
     article: str = Query(
         ...,
         min_length=1,
         description="Wikipedia article title (e.g., 'Python', not URL)",
     ),
     depth: int = Query(..., ge=1, le=5, description="Traversal depth (1-5)"),
+    max_articles: int | None = Query(
+        None, ge=1, description="Stop after fetching this many articles"
+    ),
+    max_bytes: int | None = Query(
+        None, ge=1, description="Stop after downloading this many bytes of articles"
+    ),
+    deadline: float | None = Query(
+        None, gt=0, description="Stop starting new articles after this many seconds"
+    ),
+    response_format: ResponseFormat | None = FORMAT_QUERY,
+    page_params: PageParams = Depends(_page_params),
+    profile: bool = Depends(_profile_param),
 ):
     """A word-frequency dictionary that includes the count
-    and percentage frequency of each word found in the traversed articles."""
+    and percentage frequency of each word found in the traversed articles.
+
+    With max_articles, max_bytes or deadline the traversal may stop early; the
+    X-Crawl-Complete, X-Articles-Processed and X-Articles-Skipped response
+    headers report how much of it was covered.
+
+    Large dictionaries can be streamed with format=json-stream (the same JSON
+    object) or format=ndjson / Accept: application/x-ndjson (one
+    {"word", "count", "percentage"} object per line).
+
+    top_k returns only the most frequent words (in the requested sort order,
+    by count if none); offset/limit page through the
+    result in the requested sort order, with X-Total-Count and X-Next-Cursor
+    headers (pass the cursor back to fetch the next page).
+
+    profile=true (with the X-Admin-Token header) runs a fresh traversal under
+    the sampling profiler: Server-Timing reports the per-phase breakdown and
+    GET /profiles/{X-Profile-Id} the stored profile."""
 
     if article.startswith("http://") or article.startswith("https://"):
         raise HTTPException(
@@ -81,23 +663,303 @@ async def word_frequency(
             },
         )
 
-    return await _compute_frequency(article, depth)
+    budget = CrawlBudget(max_articles, max_bytes, deadline)
+    frequency_table, crawl_status, run_profile = await _frequency_for(
+        article, depth, budget, profile
+    )
+    return _frequency_response(
+        response,
+        frequency_table,
+        crawl_status,
+        _response_format(request, response_format),
+        page_params,
+        _profile_headers(run_profile),
+    )
 
 
 @app.post("/keywords")
-async def keywords(params: KeywordSchema):
+async def keywords(
+    params: KeywordSchema,
+    request: Request,
+    response: Response,
+    response_format: ResponseFormat | None = FORMAT_QUERY,
+    page_params: PageParams = Depends(_page_params),
+    profile: bool = Depends(_profile_param),
+):
     """A dictionary similar to the one returned by /word-frequency,
     but excluding words in the ignore list and filtered by the specified percentile.
 
+    Supports the same format, sort, paging and profile query parameters as
+    /word-frequency; paging applies to the filtered result.
+
     Note: Provide article TITLE in the request body, not full URL.
     """
-    frequency_dict = await _compute_frequency(params.article, params.depth)
+    budget = CrawlBudget(params.max_articles, params.max_bytes, params.deadline)
+    frequency_table, crawl_status, run_profile = await _frequency_for(
+        params.article, params.depth, budget, profile
+    )
+
+    # Apply the ignore list, then the percentile filter
+    frequency_table = filter_table(
+        frequency_table, params.ignore_list, params.percentile
+    )
+
+    return _frequency_response(
+        response,
+        frequency_table,
+        crawl_status,
+        _response_format(request, response_format),
+        page_params,
+        _profile_headers(run_profile),
+    )
+
+
+async def _run_job(job: Job, params: JobSchema) -> tuple[FrequencyTable, dict]:
+    budget = CrawlBudget(params.max_articles, params.max_bytes, params.deadline)
+    frequency_table, crawl_status = await _compute_frequency(
+        params.article, params.depth, budget, observer=job.attach
+    )
+    return (
+        filter_table(frequency_table, params.ignore_list, params.percentile),
+        crawl_status,
+    )
+
+
+def _get_job(job_id: str) -> Job:
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "Job not found",
+                "message": "Unknown job id, or its result was already fetched",
+            },
+        )
+    return job
+
+
+@app.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(params: JobSchema, response: Response):
+    """Start a /keywords computation in the background and return its id at once.
+
+    ignore_list and percentile are optional, so without them the job computes
+    the /word-frequency result. Follow progress with GET /jobs/{id} or the
+    /jobs/{id}/events stream, fetch the result once from /jobs/{id}/result,
+    and cancel with DELETE /jobs/{id}.
+    """
+    if job_store.full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error": "Too many jobs",
+                "message": f"At most {JOBS_MAX} jobs can be running or waiting "
+                "for their result to be fetched",
+            },
+        )
+    job = job_store.submit(params.model_dump(), lambda job: _run_job(job, params))
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job.snapshot()
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status of a job and, while it runs, its traversal progress: current
+    depth, articles done, in flight and queued, bytes fetched and ETA."""
+    return _get_job(job_id).snapshot()
+
+
+def _server_sent_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_events(job: Job):
+    while not job.finished.is_set():
+        yield _server_sent_event("progress", job.snapshot())
+        try:
+            await asyncio.wait_for(job.finished.wait(), JOB_PROGRESS_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+    yield _server_sent_event(job.status, job.snapshot())
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events: a "progress" event every JOB_PROGRESS_INTERVAL
+    seconds while the job runs, then one "done", "failed" or "cancelled"
+    event. Disconnecting does not affect the job."""
+    return StreamingResponse(
+        _job_events(_get_job(job_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(
+    job_id: str,
+    request: Request,
+    response: Response,
+    response_format: ResponseFormat | None = FORMAT_QUERY,
+    sort: SortOrder | None = Query(
+        None, description="Order words by descending count or alphabetically"
+    ),
+):
+    """The result of a finished job, in the same formats as /keywords.
+
+    The job is removed once its result (or its error) has been returned."""
+    job = _get_job(job_id)
+    if not job.finished.is_set():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "Job still running", "progress": job.progress()},
+        )
+    job_store.pop(job_id)
+    if job.error is not None:
+        raise job.error
+    if job.status == "cancelled":
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail={"error": "Job cancelled"},
+        )
+
+    frequency_table, crawl_status = job.result
+    return _frequency_response(
+        response,
+        frequency_table,
+        crawl_status,
+        _response_format(request, response_format),
+        PageParams(sort, None, None, None, None, None),
+    )
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a job, stopping its traversal, and discard it.
+
+    Returns once the traversal's tasks have stopped."""
+    job = _get_job(job_id)
+    job_store.cancel(job_id)
+    await job.finished.wait()
+    return job.snapshot()
+
+
+@app.get("/plan")
+async def plan(
+    article: str = Query(..., min_length=1, description="Wikipedia article title"),
+    depth: int = Query(..., ge=1, le=5, description="Traversal depth (1-5)"),
+):
+    """Estimate the size of a traversal from the link graph, without fetching.
+
+    ``articles`` counts the articles known to be in the visit set; if
+    ``complete`` is false, ``unknown`` articles still need to be fetched to
+    discover the rest of it.
+    """
+    # An ingested dump carries its own, complete link graph
+    graph = link_graph if dump_store is None else dump_store.links
+    if graph is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error": "Link graph disabled",
+                "message": "Set LINK_GRAPH_PATH to enable traversal planning",
+            },
+        )
+
+    crawl_plan = await asyncio.to_thread(graph.plan, WIKIPEDIA_LANG, article, depth)
+    return {
+        "article": normalize_title(article),
+        "depth": depth,
+        "articles": crawl_plan.size,
+        "complete": crawl_plan.complete,
+        "unknown": len(crawl_plan.unknown),
+    }
+
+
+def _get_profile(profile_id: str) -> Profile:
+    profile = profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Profile not found", "profile_id": profile_id},
+        )
+    return profile
+
+
+@app.get("/profiles/{profile_id}", dependencies=[Depends(_require_admin)])
+async def get_profile(profile_id: str):
+    """Per-phase breakdown and sample count of a profiled traversal."""
+    return {
+        **_get_profile(profile_id).summary(),
+        "stacks": f"/profiles/{profile_id}/stacks",
+    }
+
+
+@app.get("/profiles/{profile_id}/stacks", dependencies=[Depends(_require_admin)])
+async def get_profile_stacks(profile_id: str):
+    """Sampled stacks in collapsed format, for flamegraph.pl or speedscope."""
+    profile = _get_profile(profile_id)
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{profile_id}.txt"'
+        },
+    )
+
+
+@app.get("/traces/{trace_id}", dependencies=[Depends(_require_admin)])
+async def get_trace(
+    trace_id: str,
+    format: Literal["chrome", "otlp"] = Query(
+        "chrome",
+        description="chrome: Chrome trace-event JSON (chrome://tracing, Perfetto); "
+        "otlp: an OTLP/JSON ExportTraceServiceRequest",
+    ),
+):
+    """Per-article spans of a traversal, as named by its X-Trace-Id header."""
+    trace = traces.get(trace_id)
+    if trace is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "Trace not found", "trace_id": trace_id},
+        )
+    return JSONResponse(
+        trace.chrome() if format == "chrome" else trace.otlp(),
+        headers={
+            "Content-Disposition": f'attachment; filename="trace-{trace_id}.json"'
+        },
+    )
+
 
-    # Apply ignore list filter
-    if params.ignore_list:
-        frequency_dict = filter_by_ignore_list(frequency_dict, params.ignore_list)
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics of the crawl and parse hot paths."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
-    # Apply percentile filter
-    frequency_dict = filter_by_percentile(frequency_dict, params.percentile)
 
-    return frequency_dict
+@app.get("/stats")
+async def stats():
+    """Connection pool, per-host concurrency and cache statistics."""
+    return {
+        "http_pool": pool_stats(http_client) if http_client else {},
+        "concurrency": limiter_stats(),
+        "article_cache": article_cache.stats if article_cache else {},
+        "parse_cache": parse_cache.stats if parse_cache is not None else {},
+        "link_graph": link_graph.stats if link_graph is not None else {},
+        "result_cache": (
+            {
+                **result_cache.stats,
+                "entries": len(result_cache),
+                "bytes": result_cache.total_bytes,
+            }
+            if result_cache is not None
+            else {}
+        ),
+        "jobs": job_store.stats,
+        "crawl_states": (
+            {"roots": len(crawl_states)} if crawl_states is not None else {}
+        ),
+        "coalescing": {
+            "traversals": dict(crawl_flights.stats),
+            "articles": dict(article_flights.stats),
+        },
+    }
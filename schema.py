@@ -10,6 +10,15 @@ class KeywordSchema(BaseModel):
     percentile: int = Field(
         ..., ge=0, le=100, description="Percentile threshold (0-100)"
     )
+    max_articles: int | None = Field(
+        None, ge=1, description="Stop after fetching this many articles"
+    )
+    max_bytes: int | None = Field(
+        None, ge=1, description="Stop after fetching this much article HTML"
+    )
+    deadline: float | None = Field(
+        None, gt=0, description="Stop starting new articles after this many seconds"
+    )
 
     @field_validator("article")
     @classmethod
@@ -24,3 +33,10 @@ class KeywordSchema(BaseModel):
             )
 
         return v.strip()
+
+
+class JobSchema(KeywordSchema):
+    """A background /keywords computation; without ignore_list and percentile
+    it is the /word-frequency result."""
+
+    percentile: int = Field(0, ge=0, le=100, description="Percentile threshold (0-100)")
@@ -0,0 +1,162 @@
+"""Persistent, size-bounded on-disk cache for fetched article HTML."""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from config import normalize_title
+
+
+@dataclass
+class CachedArticle:
+    body: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers for revalidating this entry with a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ArticleCache:
+    """SQLite-backed article store keyed by language + normalized title.
+
+    Entries are served locally while younger than ``ttl`` seconds; older entries
+    are revalidated with If-None-Match / If-Modified-Since. The total stored body
+    size is kept under ``max_bytes`` by evicting least recently used entries.
+
+    Reads only note their access time; the notes are written in batches with
+    the next store, so cache hits never write to the database. Every method
+    does blocking SQLite I/O: call it off the event loop.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                lang TEXT NOT NULL,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (lang, title)
+            )
+            """)
+        self._conn.commit()
+        self._accessed: dict[tuple[str, str], float] = {}  # not yet written
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "not_modified": 0,
+            "evictions": 0,
+            "bytes_served": 0,
+            "bytes_downloaded": 0,
+        }
+
+    def get(self, lang: str, article: str) -> CachedArticle | None:
+        """Return the cached entry (fresh or stale) and mark it as recently used."""
+        title = normalize_title(article)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM articles "
+                "WHERE lang = ? AND title = ?",
+                (lang, title),
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[(lang, title)] = time.time()
+        return CachedArticle(*row)
+
+    def put(
+        self,
+        lang: str,
+        article: str,
+        body: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store a freshly downloaded body, evicting old entries if over budget."""
+        title = normalize_title(article)
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles "
+                "(lang, title, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (lang, title, body, etag, last_modified, now, now, size),
+            )
+            self._accessed.pop((lang, title), None)
+            self._write_accessed()
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, lang: str, article: str) -> None:
+        """Reset the TTL of an entry after a 304 Not Modified response."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE articles SET fetched_at = ? WHERE lang = ? AND title = ?",
+                (time.time(), lang, normalize_title(article)),
+            )
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM articles"
+            ).fetchone()[0]
+
+    def _write_accessed(self) -> None:
+        """Write the access times noted by reads since the last store."""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE articles SET accessed_at = ? WHERE lang = ? AND title = ?",
+                [(at, lang, title) for (lang, title), at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM articles"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT lang, title, size FROM articles ORDER BY accessed_at ASC"
+        ).fetchall()
+        for lang, title, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM articles WHERE lang = ? AND title = ?", (lang, title)
+            )
+            total -= size
+            self.stats["evictions"] += 1
+        logging.debug(f"Article cache evicted down to {total/1024:.1f}KB")
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_accessed()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,36 @@
+"""Per-request crawl budgets."""
+
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CrawlBudget:
+    """Optional bounds on a traversal besides its depth.
+
+    Attributes:
+        max_articles: Maximum number of articles to fetch
+        max_bytes: Maximum bytes of article content downloaded (cache hits are free)
+        deadline: Wall-clock seconds after which no new articles are started
+    """
+
+    max_articles: int | None = None
+    max_bytes: int | None = None
+    deadline: float | None = None
+    started_at: float = field(default_factory=time.monotonic)
+
+    def limits(self) -> tuple[int | None, int | None, float | None]:
+        return self.max_articles, self.max_bytes, self.deadline
+
+    def exhausted(self, articles: int, bytes_fetched: int) -> str | None:
+        """Return the name of the first exhausted limit, or None if within budget."""
+        if self.max_articles is not None and articles >= self.max_articles:
+            return "max_articles"
+        if self.max_bytes is not None and bytes_fetched >= self.max_bytes:
+            return "max_bytes"
+        if (
+            self.deadline is not None
+            and time.monotonic() - self.started_at >= self.deadline
+        ):
+            return "deadline"
+        return None
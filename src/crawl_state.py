@@ -0,0 +1,103 @@
+"""Per-root traversal state kept between requests for depth-incremental crawls."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.vocabulary import Vocabulary, WordCounts
+
+
+@dataclass
+class CrawlState:
+    """Everything a complete traversal of one root learned, level by level.
+
+    Attributes:
+        levels: Aggregated (ids, counts) of the articles at each depth, as
+            sparse arrays over ``vocabulary``
+        vocabulary: Words of the root's traversals; later runs intern into it
+        depths: Depth of every visited article (including failed ones)
+        failed: Visited articles that could not be fetched or parsed
+        frontier: Links found at the last level that have not been visited yet
+        created_at: time.monotonic() when the first level was stored; the
+            levels are only served for the store's TTL after that
+    """
+
+    levels: list[tuple[np.ndarray, np.ndarray]] = field(default_factory=list)
+    vocabulary: Vocabulary = field(default_factory=Vocabulary)
+    depths: dict[str, int] = field(default_factory=dict)
+    failed: set[str] = field(default_factory=set)
+    frontier: list[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def depth(self) -> int:
+        """Number of complete levels stored."""
+        return len(self.levels)
+
+    def expired(self, ttl: float) -> bool:
+        return time.monotonic() - self.created_at >= ttl
+
+    def word_counts(self, depth: int) -> WordCounts:
+        """Sum of the per-level counts for the first ``depth`` levels."""
+        total = WordCounts(self.vocabulary)
+        for ids, counts in self.levels[:depth]:
+            total.add(ids, counts)
+        return total
+
+    def articles_within(self, depth: int) -> int:
+        """Number of successfully processed articles shallower than ``depth``."""
+        return sum(
+            1
+            for article, article_depth in self.depths.items()
+            if article_depth < depth and article not in self.failed
+        )
+
+
+class CrawlStateStore:
+    """LRU-bounded CrawlState per root, with a lock per root.
+
+    A state older than ``ttl`` seconds is dropped on access, so stored levels
+    are refetched (and revalidated against the article cache) as often as
+    results expire from the result cache.
+
+    A traversal holds the root's lock while it reads and extends the state,
+    so concurrent requests for different depths of the same root take turns
+    and the later one reuses what the earlier one stored.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._states: OrderedDict[Hashable, CrawlState] = OrderedDict()
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    def lock(self, key: Hashable) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def get(self, key: Hashable) -> CrawlState:
+        """Return the state for a root, creating an empty one if needed."""
+        state = self._states.get(key)
+        if state is not None and state.expired(self.ttl):
+            state = self._states[key] = CrawlState()
+        if state is None:
+            state = self._states[key] = CrawlState()
+            while len(self._states) > self.max_entries:
+                oldest, _ = self._states.popitem(last=False)
+                lock = self._locks.get(oldest)
+                if lock is not None and not lock.locked():
+                    del self._locks[oldest]
+        self._states.move_to_end(key)
+        return state
+
+    def clear(self) -> None:
+        self._states.clear()
+
+    def __len__(self) -> int:
+        return len(self._states)
@@ -0,0 +1,117 @@
+"""Ingest a pages-articles XML dump into a DumpStore.
+
+The dump is decompressed (for .bz2) and parsed incrementally: each <page> is
+tokenized and written out in batches, then dropped from the tree, so memory
+stays constant however large the dump is.
+
+Usage:
+    python -m src.dump_ingest enwiki-latest-pages-articles.xml.bz2 --store enwiki.sqlite
+"""
+
+import argparse
+import bz2
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from lxml import etree
+
+from config import WIKIPEDIA_LANG
+from logging_config import setup_logging
+from src.dump_store import DumpStore
+from src.wikitext import extract_words_and_links_from_wikitext
+
+
+@dataclass
+class DumpPage:
+    title: str
+    namespace: int
+    text: str
+    redirect: str | None = None
+
+
+def open_dump(path: str):
+    """Open a dump for streaming reads, decompressing .bz2 on the fly."""
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def iter_pages(source) -> Iterator[DumpPage]:
+    """Yield the pages of a dump file object one at a time."""
+    for _, page in etree.iterparse(source, events=("end",), tag="{*}page"):
+        redirect = page.find("{*}redirect")
+        yield DumpPage(
+            title=page.findtext("{*}title", ""),
+            namespace=int(page.findtext("{*}ns", "0")),
+            text=page.findtext("{*}revision/{*}text", "") or "",
+            redirect=redirect.get("title") if redirect is not None else None,
+        )
+        # Free the page and everything parsed before it
+        page.clear()
+        while page.getprevious() is not None:
+            del page.getparent()[0]
+
+
+def ingest_dump(path: str, store: DumpStore, batch_size: int = 1000) -> dict[str, int]:
+    """Tokenize every main-namespace article of a dump into ``store``.
+
+    Returns counts of stored articles, redirects and skipped pages.
+    """
+    stats = Counter()
+    articles, links, redirects = [], [], []
+
+    def flush():
+        store.put_many(articles, redirects)
+        store.links.put_many(store.lang, links)
+        articles.clear()
+        links.clear()
+        redirects.clear()
+
+    with open_dump(path) as source:
+        for page in iter_pages(source):
+            if page.namespace != 0:
+                stats["skipped"] += 1
+                continue
+            if page.redirect:
+                redirects.append((page.title, page.redirect))
+                stats["redirects"] += 1
+            else:
+                word_counter, page_links = extract_words_and_links_from_wikitext(
+                    page.text, True
+                )
+                articles.append(
+                    (page.title, word_counter, len(page.text.encode("utf-8")))
+                )
+                links.append((page.title, page_links))
+                stats["articles"] += 1
+            if len(articles) + len(redirects) >= batch_size:
+                flush()
+    flush()
+    return dict(stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("dump", help="pages-articles XML dump (.xml or .xml.bz2)")
+    parser.add_argument("--store", required=True, help="SQLite file to write")
+    parser.add_argument(
+        "--lang", default=WIKIPEDIA_LANG, help="Wikipedia language of the dump"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_logging(level=logging.INFO)
+    start = time.perf_counter()
+    store = DumpStore(args.store, args.lang)
+    try:
+        stats = ingest_dump(args.dump, store, args.batch_size)
+    finally:
+        store.close()
+    logging.info(f"Ingested {stats} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Local article store built from a Wikipedia XML dump."""
+
+import math
+import sqlite3
+import threading
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+
+from config import normalize_title
+from src.extraction import expand_compact
+from src.link_graph import LinkGraph
+
+
+class DumpStore:
+    """SQLite file holding per-article word counts, redirects and the link graph.
+
+    Word counts are stored compactly (newline-joined words plus a typed array
+    of counts), so loading an article needs no parsing at all. Links live in
+    the same file as a LinkGraph whose entries never expire, so traversals
+    can also be planned from it.
+    """
+
+    def __init__(self, path: str, lang: str):
+        self.lang = lang
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                title TEXT PRIMARY KEY,
+                words TEXT NOT NULL,
+                counts BLOB NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS redirects (
+                title TEXT PRIMARY KEY,
+                target TEXT NOT NULL
+            );
+            """)
+        self._conn.commit()
+        self.links = LinkGraph(path, ttl=math.inf)
+
+    def put_many(
+        self, articles: Iterable[tuple[str, Counter, int]], redirects=()
+    ) -> None:
+        """Store (title, word_counter, text_size) articles and (title, target) redirects."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO articles (title, words, counts, size) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        normalize_title(title),
+                        "\n".join(word_counter),
+                        array("I", word_counter.values()).tobytes(),
+                        size,
+                    )
+                    for title, word_counter, size in articles
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO redirects (title, target) VALUES (?, ?)",
+                (
+                    (normalize_title(title), normalize_title(target))
+                    for title, target in redirects
+                ),
+            )
+            self._conn.commit()
+
+    def _resolve(self, title: str) -> str:
+        row = self._conn.execute(
+            "SELECT target FROM redirects WHERE title = ?", (title,)
+        ).fetchone()
+        return row[0] if row else title
+
+    def get(
+        self, article: str, need_links: bool
+    ) -> tuple[Counter, list[str], int] | None:
+        """Return (word_counter, links, text_size) of an article, following a
+        redirect, or None if the dump does not contain it."""
+        with self._lock:
+            title = self._resolve(normalize_title(article))
+            row = self._conn.execute(
+                "SELECT words, counts, size FROM articles WHERE title = ?", (title,)
+            ).fetchone()
+        if row is None:
+            return None
+        words, counts, size = row
+        word_counter = expand_compact(
+            words.split("\n") if words else [], array("I", counts)
+        )
+        links = (self.links.get(self.lang, title) or []) if need_links else []
+        return word_counter, links, size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self) -> None:
+        self.links.close()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,161 @@
+"""HTML extraction of words and article links (BeautifulSoup pipeline).
+
+Module-level functions so they can run in worker processes as well as threads.
+"""
+
+import logging
+import re
+import time
+from array import array
+from collections import Counter
+from urllib.parse import unquote
+
+from bs4 import BeautifulSoup
+
+WORD_PATTERN = re.compile(r"\b[a-záéíóöőúüűA-ZÁÉÍÓÖŐÚÜŰ]+\b")
+# Classes to exclude from content extraction (navigation, metadata, etc.)
+EXCLUDED_CLASSES = ["navbox", "infobox", "noprint", "noviewer", "printfooter"]
+
+
+def count_words(text: str) -> Counter:
+    """Count the lower-cased WORD_PATTERN matches in plain text."""
+    return Counter(map(str.lower, WORD_PATTERN.findall(text)))
+
+
+def is_article_title(title: str) -> bool:
+    """True for main-namespace titles; File:, Special: etc. contain a colon."""
+    return ":" not in title and bool(title.strip())
+
+
+def title_from_href(href: str) -> str | None:
+    """Turn an <a href> into a Wikipedia article title, or None if it isn't one.
+
+    Handles both relative (/wiki/...) and absolute (https://...wikipedia.org/wiki/...)
+    links, drops fragments and query strings, URL-decodes the title and skips
+    namespaced pages (File:, Special:, etc.).
+    """
+    # Skip if only a fragment
+    if href.startswith("#"):
+        return None
+
+    if href.startswith("/wiki/"):
+        # Relative link
+        article_title = href[6:]
+    elif "/wiki/" in href and ("wikipedia.org" in href or "wikipédia" in href.lower()):
+        # Absolute Wikipedia link
+        wiki_index = href.find("/wiki/")
+        article_title = href[wiki_index + 6 :]
+    else:
+        # Not a Wikipedia article link
+        return None
+
+    # Skip if contains # (fragments) - remove fragment part
+    if "#" in article_title:
+        article_title = article_title.split("#")[0]
+        if not article_title:  # Was only a fragment
+            return None
+
+    # Skip if contains ? (query parameters) - remove query part
+    if "?" in article_title:
+        article_title = article_title.split("?")[0]
+        if not article_title:
+            return None
+
+    # URL decode the title
+    decoded_title = unquote(article_title)
+
+    # Skip special pages like File:, Special:, etc. and empty titles
+    if not is_article_title(decoded_title):
+        return None
+
+    return decoded_title
+
+
+def _has_excluded_class(class_value) -> bool:
+    return bool(class_value) and any(
+        cls in class_value.lower() for cls in EXCLUDED_CLASSES
+    )
+
+
+def extract_links_from_soup(body_content) -> list[str]:
+    """Extract Wikipedia article links from parsed soup content.
+
+    Args:
+        body_content: BeautifulSoup element for mw-content-text div
+
+    Returns:
+        List of article titles (URL-decoded, without /wiki/ prefix)
+    """
+    # Remove excluded classes before extracting links
+    for element in body_content.find_all(class_=_has_excluded_class):
+        element.decompose()
+
+    links = set()  # Use set to avoid duplicates
+
+    for link in body_content.find_all("a", href=True):
+        decoded_title = title_from_href(link["href"])
+        if decoded_title:
+            links.add(decoded_title)
+
+    logging.debug(f"Extracted {len(links)} unique links from article")
+    return list(links)
+
+
+def extract_words_and_links(
+    html_text: str, need_links: bool
+) -> tuple[Counter, list[str]]:
+    """Parse HTML once, extract words and optionally links.
+
+    Thread-safe: returns a Counter instead of mutating shared state.
+
+    Args:
+        html_text: Raw HTML content
+        need_links: Whether to extract links for next depth level
+
+    Returns:
+        Tuple of (word_counter, links)
+    """
+    parse_start = time.perf_counter()
+    soup = BeautifulSoup(html_text, "lxml")
+
+    body_content = soup.find("div", id="mw-content-text")
+
+    if not body_content:
+        logging.warning("mw-content-text div not found in HTML")
+        return Counter(), []
+
+    # Extract links BEFORE decomposing tables (tables contain valid links)
+    links = extract_links_from_soup(body_content) if need_links else []
+
+    # Remove script, style, navigation, and non-content elements
+    for element in body_content.find_all(["script", "style", "nav", "table"]):
+        element.decompose()
+
+    # Remove elements with excluded classes (navigation, metadata, etc.)
+    for element in body_content.find_all(class_=_has_excluded_class):
+        element.decompose()
+
+    # Get text with separator to avoid word concatenation
+    text = body_content.get_text(separator=" ", strip=True)
+
+    words = WORD_PATTERN.findall(text)
+    word_counter = Counter(word.lower() for word in words)
+
+    parse_time = time.perf_counter() - parse_start
+    logging.info(f"Extracted {len(words)} words in {parse_time:.3f}s")
+
+    return word_counter, links
+
+
+def extract_compact(
+    html_text: str, need_links: bool, extractor=extract_words_and_links
+) -> tuple[list[str], array, list[str]]:
+    """Run an extractor but return (words, counts, links) with the counts in a
+    typed array, which pickles far smaller than a Counter."""
+    word_counter, links = extractor(html_text, need_links)
+    return list(word_counter), array("I", word_counter.values()), links
+
+
+def expand_compact(words: list[str], counts: array) -> Counter:
+    """Rebuild a Counter from the (words, counts) pair of extract_compact."""
+    return Counter(dict(zip(words, counts)))
@@ -0,0 +1,216 @@
+"""Compact frequency results and their streaming JSON encodings."""
+
+import hashlib
+import heapq
+import sys
+from collections.abc import Iterator, Mapping
+from functools import cached_property
+from json.encoder import encode_basestring
+
+import numpy as np
+
+from src.vocabulary import WordCounts
+
+SORT_ORDERS = ("count", "word")
+
+# Rows encoded per yielded chunk of a streamed response
+STREAM_CHUNK_ROWS = 2048
+
+
+class FrequencyTable:
+    """Words and counts of a traversal, with percentages computed on demand.
+
+    Holds one string reference and one int64 per word instead of a
+    ``{"count", "percentage"}`` dict, so results can be cached and streamed
+    without materializing the frequency dictionary. Percentages are relative
+    to ``total``, which subsets made by ``select`` and ``take`` keep.
+
+    ``lowercase`` records that every word is known to be lowercase (tables
+    built from WordCounts of an all-lowercase vocabulary), so case-insensitive
+    lookups need not lowercase the words again. The table keeps no reference
+    to the vocabulary, which is freed with its traversal.
+    """
+
+    def __init__(
+        self,
+        words: list[str],
+        counts: np.ndarray,
+        total: int,
+        lowercase: bool = False,
+    ):
+        self.words = words
+        self.counts = counts
+        self.total = total
+        self.lowercase = lowercase
+
+    @classmethod
+    def from_counts(cls, word_counts: Mapping[str, int]) -> "FrequencyTable":
+        if isinstance(word_counts, WordCounts):
+            ids, counts = word_counts.nonzero()
+            words = word_counts.vocabulary.decode(ids)
+            lowercase = word_counts.vocabulary.all_lowercase
+            return cls(words, counts, int(counts.sum()), lowercase)
+        words = list(word_counts)
+        counts = np.fromiter(word_counts.values(), dtype=np.int64, count=len(words))
+        return cls(words, counts, int(counts.sum()))
+
+    def percentage(self, count: int) -> float:
+        return round((count / self.total) * 100, 4)
+
+    def order(self, sort: str | None = None) -> np.ndarray:
+        """Row indices in the requested order.
+
+        ``None`` keeps first-seen order, "count" is most frequent first (ties
+        keep first-seen order) and "word" is alphabetical.
+        """
+        if sort is None:
+            return np.arange(len(self.words))
+        if sort == "count":
+            return np.argsort(-self.counts, kind="stable")
+        if sort == "word":
+            return np.fromiter(
+                sorted(range(len(self.words)), key=self.words.__getitem__),
+                dtype=np.int64,
+                count=len(self.words),
+            )
+        raise ValueError(f"Unknown sort order {sort!r}, expected one of {SORT_ORDERS}")
+
+    def first(self, k: int, sort: str | None = None) -> np.ndarray:
+        """The first ``k`` row indices of ``order(sort)``, without a full sort.
+
+        "count" partitions around the k-th largest count and sorts only the
+        selected rows, taking boundary ties in first-seen order so the result
+        is always a prefix of the full order; "word" keeps a k-sized heap.
+        """
+        n = len(self.words)
+        k = min(k, n)
+        if sort is None:
+            return np.arange(k)
+        if sort == "count":
+            if k == n:
+                return self.order("count")
+            if k == 0:
+                return np.zeros(0, dtype=np.int64)
+            kth = np.partition(self.counts, n - k)[n - k]
+            above = np.flatnonzero(self.counts > kth)
+            ties = np.flatnonzero(self.counts == kth)[: k - len(above)]
+            chosen = np.sort(np.concatenate([above, ties]))
+            return chosen[np.argsort(-self.counts[chosen], kind="stable")]
+        if sort == "word":
+            return np.fromiter(
+                heapq.nsmallest(k, range(n), key=self.words.__getitem__),
+                dtype=np.int64,
+                count=k,
+            )
+        raise ValueError(f"Unknown sort order {sort!r}, expected one of {SORT_ORDERS}")
+
+    def rows(self, sort: str | None = None) -> Iterator[tuple[str, int, float]]:
+        """Yield (word, count, percentage) rows, computing percentages lazily.
+
+        Counts are converted to Python ints one block at a time, so iterating
+        allocates no per-row objects beyond the block being yielded.
+        """
+        order = self.order(sort)
+        words = self.words
+        for start in range(0, len(order), STREAM_CHUNK_ROWS):
+            block = order[start : start + STREAM_CHUNK_ROWS]
+            for index, count in zip(block.tolist(), self.counts[block].tolist()):
+                yield words[index], count, self.percentage(count)
+
+    def select(self, keep: np.ndarray) -> "FrequencyTable":
+        """Subset of rows by boolean mask, with percentages of the full table."""
+        return self.take(np.flatnonzero(keep))
+
+    def take(self, indices: np.ndarray) -> "FrequencyTable":
+        """Rows at ``indices``, in that order, with percentages of the full table."""
+        words = self.words
+        return FrequencyTable(
+            [words[index] for index in indices.tolist()],
+            self.counts[indices],
+            self.total,
+            self.lowercase,
+        )
+
+    def rows_matching(self, lowercase_words: set[str]) -> np.ndarray:
+        """Boolean mask of the rows whose lowercased word is in ``lowercase_words``.
+
+        Words of a lowercase table are checked as they are; otherwise every
+        word is lowercased first.
+        """
+        if self.lowercase:
+            return np.fromiter(
+                map(lowercase_words.__contains__, self.words),
+                dtype=bool,
+                count=len(self.words),
+            )
+        return np.fromiter(
+            (word.lower() in lowercase_words for word in self.words),
+            dtype=bool,
+            count=len(self.words),
+        )
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Digest of the rows and their order; equal tables page identically."""
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(self.counts.tobytes())
+        for start in range(0, len(self.words), STREAM_CHUNK_ROWS):
+            chunk = self.words[start : start + STREAM_CHUNK_ROWS]
+            digest.update("\n".join(chunk).encode("utf-8") + b"\n")
+        return digest.hexdigest()
+
+    def to_dict(self, sort: str | None = None) -> dict[str, dict[str, float | int]]:
+        return {
+            word: {"count": count, "percentage": percentage}
+            for word, count, percentage in self.rows(sort)
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the table, in bytes."""
+        return (
+            self.counts.nbytes
+            + sys.getsizeof(self.words)
+            + sum(map(sys.getsizeof, self.words))
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+# Rows are formatted directly: words are escaped with the encoder json.dumps
+# uses for ensure_ascii=False (as the buffered JSONResponse does), and ints and
+# finite floats format exactly as json.dumps writes them
+
+
+def ndjson_chunks(table: FrequencyTable, sort: str | None = None) -> Iterator[bytes]:
+    """Encode a table as newline-delimited ``{"word","count","percentage"}`` rows."""
+    lines = []
+    for word, count, percentage in table.rows(sort):
+        lines.append(
+            f'{{"word":{encode_basestring(word)},"count":{count},'
+            f'"percentage":{percentage}}}\n'
+        )
+        if len(lines) >= STREAM_CHUNK_ROWS:
+            yield "".join(lines).encode("utf-8")
+            lines.clear()
+    if lines:
+        yield "".join(lines).encode("utf-8")
+
+
+def json_chunks(table: FrequencyTable, sort: str | None = None) -> Iterator[bytes]:
+    """Encode a table incrementally as the same JSON object the buffered
+    response returns, ``{"word": {"count": ..., "percentage": ...}, ...}``."""
+    parts = ["{"]
+    separator = ""
+    for word, count, percentage in table.rows(sort):
+        parts.append(
+            f'{separator}{encode_basestring(word)}:{{"count":{count},'
+            f'"percentage":{percentage}}}'
+        )
+        separator = ","
+        if len(parts) >= STREAM_CHUNK_ROWS:
+            yield "".join(parts).encode("utf-8")
+            parts.clear()
+    parts.append("}")
+    yield "".join(parts).encode("utf-8")
@@ -0,0 +1,78 @@
+"""App-wide shared HTTP client with connection pool instrumentation."""
+
+from collections import Counter
+
+import httpx
+
+from config import (
+    HEADERS,
+    REQUEST_TIMEOUT,
+    HTTP2_ENABLED,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+)
+from src.limiter import RetryingTransport
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport that counts requests, TCP connects and TLS handshakes.
+
+    Counting uses httpcore's per-request trace extension, so connections
+    reused from the pool show up as requests without a new connect.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = Counter()
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.stats["tcp_connects"] += 1
+        elif event_name == "connection.start_tls.complete":
+            self.stats["tls_handshakes"] += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats["requests"] += 1
+        request.extensions = {**request.extensions, "trace": self._trace}
+        return await super().handle_async_request(request)
+
+    def pool_stats(self) -> dict[str, int]:
+        """Snapshot of the connection pool plus cumulative connection counters."""
+        connections = self._pool.connections
+        return {
+            "connections": len(connections),
+            "idle": sum(1 for c in connections if c.is_idle()),
+            "http2": sum(1 for c in connections if "HTTP/2" in c.info()),
+            "requests": self.stats["requests"],
+            "tcp_connects": self.stats["tcp_connects"],
+            "tls_handshakes": self.stats["tls_handshakes"],
+        }
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the pooled client shared by every WikiFrequencyCounter in the app.
+
+    Requests go through a RetryingTransport, which retries throttled and
+    failed requests and feeds the per-host concurrency limiters.
+    """
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    transport = InstrumentedTransport(http2=HTTP2_ENABLED, limits=limits)
+    return httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        transport=RetryingTransport(transport),
+    )
+
+
+def pool_stats(client: httpx.AsyncClient) -> dict[str, int]:
+    transport = client._transport
+    if isinstance(transport, RetryingTransport):
+        transport = transport.inner
+    if isinstance(transport, InstrumentedTransport):
+        return transport.pool_stats()
+    return {}
@@ -0,0 +1,51 @@
+"""Lightweight runtime instrumentation for the crawler."""
+
+import time
+from collections.abc import Callable
+
+
+class SlotMonitor:
+    """Tracks how busy the concurrent request slots are over time.
+
+    Utilization is the time-weighted average of busy slots divided by the
+    time-weighted capacity, so 100% means every fetch slot was in use for the
+    whole measured interval. ``capacity`` is a fixed number of slots or a
+    callable returning the current one, e.g. an adaptive limiter's limit,
+    sampled whenever the busy count changes.
+    """
+
+    def __init__(self, capacity: int | Callable[[], int]):
+        self._capacity = capacity if callable(capacity) else lambda: capacity
+        self.busy = 0
+        self.peak = 0
+        self._busy_time = 0.0
+        self._capacity_time = 0.0
+        self._started = time.monotonic()
+        self._last_change = self._started
+        self._last_capacity = self.capacity
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity()
+
+    def _advance(self) -> None:
+        now = time.monotonic()
+        self._busy_time += self.busy * (now - self._last_change)
+        self._capacity_time += self._last_capacity * (now - self._last_change)
+        self._last_change = now
+        self._last_capacity = self.capacity
+
+    def acquired(self) -> None:
+        self._advance()
+        self.busy += 1
+        self.peak = max(self.peak, self.busy)
+
+    def released(self) -> None:
+        self._advance()
+        self.busy -= 1
+
+    def utilization(self) -> float:
+        self._advance()
+        if self._capacity_time <= 0:
+            return 0.0
+        return self._busy_time / self._capacity_time
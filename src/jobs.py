@@ -0,0 +1,150 @@
+"""Background traversal jobs with progress reporting and cancellation."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+class Job:
+    """One background computation and, once it finished, its outcome.
+
+    ``status`` is "running", "done", "failed" or "cancelled". A job
+    reports progress through the WikiFrequencyCounter its work attaches.
+    """
+
+    def __init__(self, params: dict):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = "running"
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self.result: Any = None
+        self.error: HTTPException | None = None
+        self.finished = asyncio.Event()
+        self._counter = None
+        self._task: asyncio.Task | None = None
+
+    def attach(self, counter) -> None:
+        """Report progress from this traversal (a WikiFrequencyCounter)."""
+        self._counter = counter
+
+    def progress(self) -> dict | None:
+        return self._counter.progress() if self._counter is not None else None
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state of the job."""
+        snapshot = {
+            "id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress(),
+        }
+        if self.error is not None:
+            snapshot["error"] = {
+                "status_code": self.error.status_code,
+                "detail": self.error.detail,
+            }
+        return snapshot
+
+    async def _run(self, work: Callable[["Job"], Awaitable[Any]]) -> None:
+        try:
+            self.result = await work(self)
+            self.status = "done"
+        except asyncio.CancelledError:
+            self.status = "cancelled"
+        except HTTPException as e:
+            self.error, self.status = e, "failed"
+        except Exception as e:
+            logging.error(f"Job {self.id} failed: {e}", exc_info=True)
+            self.error = HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={"error": "Internal server error"},
+            )
+            self.status = "failed"
+        finally:
+            self._finish()
+
+    def _finish(self, _task: asyncio.Task | None = None) -> None:
+        # Also runs as the task's done callback, for a job cancelled before
+        # its task got to start
+        if self.finished.is_set():
+            return
+        if self.status == "running":
+            self.status = "cancelled"
+        self.finished_at = time.time()
+        self.finished.set()
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+class JobStore:
+    """Bounded in-process registry of background jobs.
+
+    Holds at most ``max_jobs`` jobs, running or finished. Finished jobs are
+    dropped once their result is fetched, or oldest first when room is
+    needed for a new job; running jobs are never evicted.
+    """
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+
+    def full(self) -> bool:
+        return len(self._jobs) >= self.max_jobs and not any(
+            job.finished.is_set() for job in self._jobs.values()
+        )
+
+    def submit(self, params: dict, work: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Start ``work(job)`` in a background task and register the job."""
+        while len(self._jobs) >= self.max_jobs:
+            oldest = next(
+                (job for job in self._jobs.values() if job.finished.is_set()), None
+            )
+            if oldest is None:
+                raise RuntimeError("Job store is full of running jobs")
+            del self._jobs[oldest.id]
+
+        job = Job(params)
+        job._task = asyncio.create_task(job._run(work))
+        job._task.add_done_callback(job._finish)
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def pop(self, job_id: str) -> Job | None:
+        return self._jobs.pop(job_id, None)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a running job and drop it from the store."""
+        job = self._jobs.pop(job_id, None)
+        if job is not None:
+            job.cancel()
+        return job
+
+    async def aclose(self) -> None:
+        """Cancel all running jobs and wait for them to stop."""
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*(job.finished.wait() for job in jobs))
+
+    @property
+    def stats(self) -> dict[str, int]:
+        running = sum(not job.finished.is_set() for job in self._jobs.values())
+        return {"running": running, "finished": len(self._jobs) - running}
+
+    def __len__(self) -> int:
+        return len(self._jobs)
@@ -0,0 +1,315 @@
+"""Adaptive per-host concurrency limits and retries of throttled requests.
+
+Every request to a host shares one AdaptiveLimiter, whichever counter or
+client sends it. Crawl code holds a limiter slot per fetch, and the
+RetryingTransport feeds each response back into the limiter: healthy,
+fast responses grow the limit, throttling and failures cut it, and a
+Retry-After header pauses the host. Throttled, failed and timed out
+requests are retried with jittered exponential backoff, from a per-host
+retry budget.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from config import (
+    MAX_CONCURRENT_REQUESTS,
+    CONCURRENCY_MIN,
+    CONCURRENCY_MAX,
+    CONCURRENCY_LATENCY_TARGET,
+    CONCURRENCY_BACKOFF,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_BUDGET,
+    RETRY_BUDGET_RATIO,
+)
+from src.metrics import FETCHES_IN_FLIGHT, HTTP_ERRORS, SLOT_WAITERS
+
+THROTTLED_STATUSES = (429, 503)
+FAILED_STATUSES = (500, 502, 504)
+
+
+def classify(status_code: int) -> str:
+    """Outcome of a response for the limiter: "ok", "throttled" or "error"."""
+    if status_code in THROTTLED_STATUSES:
+        return "throttled"
+    if status_code in FAILED_STATUSES:
+        return "error"
+    return "ok"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt + 1``."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+
+
+class RetryBudget:
+    """Token bucket of retries, so a failing host is not hit with a multiple
+    of the normal load.
+
+    Holds up to ``capacity`` retries; every first attempt refills ``ratio``
+    of one, every retry takes one.
+    """
+
+    def __init__(self, capacity: float, ratio: float):
+        self.capacity = capacity
+        self.ratio = ratio
+        self.tokens = capacity
+
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for the requests to one host.
+
+    The limit grows by one slot per window of healthy responses, i.e. ones
+    answered within ``latency_target`` seconds while every slot was in use,
+    up to ``maximum``. A throttled or failed response multiplies it by
+    ``backoff``, down to ``minimum``, at most once per window: responses to
+    requests sent before the last cut do not cut it again. A pause (from
+    Retry-After) holds back requests until it ends.
+    """
+
+    def __init__(
+        self,
+        initial: int = MAX_CONCURRENT_REQUESTS,
+        minimum: int = CONCURRENCY_MIN,
+        maximum: int = CONCURRENCY_MAX,
+        latency_target: float = CONCURRENCY_LATENCY_TARGET,
+        backoff: float = CONCURRENCY_BACKOFF,
+        retry_budget: RetryBudget | None = None,
+    ):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.retry_budget = retry_budget or RetryBudget(
+            RETRY_BUDGET, RETRY_BUDGET_RATIO
+        )
+        self.in_flight = 0
+        self.peak = 0
+        self.stats = Counter()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._paused_until = 0.0
+        self._last_cut = 0.0
+
+    @property
+    def slots(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.slots and not self._waiters:
+            self._take()
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()  # Handed a slot just as we were cancelled
+                else:
+                    self._waiters.remove(future)
+                raise
+        # A slot is held while paused, so the pause does not end in a burst
+        try:
+            while (delay := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.slots:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._take()
+                future.set_result(None)
+
+    def record(self, sent_at: float, outcome: str, latency: float = 0.0) -> None:
+        """Adjust the limit to the outcome of a request sent at ``sent_at``."""
+        self.stats[outcome] += 1
+        if outcome == "ok":
+            if latency <= self.latency_target and self.in_flight >= self.slots:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self._wake()
+        elif sent_at >= self._last_cut:
+            self.limit = max(self.minimum, self.limit * self.backoff)
+            self._last_cut = time.monotonic()
+            self.stats["cuts"] += 1
+            logging.warning(f"Request {outcome}; concurrency limit cut to {self.slots}")
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.stats["pauses"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.slots,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "peak": self.peak,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "retry_tokens": round(self.retry_budget.tokens, 2),
+            **self.stats,
+        }
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+# Number of processes that split each host's concurrency (see split_host_budget)
+_budget_parts = 1
+
+
+def split_host_budget(parts: int) -> None:
+    """Limit this process to 1/``parts`` of each host's concurrency.
+
+    For processes crawling the same hosts side by side (crawl shards), so
+    that together they stay within the limits of a single process. Applies
+    to limiters created afterwards.
+    """
+    global _budget_parts
+    _budget_parts = max(parts, 1)
+
+
+def host_key(url: str | httpx.URL) -> str:
+    return httpx.URL(url).netloc.decode("ascii")
+
+
+def host_limiter(url: str | httpx.URL) -> AdaptiveLimiter:
+    """The limiter shared by every request to the host of ``url``."""
+    key = host_key(url)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = _limiters[key] = AdaptiveLimiter(
+            initial=max(MAX_CONCURRENT_REQUESTS // _budget_parts, 1),
+            maximum=max(CONCURRENCY_MAX // _budget_parts, 1),
+        )
+    return limiter
+
+
+def limiter_stats() -> dict[str, dict]:
+    return {host: limiter.snapshot() for host, limiter in _limiters.items()}
+
+
+FETCHES_IN_FLIGHT.set_function(
+    lambda: sum(limiter.in_flight for limiter in _limiters.values())
+)
+SLOT_WAITERS.set_function(
+    lambda: sum(len(limiter._waiters) for limiter in _limiters.values())
+)
+
+
+class RetryingTransport(httpx.AsyncBaseTransport):
+    """Transport that reports each response to the host's limiter and retries
+    throttled (429/503), failed (5xx) and timed out requests.
+
+    A request is retried up to RETRY_ATTEMPTS times while the host's retry
+    budget lasts, after a jittered exponential backoff or the server's
+    Retry-After, whichever is longer. A Retry-After also pauses the whole
+    host; one longer than RETRY_MAX_DELAY is not waited out and the response
+    is returned as is.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = host_limiter(request.url)
+        limiter.retry_budget.deposit()
+        attempt = 0
+        while True:
+            sent_at = time.monotonic()
+            try:
+                response = await self.inner.handle_async_request(request)
+            except httpx.TransportError as e:
+                HTTP_ERRORS.labels(type(e).__name__).inc()
+                limiter.record(sent_at, "error")
+                if not self._may_retry(limiter, attempt):
+                    raise
+                reason, delay = repr(e), backoff_delay(attempt)
+            else:
+                if response.status_code >= 400:
+                    HTTP_ERRORS.labels(str(response.status_code)).inc()
+                outcome = classify(response.status_code)
+                limiter.record(sent_at, outcome, time.monotonic() - sent_at)
+                if outcome == "ok":
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    limiter.pause(min(retry_after, RETRY_MAX_DELAY))
+                    if retry_after > RETRY_MAX_DELAY:
+                        return response
+                if not self._may_retry(limiter, attempt):
+                    return response
+                await response.aclose()
+                reason = f"status {response.status_code}"
+                delay = max(backoff_delay(attempt), retry_after or 0.0)
+
+            attempt += 1
+            limiter.stats["retries"] += 1
+            logging.info(
+                f"Retrying {request.url} ({reason}) in {delay:.2f}s, "
+                f"attempt {attempt + 1}"
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _may_retry(limiter: AdaptiveLimiter, attempt: int) -> bool:
+        if attempt >= RETRY_ATTEMPTS:
+            return False
+        if not limiter.retry_budget.withdraw():
+            limiter.stats["retries_denied"] += 1
+            return False
+        return True
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -0,0 +1,143 @@
+"""Persistent index of each article's outbound links."""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from config import normalize_title
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+
+@dataclass
+class CrawlPlan:
+    """Articles a traversal would visit, as far as the link graph knows.
+
+    Attributes:
+        depths: Depth of every article known to be in the visit set
+        unknown: Articles whose links are needed but not (freshly) indexed;
+            the visit set beyond them could not be planned
+    """
+
+    depths: dict[str, int] = field(default_factory=dict)
+    unknown: set[str] = field(default_factory=set)
+
+    @property
+    def size(self) -> int:
+        return len(self.depths)
+
+    @property
+    def complete(self) -> bool:
+        """True if the whole visit set is known without fetching anything."""
+        return not self.unknown
+
+
+class LinkGraph:
+    """SQLite-backed adjacency store: (language, title) -> outbound titles.
+
+    Each entry records when its links were extracted; entries older than
+    ``ttl`` seconds are treated as unknown so changed articles are re-read.
+    """
+
+    def __init__(self, path: str, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS links (
+                lang TEXT NOT NULL,
+                title TEXT NOT NULL,
+                links TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (lang, title)
+            )
+            """)
+        self._conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, lang: str, article: str) -> list[str] | None:
+        """Return the indexed links of an article, or None if unknown or expired."""
+        return self.get_many(lang, [article]).get(normalize_title(article))
+
+    def get_many(self, lang: str, articles: Iterable[str]) -> dict[str, list[str]]:
+        """Return the fresh entries among ``articles``, keyed by normalized title."""
+        titles = list(dict.fromkeys(normalize_title(article) for article in articles))
+        oldest = time.time() - self.ttl
+        found = {}
+        with self._lock:
+            for start in range(0, len(titles), _QUERY_CHUNK):
+                chunk = titles[start : start + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT title, links FROM links WHERE lang = ? AND fetched_at > ? "
+                    f"AND title IN ({', '.join('?' * len(chunk))})",
+                    (lang, oldest, *chunk),
+                ).fetchall()
+                for title, links in rows:
+                    found[title] = links.split("\n") if links else []
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(titles) - len(found)
+        return found
+
+    def put(self, lang: str, article: str, links: list[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO links (lang, title, links, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (lang, normalize_title(article), "\n".join(links), time.time()),
+            )
+            self._conn.commit()
+        self.stats["stores"] += 1
+
+    def put_many(self, lang: str, entries: Iterable[tuple[str, list[str]]]) -> None:
+        """Store many (article, links) entries in one transaction."""
+        now = time.time()
+        rows = [
+            (lang, normalize_title(article), "\n".join(links), now)
+            for article, links in entries
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO links (lang, title, links, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        self.stats["stores"] += len(rows)
+
+    def plan(self, lang: str, article: str, depth: int) -> CrawlPlan:
+        """Breadth-first expansion of the visit set of a depth-``depth`` traversal.
+
+        Only indexed links are followed, one batched lookup per level. Articles
+        whose links are needed but missing end up in ``unknown``.
+        """
+        plan = CrawlPlan()
+        if depth < 1:
+            return plan
+        level = [normalize_title(article)]
+        plan.depths[level[0]] = 0
+        for current_depth in range(depth - 1):
+            adjacency = self.get_many(lang, level)
+            next_level = []
+            for title in level:
+                links = adjacency.get(title)
+                if links is None:
+                    plan.unknown.add(title)
+                    continue
+                for link in links:
+                    link = normalize_title(link)
+                    if link not in plan.depths:
+                        plan.depths[link] = current_depth + 1
+                        next_level.append(link)
+            level = next_level
+        return plan
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,194 @@
+"""Batched article fetching through the MediaWiki Action API.
+
+Instead of one rendered HTML page per request, a single ``action=query`` call
+returns the wikitext of many titles (``prop=revisions``, whose content is
+only split over continuations when it exceeds the API's result size limit),
+or their main-namespace links for link listings. Text and links are then
+taken from the wikitext like from dump pages (see src.wikitext). Concurrent
+single-article loads are collected for a short window into such multi-title
+queries, and continuation tokens are followed until every requested page is
+complete.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from config import get_api_url, normalize_title
+from src.extraction import is_article_title
+
+
+@dataclass
+class ApiPage:
+    wikitext: str = ""
+    links: list[str] = field(default_factory=list)
+    size: int = 0  # bytes of API response attributed to this page
+
+
+def query_params(titles: list[str], need_text: bool = True) -> dict[str, str]:
+    """Parameters of a multi-title query for wikitext, or else for links."""
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "redirects": "1",
+        "titles": "|".join(titles),
+    }
+    if need_text:
+        # Latest revision of each title; links are parsed from the wikitext
+        params.update(prop="revisions", rvprop="content", rvslots="main")
+    else:
+        params.update(prop="links", plnamespace="0", pllimit="max")  # articles only
+    return params
+
+
+def _resolve(query: dict, titles: list[str]) -> dict[str, str]:
+    """Map each requested title to the page title the API answered with."""
+    renames = {}
+    for rename in (*query.get("normalized", []), *query.get("redirects", [])):
+        renames[rename["from"]] = rename["to"]
+
+    resolved = {}
+    for title in titles:
+        target, seen = title, set()
+        while target in renames and target not in seen:
+            seen.add(target)
+            target = renames[target]
+        resolved[title] = target
+    return resolved
+
+
+async def fetch_pages(
+    client: httpx.AsyncClient,
+    titles: list[str],
+    need_text: bool = True,
+) -> dict[str, ApiPage | None]:
+    """Fetch the wikitext (or only the links) of ``titles`` with one query,
+    plus continuations if the result is too large for one response.
+
+    Link titles are filtered like links found in article HTML. Returns a page
+    per requested title, or None for missing/invalid titles. Raises
+    httpx.HTTPError if a request fails.
+    """
+    params = query_params(titles, need_text)
+    pages: dict[str, ApiPage] = {}
+    absent: set[str] = set()
+    renames: dict = {"normalized": [], "redirects": []}
+    continuation: dict[str, str] = {}
+    while True:
+        r = await client.get(get_api_url(), params={**params, **continuation})
+        r.raise_for_status()
+        data = r.json()
+        if "error" in data:
+            raise httpx.HTTPError(f"MediaWiki API error: {data['error']}")
+
+        query = data.get("query", {})
+        for key in renames:
+            renames[key].extend(query.get(key, []))
+        answered = query.get("pages", [])
+        share = len(r.content) // max(len(answered), 1)
+        for entry in answered:
+            title = entry["title"]
+            if entry.get("missing") or entry.get("invalid"):
+                absent.add(title)
+                continue
+            page = pages.setdefault(title, ApiPage())
+            page.size += share
+            for revision in entry.get("revisions", []):
+                page.wikitext = revision["slots"]["main"]["content"]
+            page.links.extend(
+                normalize_title(link["title"])
+                for link in entry.get("links", [])
+                if is_article_title(link["title"])
+            )
+
+        continuation = data.get("continue")
+        if not continuation:
+            break
+
+    resolved = _resolve(renames, titles)
+    return {
+        title: None if resolved[title] in absent else pages.get(resolved[title])
+        for title in titles
+    }
+
+
+class ApiBatcher:
+    """Collects concurrent single-title loads into multi-title queries.
+
+    A batch is sent once it holds ``titles_per_query`` titles, or ``window``
+    seconds after its first title arrived, whichever comes first. ``query``
+    performs one batch and returns a page (or None) per title; if it raises,
+    every load of the batch raises the same exception.
+    """
+
+    def __init__(
+        self,
+        query: Callable[[list[str]], Awaitable[dict[str, ApiPage | None]]],
+        titles_per_query: int,
+        window: float,
+    ):
+        self._query = query
+        self.titles_per_query = titles_per_query
+        self.window = window
+        self._pending: dict[str, asyncio.Future] = {}
+        self._futures: dict[str, asyncio.Future] = {}  # pending or in a sent batch
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def load(self, article: str) -> ApiPage | None:
+        title = article.replace("_", " ")
+        future = self._futures.get(title)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[title] = self._pending[title] = future
+            future.add_done_callback(lambda _: self._futures.pop(title, None))
+            if len(self._pending) >= self.titles_per_query:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.window, self._flush
+                )
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._send(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _send(self, batch: dict[str, asyncio.Future]) -> None:
+        try:
+            pages = await self._query(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            # Fail the loads rather than report their articles as missing
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for title, future in batch.items():
+            if not future.done():
+                future.set_result(pages.get(title))
+
+    async def aclose(self) -> None:
+        """Cancel pending and in-flight batches."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        for task in list(self._batches):
+            task.cancel()
+        await asyncio.gather(*self._batches, return_exceptions=True)
@@ -0,0 +1,90 @@
+"""Prometheus metrics for the crawl and parse hot paths.
+
+Histograms and counters are updated inline; they cost about a microsecond
+per observation. Gauges of in-flight fetches, slot waiters and frontier
+size, and the cache counters, are read from the live objects only when
+/metrics is scraped, so they add nothing to the hot paths.
+"""
+
+import weakref
+from collections.abc import Iterable
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, Metric
+
+# Exponential buckets: 1 KiB to 4 MiB of HTML, 16 to 256k words, 1 to 16k articles
+_BYTE_BUCKETS = [2**exponent for exponent in range(10, 23, 2)]
+_WORD_BUCKETS = [4**exponent for exponent in range(2, 10)]
+_ARTICLE_BUCKETS = [2**exponent for exponent in range(0, 15)]
+
+FETCH_SECONDS = Histogram(
+    "wiki_fetch_seconds",
+    "Latency of article page fetches and API queries",
+    ["backend"],
+)
+# The dump backend extracts words at ingestion; its crawls observe the
+# lookup of the pre-extracted counts instead
+PARSE_SECONDS = Histogram(
+    "wiki_parse_seconds",
+    "Latency of extracting words and links from an article, including the wait "
+    "for a parser worker",
+    ["backend"],
+)
+ARTICLE_BYTES = Histogram(
+    "wiki_article_bytes", "Size of fetched article content", buckets=_BYTE_BUCKETS
+)
+ARTICLE_WORDS = Histogram(
+    "wiki_article_words", "Words counted per article", buckets=_WORD_BUCKETS
+)
+TRAVERSAL_ARTICLES = Histogram(
+    "wiki_traversal_articles",
+    "Articles processed per traversal",
+    buckets=_ARTICLE_BUCKETS,
+)
+HTTP_ERRORS = Counter(
+    "wiki_http_errors",
+    "HTTP error responses by status code, and failed requests by exception",
+    ["status"],
+)
+
+# Traversals in progress, for the frontier gauge
+TRAVERSALS: "weakref.WeakSet" = weakref.WeakSet()
+
+# Read from the per-host limiters, see src.limiter
+FETCHES_IN_FLIGHT = Gauge("wiki_fetches_in_flight", "Requests holding a per-host slot")
+SLOT_WAITERS = Gauge("wiki_fetch_slot_waiters", "Requests queued for a per-host slot")
+# Read from the running traversals, see src.wiki_client
+FRONTIER_SIZE = Gauge(
+    "wiki_frontier_size", "Articles queued in the frontiers of running traversals"
+)
+Gauge("wiki_traversals_in_progress", "Running traversals").set_function(
+    lambda: len(TRAVERSALS)
+)
+
+
+class CacheCollector:
+    """Exports the ``stats`` counters of the registered caches.
+
+    Every counted event (hits, misses, revalidations, evictions, ...) becomes
+    a sample of ``wiki_cache_events_total``; byte totals are left out.
+    """
+
+    def __init__(self):
+        self._caches: dict[str, object] = {}
+
+    def register(self, name: str, cache) -> None:
+        self._caches[name] = cache
+
+    def collect(self) -> Iterable[Metric]:
+        events = CounterMetricFamily(
+            "wiki_cache_events", "Cache lookups by outcome", labels=["cache", "event"]
+        )
+        for name, cache in self._caches.items():
+            for event, value in cache.stats.items():
+                if not event.startswith("bytes"):
+                    events.add_metric([name, event], value)
+        yield events
+
+
+CACHES = CacheCollector()
+REGISTRY.register(CACHES)
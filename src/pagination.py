@@ -0,0 +1,90 @@
+"""Top-k selection and cursor pagination over frequency tables."""
+
+import base64
+import binascii
+import json
+from dataclasses import asdict, dataclass, replace
+
+from src.frequency import SORT_ORDERS, FrequencyTable
+
+
+@dataclass(frozen=True)
+class PageQuery:
+    """Which rows of a frequency table to return.
+
+    Attributes:
+        sort: Row order, see FrequencyTable.order
+        min_count: Drop words counted fewer times than this
+        offset: Rows of the ordered, filtered result to skip
+        limit: Maximum number of rows to return; None returns the rest
+    """
+
+    sort: str | None = None
+    min_count: int | None = None
+    offset: int = 0
+    limit: int | None = None
+
+
+@dataclass
+class Page:
+    """One page of rows, with the number of matching rows and the next cursor."""
+
+    table: FrequencyTable
+    matching: int
+    next_cursor: str | None
+
+
+def encode_cursor(fingerprint: str, query: PageQuery) -> str:
+    payload = json.dumps({"v": fingerprint, **asdict(query)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, PageQuery]:
+    """Return the result fingerprint and query a cursor was issued for.
+
+    Raises ValueError for anything that is not a cursor from encode_cursor.
+    """
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        fingerprint = payload.pop("v")
+        query = PageQuery(**payload)
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("Malformed cursor")
+    if (
+        not isinstance(fingerprint, str)
+        or query.sort not in (None, *SORT_ORDERS)
+        or not _is_count(query.offset, minimum=0)
+        or not (query.limit is None or _is_count(query.limit))
+        or not (query.min_count is None or _is_count(query.min_count))
+    ):
+        raise ValueError("Malformed cursor")
+    return fingerprint, query
+
+
+def _is_count(value, minimum: int = 1) -> bool:
+    return type(value) is int and value >= minimum
+
+
+def paginate(table: FrequencyTable, query: PageQuery) -> Page:
+    """Select one page of ``table`` with partial selection.
+
+    Only the first ``offset + limit`` rows of the requested order are
+    selected and sorted (see FrequencyTable.first). The next cursor pins the
+    query and the table's fingerprint, so following it against the same
+    (cached) result continues exactly where this page ended.
+    """
+    rows = table
+    if query.min_count is not None:
+        rows = table.select(table.counts >= query.min_count)
+
+    end = len(rows)
+    if query.limit is not None:
+        end = min(query.offset + query.limit, end)
+    page = rows.take(rows.first(end, query.sort)[query.offset :])
+
+    next_cursor = None
+    if end < len(rows):
+        next_cursor = encode_cursor(table.fingerprint, replace(query, offset=end))
+    return Page(page, len(rows), next_cursor)
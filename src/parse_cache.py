@@ -0,0 +1,141 @@
+"""Memoized per-article parse results (word Counter + outbound links)."""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+
+from config import normalize_title
+
+REVISION_PATTERN = re.compile(r'"wgRevisionId":(\d+)')
+
+
+def article_version(html_text: str) -> str:
+    """Identify the article revision: MediaWiki revision id, else a content hash."""
+    match = REVISION_PATTERN.search(html_text)
+    if match:
+        return f"rev:{match.group(1)}"
+    return "sha1:" + hashlib.sha1(html_text.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """LRU cache of extracted (Counter, links) keyed by title and revision.
+
+    The in-memory tier holds up to ``max_entries`` results. When ``path`` is
+    given, results are also written to a SQLite file and promoted back into
+    memory on a hit, so they survive restarts.
+
+    Entries parsed without links store ``links=None``; a lookup that needs links
+    treats such an entry as a miss.
+    """
+
+    def __init__(self, max_entries: int, path: str = ""):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()  # guards the in-memory tier
+        self._db_lock = threading.Lock()  # guards the SQLite connection
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_results (
+                    title TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    words TEXT NOT NULL,
+                    links TEXT,
+                    PRIMARY KEY (title, version)
+                )
+                """)
+            self._conn.commit()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def key_for(article: str, html_text: str) -> tuple[str, str]:
+        return normalize_title(article), article_version(html_text)
+
+    def get(
+        self, key: tuple[str, str], need_links: bool, disk: bool = True
+    ) -> tuple[Counter, list[str]] | None:
+        """The cached result for ``key``, or None on a miss.
+
+        With ``disk=False`` only the in-memory tier is looked up, which never
+        waits on SQLite; a miss there is counted by the disk lookup that is
+        expected to follow.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self._conn is not None:
+            if not disk:
+                return None
+            with self._db_lock:
+                entry = self._load(key)
+            if entry is not None:
+                with self._lock:
+                    self._store(key, entry)
+                self.stats["disk_hits"] += 1
+
+        if entry is None or (need_links and entry[1] is None):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        word_counter, links = entry
+        return word_counter, links if need_links else []
+
+    @property
+    def persistent(self) -> bool:
+        return self._conn is not None
+
+    def put(
+        self,
+        key: tuple[str, str],
+        word_counter: Counter,
+        links: list[str] | None,
+    ) -> None:
+        with self._lock:
+            self._store(key, (word_counter, links))
+        if self._conn is None:
+            return
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_results (title, version, words, links) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    key[0],
+                    key[1],
+                    json.dumps(word_counter, ensure_ascii=False),
+                    (None if links is None else json.dumps(links, ensure_ascii=False)),
+                ),
+            )
+            self._conn.commit()
+
+    def _store(self, key, entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _load(self, key) -> tuple[Counter, list[str] | None] | None:
+        row = self._conn.execute(
+            "SELECT words, links FROM parse_results WHERE title = ? AND version = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        words, links = row
+        logging.debug(f"Parse cache disk hit: {key[0]}")
+        return Counter(json.loads(words)), None if links is None else json.loads(links)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.close()
@@ -0,0 +1,89 @@
+"""Pluggable execution backends for CPU-bound HTML extraction."""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.extraction import expand_compact, extract_compact, extract_words_and_links
+from src.stream_extractor import stream_extract_words_and_links
+
+PARSER_BACKENDS = ("inline", "thread", "process")
+
+# "soup" is the BeautifulSoup pipeline, "stream" the single-pass lxml extractor
+EXTRACTORS = {
+    "soup": extract_words_and_links,
+    "stream": stream_extract_words_and_links,
+}
+
+
+def get_extractor(name: str):
+    if name not in EXTRACTORS:
+        raise ValueError(
+            f"Unknown extractor '{name}', expected one of {tuple(EXTRACTORS)}"
+        )
+    return EXTRACTORS[name]
+
+
+class ParserEngine:
+    """Runs the configured extractor inline, on a thread pool or on a process pool.
+
+    Meant to live for the whole app lifetime: the executor is created lazily on
+    first use and kept until shutdown(). Process workers receive raw HTML and
+    send back compact (words, counts, links) results instead of pickled Counters.
+    """
+
+    def __init__(
+        self,
+        backend: str = "thread",
+        workers: int | None = None,
+        extractor: str = "soup",
+    ):
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(
+                f"Unknown parser backend '{backend}', expected one of {PARSER_BACKENDS}"
+            )
+        self.backend = backend
+        self.extractor = extractor
+        self._extract = get_extractor(extractor)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.backend == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="parser"
+                )
+            logging.info(
+                f"Started {self.backend} parser backend ({self.extractor} extractor) "
+                f"with {self.workers} workers"
+            )
+        return self._executor
+
+    async def parse(
+        self, html_text: str, need_links: bool
+    ) -> tuple[Counter, list[str]]:
+        """Extract (word_counter, links) from HTML on the configured backend."""
+        if self.backend == "inline":
+            return self._extract(html_text, need_links)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if self.backend == "thread":
+            return await loop.run_in_executor(
+                executor, self._extract, html_text, need_links
+            )
+
+        words, counts, links = await loop.run_in_executor(
+            executor, extract_compact, html_text, need_links, self._extract
+        )
+        return expand_compact(words, counts), links
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
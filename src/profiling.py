@@ -0,0 +1,146 @@
+"""Opt-in per-request profiling: a sampling profiler and per-phase timers.
+
+Nothing here runs unless a request asks for a profile: counters time their
+phases only with a PhaseTimer attached, and the sampler thread only exists
+while a profiled traversal runs.
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+
+# Traversal phases, in the order they are reported
+PHASES = ("slot_wait", "fetch", "parse", "merge", "frequency")
+
+NO_PHASE = nullcontext()
+
+
+class PhaseTimer:
+    """Seconds spent per traversal phase.
+
+    Phases of concurrently processed articles overlap, so their sum can
+    exceed the wall-clock time of the traversal.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+
+    @contextmanager
+    def __call__(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] += time.perf_counter() - start
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of all threads every ``interval`` seconds.
+
+    Runs in a daemon thread while used as a context manager. Stacks are
+    counted in collapsed form, rooted at the thread name, so the event loop
+    and the parser threads show up side by side. Other requests served while
+    profiling are sampled too; parsing in PARSER_BACKEND=process workers
+    shows up as the loop waiting for results.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._sample, name="sampling-profiler", daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                calls = []
+                while frame is not None:
+                    code = frame.f_code
+                    calls.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                        f":{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                calls.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(calls))] += 1
+            self.samples += 1
+
+
+@dataclass
+class Profile:
+    """Outcome of one profiled traversal."""
+
+    article: str
+    depth: int
+    seconds: float
+    interval: float
+    samples: int
+    phases: dict[str, float]
+    stacks: Counter
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+
+    def collapsed(self) -> str:
+        """Collapsed stacks ("frame;frame;frame count" lines), as read by
+        flamegraph.pl, speedscope and most other flame graph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def server_timing(self) -> str:
+        """Phase breakdown as a Server-Timing header value, in milliseconds."""
+        timings = [("total", self.seconds), *self.phases.items()]
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings
+        )
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "article": self.article,
+            "depth": self.depth,
+            "created_at": self.created_at,
+            "seconds": round(self.seconds, 6),
+            "interval": self.interval,
+            "samples": self.samples,
+            "phases": {
+                name: round(seconds, 6) for name, seconds in self.phases.items()
+            },
+        }
+
+
+class ProfileStore:
+    """The ``max_profiles`` most recent profiles, by id."""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+
+    def add(self, profile: Profile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Profile | None:
+        return self._profiles.get(profile_id)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
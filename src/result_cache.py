@@ -0,0 +1,73 @@
+"""TTL + memory-bounded LRU cache of computed frequency results."""
+
+import logging
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class ResultCache:
+    """Caches (frequency_table, crawl_status) results per traversal key.
+
+    Entries are fresh for ``ttl`` seconds. With ``stale_ttl`` > 0 an expired
+    entry is still served as stale for that many extra seconds while the
+    caller refreshes it in the background (stale-while-revalidate). Eviction
+    is least recently used, bounded by the estimated size of the cached
+    results rather than by the number of entries.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.total_bytes = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self.stats = Counter()
+
+    def get(self, key: Hashable) -> tuple[Any | None, str | None]:
+        """Return (value, "fresh" | "stale"), or (None, None) on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None, None
+
+        value, stored_at, _ = entry
+        age = time.monotonic() - stored_at
+        if age < self.ttl:
+            freshness = "fresh"
+        elif age < self.ttl + self.stale_ttl:
+            freshness = "stale"
+        else:
+            self._remove(key)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None, None
+
+        self._entries.move_to_end(key)
+        self.stats[f"{freshness}_hits"] += 1
+        return value, freshness
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            logging.debug(f"Result of {size} bytes exceeds result cache budget")
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic(), size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
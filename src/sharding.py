@@ -0,0 +1,282 @@
+"""Sharded crawls: the frontier hash-partitioned across local worker processes.
+
+Each of ``shards`` processes owns the articles whose title hashes to it:
+their visited set, the fetch queue of the current level and their partial
+word counts. The crawl advances level by level. Every round, the
+coordinator hands each shard its articles of the level, and the shard
+counts them and returns their links partitioned by owning shard, which
+make up the next level. At the end the partial counts are merged into one
+FrequencyTable. Rounds visit the same articles at the same depths as the
+single-process scheduler, so the result matches WikiFrequencyCounter.run.
+
+The processes belong to a ShardPool, started once for the app and serving
+one sharded crawl at a time, so CRAWL_SHARDS bounds the crawl processes of
+the whole app. Each shard keeps its event loop, connection pool and parser
+threads across crawls, and its per-host limits are 1/shards of
+CONCURRENCY_MAX, so the shards together stay within one host's budget and
+throughput scales with cores while parsing is the bottleneck.
+Shards use none of the app's article or parse cache, link graph, crawl
+state, article coalescing, metrics or tracing; every sharded crawl logs so.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+import zlib
+from multiprocessing.connection import Connection
+
+import config
+from config import DUMP_STORE_PATH, WIKIPEDIA_LANG
+from src.dump_store import DumpStore
+from src.frequency import FrequencyTable
+from src.http_client import create_http_client
+from src.limiter import split_host_budget
+from src.vocabulary import WordCounts
+from src.wiki_client import WikiFrequencyCounter
+
+# Seconds a shard gets to exit when the pool closes before it is terminated
+SHARD_EXIT_TIMEOUT = 5.0
+
+# What a sharded crawl goes without, compared with an in-process traversal
+UNSHARDED_FEATURES = (
+    "article and parse caches, link graph, crawl state, article coalescing, "
+    "per-article metrics and tracing"
+)
+
+
+def shard_of(title: str, shards: int) -> int:
+    """Index of the shard owning ``title``."""
+    # crc32 rather than hash(): string hashes are salted per process
+    return zlib.crc32(title.encode("utf-8")) % shards
+
+
+def _serve_shard(shards: int, domain: str, connection: Connection) -> None:
+    """Entry point of a shard process."""
+    # Crawl the same site as the coordinator, even where it was overridden at runtime
+    config.WIKIPEDIA_DOMAIN = domain
+    split_host_budget(shards)
+    asyncio.run(_run_shard(shards, connection))
+
+
+async def _run_shard(shards: int, connection: Connection) -> None:
+    """Serve crawls until the pool closes: ("start", article, depth), then
+    ("level", articles, depth) per level and ("finish",) for the counts."""
+    client = create_http_client()
+    dump_store = DumpStore(DUMP_STORE_PATH, WIKIPEDIA_LANG) if DUMP_STORE_PATH else None
+    wiki = None
+    try:
+        # Blocking reads are fine here: the shard has nothing else to do meanwhile
+        while (message := connection.recv()) is not None:
+            command, *args = message
+            if command == "start":
+                article, depth = args
+                wiki = WikiFrequencyCounter(
+                    article, depth, client=client, dump_store=dump_store
+                )
+            elif command == "level":
+                articles, level_depth = args
+                links = await wiki.crawl_level(articles, level_depth)
+                partitions = [[] for _ in range(shards)]
+                for link in dict.fromkeys(links):
+                    partitions[shard_of(link, shards)].append(link)
+                connection.send(
+                    (wiki.articles_processed, wiki.bytes_fetched, partitions)
+                )
+            else:
+                await wiki.close_batchers()
+                table = FrequencyTable.from_counts(wiki.word_counter)
+                connection.send((table.words, table.counts, wiki.crawl_status()))
+                wiki = None
+    except EOFError:
+        pass  # The pool was closed
+    finally:
+        if wiki is not None:
+            await wiki.close_batchers()
+        await client.aclose()
+        if dump_store is not None:
+            dump_store.close()
+
+
+class ShardPool:
+    """``shards`` long-lived crawl shard processes, serving one crawl at a time.
+
+    Start it once (or use it as an async context manager) and close it on
+    shutdown. A crawl that fails or is cancelled halfway leaves replies in
+    flight, so the processes are then replaced.
+    """
+
+    def __init__(self, shards: int):
+        if shards < 1:
+            raise ValueError(f"A sharded crawl needs at least one shard, got {shards}")
+        self.shards = shards
+        self.lock = asyncio.Lock()  # held by the running crawl
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+        self._replies: asyncio.Future | None = None
+
+    def start(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        for index in range(self.shards):
+            connection, shard_end = context.Pipe()
+            process = context.Process(
+                target=_serve_shard,
+                args=(self.shards, config.WIKIPEDIA_DOMAIN, shard_end),
+                name=f"crawl-shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            shard_end.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def _send(self, messages: list) -> None:
+        # Shards are waiting for the message, so sending does not stall
+        for connection, message in zip(self._connections, messages):
+            connection.send(message)
+
+    async def exchange(self, messages: list, reply: bool = True) -> list:
+        """Send each shard its message and collect the replies, in shard order.
+
+        Pickling and pipe I/O run in threads, off the event loop.
+        """
+        try:
+            await asyncio.to_thread(self._send, messages)
+            if not reply:
+                return []
+            self._replies = asyncio.gather(
+                *(asyncio.to_thread(c.recv) for c in self._connections)
+            )
+            # A cancelled crawl leaves the reads running; close() collects them
+            return await asyncio.shield(self._replies)
+        except (EOFError, OSError):
+            raise RuntimeError("A crawl shard exited unexpectedly") from None
+
+    async def close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass  # The shard is gone already
+        for process in self._processes:
+            await asyncio.to_thread(process.join, SHARD_EXIT_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+                await asyncio.to_thread(process.join)
+        if self._replies is not None:
+            # With the shards gone, pending reads end (with EOFError at worst)
+            await asyncio.gather(self._replies, return_exceptions=True)
+            self._replies = None
+        for connection in self._connections:
+            connection.close()
+        self._connections, self._processes = [], []
+
+    async def restart(self) -> None:
+        await self.close()
+        self.start()
+
+    async def __aenter__(self) -> "ShardPool":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+class ShardedCrawl:
+    """A traversal of ``article`` to ``depth`` split across the shards of ``pool``.
+
+    Offers traverse, run, crawl_status and progress like WikiFrequencyCounter.
+    Budgets are not supported: a level is always crawled in full.
+    """
+
+    def __init__(self, article: str, depth: int, pool: ShardPool):
+        self.article = article
+        self.depth = depth
+        self.pool = pool
+        self.shards = pool.shards
+        self.current_depth = 0
+        self.articles_processed = 0
+        self.bytes_fetched = 0
+        self._statuses: list[dict] = []
+        self._started_at: float | None = None
+
+    async def traverse(self) -> FrequencyTable:
+        """Crawl level by level across the shards and merge their counts."""
+        async with self.pool.lock:
+            overall_start = time.perf_counter()
+            self._started_at = time.monotonic()
+            logging.info(
+                f"Sharded crawl of '{self.article}' at depth {self.depth} over "
+                f"{self.shards} shards, without {UNSHARDED_FEATURES}"
+            )
+            finished = False
+            try:
+                results = await self._crawl()
+                finished = True
+            finally:
+                if not finished:
+                    await self.pool.restart()
+
+        word_counts = WordCounts()
+        for words, counts, _ in results:
+            word_counts.update(dict(zip(words, counts.tolist())))
+        self._statuses = [status for *_, status in results]
+        self.articles_processed = sum(
+            status["articles_processed"] for status in self._statuses
+        )
+        table = FrequencyTable.from_counts(word_counts)
+        logging.info(
+            f"Sharded crawl of '{self.article}' at depth {self.depth} over "
+            f"{self.shards} shards: {self.articles_processed} articles, "
+            f"{len(table)} unique words in {time.perf_counter() - overall_start:.2f}s"
+        )
+        return table
+
+    async def _crawl(self) -> list:
+        pool = self.pool
+        await pool.exchange([("start", self.article, self.depth)] * self.shards, False)
+        frontier = [[] for _ in range(self.shards)]
+        frontier[shard_of(self.article, self.shards)].append(self.article)
+        for depth in range(self.depth):
+            if not any(frontier):
+                break
+            self.current_depth = depth
+            replies = await pool.exchange(
+                [("level", articles, depth) for articles in frontier]
+            )
+            self.articles_processed = sum(done for done, _, _ in replies)
+            self.bytes_fetched = sum(size for _, size, _ in replies)
+            frontier = [
+                [link for *_, partitions in replies for link in partitions[index]]
+                for index in range(self.shards)
+            ]
+            logging.info(
+                f"Sharded crawl of '{self.article}' finished depth {depth + 1}: "
+                f"{self.articles_processed} articles, "
+                f"{sum(map(len, frontier))} links to the next level"
+            )
+        return await pool.exchange([("finish",)] * self.shards)
+
+    async def run(self) -> dict:
+        """Traverse and return the frequency dictionary (see ``traverse``)."""
+        return (await self.traverse()).to_dict()
+
+    def crawl_status(self) -> dict[str, bool | int]:
+        return {
+            "complete": all(status["complete"] for status in self._statuses),
+            "articles_processed": self.articles_processed,
+            "articles_skipped": 0,
+        }
+
+    def progress(self) -> dict[str, int | float | None]:
+        """Progress as of the last finished level (shards report per round)."""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "depth": self.current_depth + 1,
+            "max_depth": self.depth,
+            "shards": self.shards,
+            "articles_done": self.articles_processed,
+            "bytes_fetched": self.bytes_fetched,
+            "elapsed_seconds": round(elapsed, 3),
+        }
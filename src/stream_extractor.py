@@ -0,0 +1,119 @@
+"""Single-pass streaming extractor built on lxml parser-target events.
+
+Produces the same (Counter, links) as the BeautifulSoup pipeline in
+src.extraction without building a tree: text is tokenized as it streams out
+of the mw-content-text subtree and excluded subtrees are skipped on the fly.
+"""
+
+import logging
+import time
+from collections import Counter
+
+from lxml import etree
+
+from src.extraction import EXCLUDED_CLASSES, WORD_PATTERN, title_from_href
+
+# Elements whose text is dropped (their links are still collected)
+TEXT_EXCLUDED_TAGS = frozenset(["script", "style", "nav", "table"])
+
+
+def _has_excluded_class(class_value: str | None) -> bool:
+    if not class_value:
+        return False
+    class_value = class_value.lower()
+    return any(cls in class_value for cls in EXCLUDED_CLASSES)
+
+
+class _ContentTarget:
+    """lxml parser target collecting words and links from mw-content-text."""
+
+    def __init__(self, need_links: bool):
+        self.need_links = need_links
+        self.words: list[str] = []
+        self.links: set[str] = set()
+        self.found = False
+        self._content_depth = 0  # element depth inside mw-content-text, 0 = outside
+        self._done = False
+        self._text_skip = 0  # open elements suppressing text
+        self._link_skip = 0  # open elements suppressing links
+        self._stack: list[tuple[bool, bool]] = []
+        self._buffer: list[str] = []
+
+    def _flush(self):
+        if self._buffer:
+            if not self._text_skip:
+                self.words.extend(WORD_PATTERN.findall("".join(self._buffer)))
+            self._buffer.clear()
+
+    def start(self, tag, attrib):
+        if self._done:
+            return
+        if not self._content_depth:
+            if tag == "div" and attrib.get("id") == "mw-content-text":
+                self.found = True
+                self._content_depth = 1
+            return
+
+        self._flush()
+        self._content_depth += 1
+        excluded_class = _has_excluded_class(attrib.get("class"))
+        skips_text = excluded_class or tag in TEXT_EXCLUDED_TAGS
+        self._stack.append((skips_text, excluded_class))
+        self._text_skip += skips_text
+        self._link_skip += excluded_class
+
+        if tag == "a" and self.need_links and not self._link_skip:
+            href = attrib.get("href")
+            if href is not None:
+                title = title_from_href(href)
+                if title:
+                    self.links.add(title)
+
+    def end(self, tag):
+        if not self._content_depth or self._done:
+            return
+        self._flush()
+        self._content_depth -= 1
+        if not self._content_depth:
+            self._done = True
+            return
+        skips_text, excluded_class = self._stack.pop()
+        self._text_skip -= skips_text
+        self._link_skip -= excluded_class
+
+    def data(self, text):
+        if self._content_depth and not self._done:
+            self._buffer.append(text)
+
+    def close(self):
+        self._flush()
+
+
+def stream_extract_words_and_links(
+    html_text: str, need_links: bool
+) -> tuple[Counter, list[str]]:
+    """Extract words and optionally links in one streaming pass over the HTML.
+
+    Args:
+        html_text: Raw HTML content
+        need_links: Whether to extract links for next depth level
+
+    Returns:
+        Tuple of (word_counter, links)
+    """
+    parse_start = time.perf_counter()
+    target = _ContentTarget(need_links)
+    parser = etree.HTMLParser(target=target)
+    parser.feed(html_text)
+    parser.close()
+
+    if not target.found:
+        logging.warning("mw-content-text div not found in HTML")
+        return Counter(), []
+
+    word_counter = Counter(word.lower() for word in target.words)
+
+    parse_time = time.perf_counter() - parse_start
+    logging.info(f"Extracted {len(target.words)} words in {parse_time:.3f}s")
+
+    return word_counter, list(target.links)
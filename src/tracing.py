@@ -0,0 +1,217 @@
+"""Crawl traces: per-article spans of a traversal, kept in a ring buffer.
+
+A traversal with a CrawlTrace attached records a span per article (with
+its depth, byte size and time spent queued) and, nested in it, spans for
+waiting on a request slot, fetching, parsing and merging, plus a "queued"
+instant when an article enters the frontier. Spans are laid out on one
+lane per crawl worker, so overlapping fetches and parses line up side by
+side. Only the latest ``capacity`` spans are kept, which bounds the memory
+of tracing large crawls.
+
+Traces export as Chrome trace-event JSON (chrome://tracing, Perfetto,
+speedscope) or as OTLP/JSON, which an OpenTelemetry collector accepts on
+its OTLP/HTTP endpoint.
+"""
+
+import itertools
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+
+SERVICE_NAME = "wikipedia-word-frequency"
+
+# The innermost open span and the worker lane of the running task
+_current: ContextVar["Span | None"] = ContextVar("trace_span", default=None)
+_lane: ContextVar[int] = ContextVar("trace_lane", default=0)
+
+
+def bind_lane(lane: int) -> None:
+    """Lay out the spans of the current task (a crawl worker) on ``lane``."""
+    _lane.set(lane)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "lane", "start", "end", "attrs")
+
+    def __init__(self, name: str, span_id: int, parent_id: int, attrs: dict):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.lane = _lane.get()
+        self.start = time.perf_counter()
+        self.end = self.start
+        self.attrs = attrs
+
+    @property
+    def instant(self) -> bool:
+        return self.end == self.start
+
+
+class CrawlTrace:
+    """The spans of one traversal, at most ``capacity`` of them (the latest)."""
+
+    def __init__(self, capacity: int):
+        self.id = uuid.uuid4().hex
+        self.spans: deque[Span] = deque(maxlen=capacity)
+        self.recorded = 0
+        self.created_at = time.time()
+        self._origin = time.perf_counter()
+        self._ids = itertools.count(1)
+
+    @property
+    def dropped(self) -> int:
+        """Spans pushed out of the ring buffer by later ones."""
+        return self.recorded - len(self.spans)
+
+    def _parent_id(self) -> int:
+        parent = _current.get()
+        return parent.span_id if parent is not None else 0
+
+    def _record(self, span: Span) -> None:
+        self.spans.append(span)
+        self.recorded += 1
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Record a span around the block; spans opened inside it are its children."""
+        span = Span(name, next(self._ids), self._parent_id(), attrs)
+        token = _current.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current.reset(token)
+            self._record(span)
+
+    def instant(self, name: str, **attrs) -> None:
+        self._record(Span(name, next(self._ids), self._parent_id(), attrs))
+
+    def annotate(self, **attrs) -> None:
+        """Add attributes to the innermost open span."""
+        span = _current.get()
+        if span is not None:
+            span.attrs.update(attrs)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "created_at": self.created_at,
+            "spans": len(self.spans),
+            "dropped_spans": self.dropped,
+        }
+
+    def chrome(self) -> dict:
+        """The trace in the Chrome trace-event format, timed from its creation."""
+        lanes = sorted({span.lane for span in self.spans})
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": lane,
+                "args": {"name": f"worker {lane}" if lane else "traversal"},
+            }
+            for lane in lanes
+        ]
+        for span in self.spans:
+            event = {
+                "name": span.name,
+                "cat": "crawl",
+                "ph": "i" if span.instant else "X",
+                "ts": round((span.start - self._origin) * 1e6, 3),
+                "pid": 1,
+                "tid": span.lane,
+                "args": span.attrs,
+            }
+            if span.instant:
+                event["s"] = "t"
+            else:
+                event["dur"] = round((span.end - span.start) * 1e6, 3)
+            events.append(event)
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": self.summary(),
+        }
+
+    def otlp(self) -> dict:
+        """The trace as an OTLP/JSON ExportTraceServiceRequest."""
+        epoch = self.created_at - self._origin  # perf_counter to wall clock
+
+        def nanos(seconds: float) -> str:
+            return str(int((epoch + seconds) * 1e9))
+
+        spans = []
+        for span in self.spans:
+            otlp_span = {
+                "traceId": self.id,
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": nanos(span.start),
+                "endTimeUnixNano": nanos(span.end),
+                "attributes": [
+                    _otlp_attribute(key, value)
+                    for key, value in {**span.attrs, "lane": span.lane}.items()
+                ],
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = f"{span.parent_id:016x}"
+            spans.append(otlp_span)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", SERVICE_NAME)]
+                    },
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+                }
+            ]
+        }
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}  # int64 is a string in OTLP/JSON
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+async def export_otlp(client: httpx.AsyncClient, endpoint: str, trace: CrawlTrace):
+    """Send a trace to an OTLP/HTTP collector (e.g. http://localhost:4318)."""
+    try:
+        response = await client.post(
+            f"{endpoint.rstrip('/')}/v1/traces", json=trace.otlp()
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logging.warning(f"Could not export trace {trace.id} to {endpoint}: {e}")
+
+
+class TraceStore:
+    """The ``max_traces`` most recent traces, by id."""
+
+    def __init__(self, max_traces: int):
+        self.max_traces = max_traces
+        self._traces: OrderedDict[str, CrawlTrace] = OrderedDict()
+
+    def add(self, trace: CrawlTrace) -> None:
+        self._traces[trace.id] = trace
+        while len(self._traces) > self.max_traces:
+            self._traces.popitem(last=False)
+
+    def get(self, trace_id: str) -> CrawlTrace | None:
+        return self._traces.get(trace_id)
+
+    def __len__(self) -> int:
+        return len(self._traces)
@@ -0,0 +1,115 @@
+"""Interned word vocabulary and array-backed word counts."""
+
+from collections.abc import Iterator, Mapping
+
+import numpy as np
+
+
+class Vocabulary:
+    """Maps each distinct word to a stable integer id, storing the string once.
+
+    Ids are only ever appended, so arrays indexed by id stay valid as the
+    vocabulary grows. Each traversal (or retained crawl state) interns into
+    its own vocabulary, so ids stay dense over the words it saw and the
+    vocabulary is freed with it. Not thread-safe: encode on the event loop thread.
+
+    ``all_lowercase`` stays True while every interned word is lowercase (as
+    the extractors produce them), which lets case-insensitive lookups of the
+    words skip lowercasing them.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self.words: list[str] = []
+        self.all_lowercase = True
+
+    def _intern(self, word: str) -> int:
+        word_id = self._ids.setdefault(word, len(self.words))
+        if word_id == len(self.words):
+            self.words.append(word)
+            if self.all_lowercase and word != word.lower():
+                self.all_lowercase = False
+        return word_id
+
+    def id_of(self, word: str) -> int | None:
+        return self._ids.get(word)
+
+    def encode(self, word_counter: Mapping[str, int]) -> tuple[np.ndarray, np.ndarray]:
+        """Turn a per-article word counter into (ids, counts) arrays."""
+        size = len(word_counter)
+        ids = np.fromiter(map(self._intern, word_counter), dtype=np.int64, count=size)
+        counts = np.fromiter(word_counter.values(), dtype=np.int64, count=size)
+        return ids, counts
+
+    def decode(self, ids: np.ndarray) -> list[str]:
+        words = self.words
+        return [words[word_id] for word_id in ids.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+class WordCounts(Mapping):
+    """Word -> count mapping stored as one int64 vector indexed by vocabulary id.
+
+    Per-article (ids, counts) pairs are merged with a single vectorized add.
+    Words with a zero count are treated as absent. Without a ``vocabulary``
+    the counts intern into a new one of their own.
+    """
+
+    def __init__(self, vocabulary: Vocabulary | None = None):
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self._counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, ids: np.ndarray, counts: np.ndarray) -> None:
+        """Add counts for unique ids (negative counts subtract)."""
+        if not len(ids):
+            return
+        needed = int(ids.max()) + 1
+        if needed > len(self._counts):
+            grown = np.zeros(max(needed, 2 * len(self._counts)), dtype=np.int64)
+            grown[: len(self._counts)] = self._counts
+            self._counts = grown
+        self._counts[ids] += counts
+
+    def update(self, other: Mapping[str, int]) -> None:
+        if isinstance(other, WordCounts) and other.vocabulary is self.vocabulary:
+            self.add(*other.nonzero())
+        else:
+            self.add(*self.vocabulary.encode(other))
+
+    def __iadd__(self, other: Mapping[str, int]) -> "WordCounts":
+        self.update(other)
+        return self
+
+    def copy(self) -> "WordCounts":
+        copied = WordCounts(self.vocabulary)
+        copied._counts = self._counts.copy()
+        return copied
+
+    def nonzero(self) -> tuple[np.ndarray, np.ndarray]:
+        """(ids, counts) of every word with a positive count, in id order."""
+        ids = np.flatnonzero(self._counts > 0)
+        return ids, self._counts[ids]
+
+    def total(self) -> int:
+        return int(self._counts[self._counts > 0].sum())
+
+    def __getitem__(self, word: str) -> int:
+        word_id = self.vocabulary.id_of(word)
+        if (
+            word_id is None
+            or word_id >= len(self._counts)
+            or self._counts[word_id] <= 0
+        ):
+            raise KeyError(word)
+        return int(self._counts[word_id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.vocabulary.decode(self.nonzero()[0]))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._counts > 0))
+
+    def __repr__(self) -> str:
+        return f"WordCounts({dict(self.items())!r})"
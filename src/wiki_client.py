@@ -1,45 +1,198 @@
 import httpx
+import itertools
 import logging
-import re
 import time
 import asyncio
 from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
 from fastapi import status
-from bs4 import BeautifulSoup
-from urllib.parse import unquote
 
-from config import HEADERS, get_article_url, REQUEST_TIMEOUT, MAX_CONCURRENT_REQUESTS
-
-WORD_PATTERN = re.compile(r"\b[a-záéíóöőúüűA-ZÁÉÍÓÖŐÚÜŰ]+\b")
-# Classes to exclude from content extraction (navigation, metadata, etc.)
-EXCLUDED_CLASSES = ["navbox", "infobox", "noprint", "noviewer", "printfooter"]
+from config import (
+    WIKIPEDIA_LANG,
+    get_api_url,
+    get_article_url,
+    normalize_title,
+    CRAWL_WORKERS,
+    EXTRACTOR,
+    FETCH_BACKEND,
+    API_TITLES_PER_QUERY,
+    API_BATCH_WINDOW,
+    LINK_DISCOVERY,
+)
+from src.article_cache import ArticleCache
+from src.budget import CrawlBudget
+from src.coalescing import SingleFlight
+from src.crawl_state import CrawlState
+from src.dump_store import DumpStore
+from src.link_graph import LinkGraph
+from src.mediawiki_api import ApiBatcher, ApiPage, fetch_pages
+from src.http_client import create_http_client
+from src.instrumentation import SlotMonitor
+from src.limiter import host_limiter
+from src.metrics import (
+    ARTICLE_BYTES,
+    ARTICLE_WORDS,
+    FETCH_SECONDS,
+    FRONTIER_SIZE,
+    PARSE_SECONDS,
+    TRAVERSAL_ARTICLES,
+    TRAVERSALS,
+)
+from src.extraction import (
+    WORD_PATTERN,
+    EXCLUDED_CLASSES,
+    extract_links_from_soup,
+)
+from src.frequency import FrequencyTable
+from src.parse_cache import ParseCache
+from src.profiling import NO_PHASE, PhaseTimer
+from src.tracing import CrawlTrace, bind_lane
+from src.vocabulary import Vocabulary, WordCounts
+from src.parsing import ParserEngine, get_extractor
+from src.wikitext import extract_words_and_links_from_wikitext
+
+# "html" fetches one rendered page per request, "api" batches titles per API
+# query and "dump" reads a local store ingested from an XML dump
+FETCH_BACKENDS = ("html", "api", "dump")
+# "content" takes links from the fetched article, "listing" from separate link queries
+LINK_DISCOVERY_MODES = ("content", "listing")
+
+FRONTIER_SIZE.set_function(
+    lambda: sum(counter._frontier.qsize() for counter in TRAVERSALS)
+)
 
 
 class WikiFrequencyCounter:
-    def __init__(self, article: str, depth: int):
+    def __init__(
+        self,
+        article: str,
+        depth: int,
+        article_cache: ArticleCache | None = None,
+        parse_cache: ParseCache | None = None,
+        parser: ParserEngine | None = None,
+        budget: CrawlBudget | None = None,
+        client: httpx.AsyncClient | None = None,
+        flights: SingleFlight | None = None,
+        state: CrawlState | None = None,
+        link_graph: LinkGraph | None = None,
+        backend: str = FETCH_BACKEND,
+        link_discovery: str = LINK_DISCOVERY,
+        dump_store: DumpStore | None = None,
+        trace: CrawlTrace | None = None,
+    ):
         self.article = article
         self.depth = depth
-        self.word_counter = (
-            Counter()
-        )  # Use Counter directly for better memory efficiency
-        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-        self._client: httpx.AsyncClient | None = None
+        # Aggregate counts as one vector over the words this traversal interned;
+        # a resumed state brings the vocabulary its stored levels refer to
+        self.vocabulary = state.vocabulary if state is not None else Vocabulary()
+        self.word_counter = WordCounts(self.vocabulary)
+        # Request slots come from the adaptive limiter of the target host,
+        # shared with every other counter crawling it
+        self.slot_monitor = self._new_slot_monitor()
+        self.level_counts = Counter()  # articles processed per depth
+        # A client injected by the app is shared and outlives this counter
+        self._client: httpx.AsyncClient | None = client
+        self._owns_client = client is None
+        self._article_cache = article_cache
+        self._parse_cache = parse_cache
+        self._parser = parser
+        self._budget = budget
+        self._flights = flights  # app-wide article-level single-flight registry
+        self._link_graph = link_graph
+
+        if backend not in FETCH_BACKENDS:
+            raise ValueError(
+                f"Unknown fetch backend '{backend}', expected one of {FETCH_BACKENDS}"
+            )
+        if backend == "dump" and dump_store is None:
+            raise ValueError("The dump fetch backend needs a DumpStore")
+        self.backend = backend
+        self._dump_store = dump_store
+        if link_discovery not in LINK_DISCOVERY_MODES:
+            raise ValueError(
+                f"Unknown link discovery mode '{link_discovery}', "
+                f"expected one of {LINK_DISCOVERY_MODES}"
+            )
+        self.link_discovery = link_discovery
+        # One API batcher per need_text (wikitext for counting, or only the
+        # links for link listings), created on first use. Batchers refer back
+        # to the counter, so they are dropped when the traversal ends rather
+        # than keeping it (and its vocabulary) alive until a full GC
+        self._api_batchers: dict[bool, ApiBatcher] = {}
+
+        # Traversal state
+        self._frontier: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._depths: dict[str, int] = {}  # best known depth per discovered article
+        self._in_flight: set[str] = set()
+        self._finished: set[str] = set()
+        self._failed: set[str] = set()
+        self.articles_started = 0
+        self.articles_skipped = 0
+        self.bytes_fetched = 0
+        self.complete = True  # False once a budget limit cut the traversal short
+        self.current_depth = 0  # deepest level a worker has started
+        self._started_at: float | None = None
+        # Per-phase timing, only for profiled traversals (see src.profiling)
+        self.phases: PhaseTimer | None = None
+        # Per-article spans, only for traced traversals (see src.tracing)
+        self.trace = trace
+        self._queued_at: dict[str, float] = {}
+
+        # Depth-incremental state: resume from, and extend, what earlier runs stored.
+        # Leaf articles are then parsed for links too, so the next level can start
+        # from the unexpanded frontier without refetching them.
+        self._state = state
+        self._link_depth = depth if state is not None else depth - 1
+        self._new_levels: dict[int, WordCounts] = {}
+        self._counted_at: dict[str, int] = {}
+        self._next_frontier: dict[str, None] = {}
+        self._prior_articles = 0
 
     async def _open_client(self):
-        self._client = httpx.AsyncClient(headers=HEADERS, timeout=REQUEST_TIMEOUT)
+        if self._owns_client:
+            self._client = create_http_client()
 
     async def _close_client(self):
-        if self._client:
+        if self._owns_client and self._client:
             await self._client.aclose()
             self._client = None
 
     async def get_article_source(self, article: str) -> str | None:
-        """Fetch Wikipedia article HTML"""
-        fetch_start = time.time()
+        """Fetch Wikipedia article HTML, going through the article cache if configured"""
+        fetch_start = time.perf_counter()
+        cached = None
+        if self._article_cache:
+            cached = await asyncio.to_thread(
+                self._article_cache.get, WIKIPEDIA_LANG, article
+            )
+            if cached and cached.is_fresh(self._article_cache.ttl):
+                self._article_cache.stats["hits"] += 1
+                self._article_cache.stats["bytes_served"] += len(cached.body)
+                logging.debug(f"Article cache hit: {article}")
+                return cached.body
+
         try:
             logging.debug(f"Fetching article: {article}")
             article_url = get_article_url(article)
-            r = await self._client.get(article_url)
+            with self._phase("fetch"):
+                if cached:
+                    self._article_cache.stats["revalidations"] += 1
+                    r = await self._client.get(
+                        article_url, headers=cached.conditional_headers()
+                    )
+                else:
+                    r = await self._client.get(article_url)
+            FETCH_SECONDS.labels("html").observe(time.perf_counter() - fetch_start)
+
+            if cached and r.status_code == status.HTTP_304_NOT_MODIFIED:
+                await asyncio.to_thread(
+                    self._article_cache.touch, WIKIPEDIA_LANG, article
+                )
+                self._article_cache.stats["not_modified"] += 1
+                self._article_cache.stats["bytes_served"] += len(cached.body)
+                logging.debug(f"Article not modified since last fetch: {article}")
+                return cached.body
 
             if r.status_code == status.HTTP_404_NOT_FOUND:
                 logging.warning(f"Article not found: {article}")
@@ -51,7 +204,22 @@ class WikiFrequencyCounter:
                 )
                 return None
 
-            fetch_time = time.time() - fetch_start
+            # Only downloads count toward the byte budget, in bytes as received
+            self.bytes_fetched += len(r.content)
+            if self._article_cache:
+                if not cached:
+                    self._article_cache.stats["misses"] += 1
+                self._article_cache.stats["bytes_downloaded"] += len(r.content)
+                await asyncio.to_thread(
+                    self._article_cache.put,
+                    WIKIPEDIA_LANG,
+                    article,
+                    r.text,
+                    etag=r.headers.get("ETag"),
+                    last_modified=r.headers.get("Last-Modified"),
+                )
+
+            fetch_time = time.perf_counter() - fetch_start
             logging.info(
                 f"Fetched '{article}' in {fetch_time:.3f}s (size: {len(r.text)/1024:.1f}KB)"
             )
@@ -68,119 +236,25 @@ class WikiFrequencyCounter:
             return None
 
     def _extract_links_from_soup(self, body_content) -> list[str]:
-        """Extract Wikipedia article links from parsed soup content.
-
-        Args:
-            body_content: BeautifulSoup element for mw-content-text div
-
-        Returns:
-            List of article titles (URL-decoded, without /wiki/ prefix)
-        """
-        # Remove excluded classes before extracting links
-        for element in body_content.find_all(
-            class_=lambda x: x and any(cls in x.lower() for cls in EXCLUDED_CLASSES)
-        ):
-            element.decompose()
-
-        links = set()  # Use set to avoid duplicates
-
-        for link in body_content.find_all("a", href=True):
-            href = link["href"]
-
-            # Handle both relative (/wiki/...) and absolute (https://...wikipedia.org/wiki/...) links
-            article_title = None
-
-            if href.startswith("/wiki/"):
-                # Relative link
-                article_title = href[6:]
-            elif "/wiki/" in href and (
-                "wikipedia.org" in href or "wikipédia" in href.lower()
-            ):
-                # Absolute Wikipedia link
-                wiki_index = href.find("/wiki/")
-                article_title = href[wiki_index + 6 :]
-            else:
-                # Not a Wikipedia article link
-                continue
-
-            # Skip if only a fragment
-            if href.startswith("#"):
-                continue
-
-            # Skip if contains # (fragments) - remove fragment part
-            if "#" in article_title:
-                article_title = article_title.split("#")[0]
-                if not article_title:  # Was only a fragment
-                    continue
-
-            # Skip if contains ? (query parameters) - remove query part
-            if "?" in article_title:
-                article_title = article_title.split("?")[0]
-                if not article_title:
-                    continue
-
-            # URL decode the title
-            decoded_title = unquote(article_title)
-
-            # Skip if contains : (special pages like File:, Special:, etc.)
-            if ":" in decoded_title:
-                continue
-
-            # Skip empty titles
-            if not decoded_title.strip():
-                continue
-
-            links.add(decoded_title)
-
-        logging.debug(f"Extracted {len(links)} unique links from article")
-        return list(links)
+        """Extract Wikipedia article links from parsed soup content."""
+        return extract_links_from_soup(body_content)
 
     def extract_words_and_links(
         self, html_text: str, need_links: bool
     ) -> tuple[Counter, list[str]]:
-        """Parse HTML once, extract words and optionally links.
-
-        Thread-safe: returns a Counter instead of mutating shared state.
-
-        Args:
-            html_text: Raw HTML content
-            need_links: Whether to extract links for next depth level
-
-        Returns:
-            Tuple of (word_counter, links)
-        """
-        parse_start = time.time()
-        soup = BeautifulSoup(html_text, "lxml")
-
-        body_content = soup.find("div", id="mw-content-text")
-
-        if not body_content:
-            logging.warning("mw-content-text div not found in HTML")
-            return Counter(), []
-
-        # Extract links BEFORE decomposing tables (tables contain valid links)
-        links = self._extract_links_from_soup(body_content) if need_links else []
-
-        # Remove script, style, navigation, and non-content elements
-        for element in body_content.find_all(["script", "style", "nav", "table"]):
-            element.decompose()
-
-        # Remove elements with excluded classes (navigation, metadata, etc.)
-        for element in body_content.find_all(
-            class_=lambda x: x and any(cls in x.lower() for cls in EXCLUDED_CLASSES)
-        ):
-            element.decompose()
+        """Parse HTML once, extract words and optionally links."""
+        return get_extractor(EXTRACTOR)(html_text, need_links)
 
-        # Get text with separator to avoid word concatenation
-        text = body_content.get_text(separator=" ", strip=True)
-
-        words = WORD_PATTERN.findall(text)
-        word_counter = Counter(word.lower() for word in words)
-
-        parse_time = time.time() - parse_start
-        logging.info(f"Extracted {len(words)} words in {parse_time:.3f}s")
-
-        return word_counter, links
+    def frequency_table(self) -> FrequencyTable:
+        """Word counts of the traversal as a compact FrequencyTable."""
+        table = FrequencyTable.from_counts(self.word_counter)
+        if not table:
+            logging.warning("No words collected to calculate frequency")
+        else:
+            logging.info(
+                f"Calculated frequency for {len(table)} unique words from {table.total} total words"
+            )
+        return table
 
     def calculate_frequency(self) -> dict[str, dict[str, float | int]]:
         """Calculate word frequency from word counter.
@@ -188,21 +262,209 @@ class WikiFrequencyCounter:
         Returns:
             Dictionary with word frequencies including count and percentage
         """
-        if not self.word_counter:
-            logging.warning("No words collected to calculate frequency")
-            return {}
+        return self.frequency_table().to_dict()
 
-        total_words = sum(self.word_counter.values())
+    async def _extract(
+        self, article: str, html_text: str, need_links: bool
+    ) -> tuple[Counter, list[str]]:
+        """Extract words and links, going through the parse cache if configured."""
+        cache_key = None
+        if self._parse_cache is not None:
+            cache_key = ParseCache.key_for(article, html_text)
+            # Memory hits are served inline; the disk tier is read off the loop
+            cached = self._parse_cache.get(cache_key, need_links, disk=False)
+            if cached is None and self._parse_cache.persistent:
+                cached = await asyncio.to_thread(
+                    self._parse_cache.get, cache_key, need_links
+                )
+            if cached:
+                return cached
+
+        # Offload CPU-bound HTML parsing to the parser backend (thread pool by default)
+        parse_start = time.perf_counter()
+        with self._phase("parse"):
+            if self._parser is not None:
+                word_counter, links = await self._parser.parse(html_text, need_links)
+            else:
+                word_counter, links = await asyncio.to_thread(
+                    self.extract_words_and_links, html_text, need_links
+                )
+        PARSE_SECONDS.labels("html").observe(time.perf_counter() - parse_start)
+
+        if cache_key:
+            # The disk tier writes to SQLite, so store off the event loop
+            await asyncio.to_thread(
+                self._parse_cache.put,
+                cache_key,
+                word_counter,
+                links if need_links else None,
+            )
+        return word_counter, links
 
-        frequency_dict = {
-            word: {"count": count, "percentage": round((count / total_words) * 100, 4)}
-            for word, count in self.word_counter.items()
-        }
+    def _phase(self, phase: str, **attrs):
+        """Context manager timing a phase of a profiled or traced traversal; a
+        no-op otherwise."""
+        if self.trace is not None:
+            return self._traced_phase(phase, attrs)
+        return self.phases(phase) if self.phases is not None else NO_PHASE
+
+    @contextmanager
+    def _traced_phase(self, phase: str, attrs: dict):
+        timer = self.phases(phase) if self.phases is not None else NO_PHASE
+        with self.trace.span(phase, **attrs), timer:
+            yield
+
+    def _span(self, name: str, **attrs):
+        """Context manager recording a trace span (not a profiled phase)."""
+        return self.trace.span(name, **attrs) if self.trace is not None else NO_PHASE
+
+    def _annotate(self, **attrs) -> None:
+        """Add attributes to the innermost open trace span."""
+        if self.trace is not None:
+            self.trace.annotate(**attrs)
+
+    def _new_slot_monitor(self) -> SlotMonitor:
+        """A monitor of the fetch slots against the host's current limit."""
+        limiter = host_limiter(get_article_url(self.article))
+        return SlotMonitor(lambda: limiter.slots)
+
+    @asynccontextmanager
+    async def _request_slot(self, url: str):
+        """Hold one of the request slots of the host of ``url``."""
+        limiter = host_limiter(url)
+        with self._phase("slot_wait"):
+            await limiter.acquire()
+        self.slot_monitor.acquired()
+        try:
+            yield
+        finally:
+            self.slot_monitor.released()
+            limiter.release()
 
+    async def _fetch(self, article: str) -> str | None:
+        """Fetch an article while holding one of the host's request slots."""
+        async with self._request_slot(get_article_url(article)):
+            html_text = await self.get_article_source(article)
+        if html_text is not None:
+            ARTICLE_BYTES.observe(len(html_text))
+            self._annotate(bytes=len(html_text))
+        return html_text
+
+    def _budget_exhausted(self) -> bool:
+        if self._budget is None:
+            return False
+        limit = self._budget.exhausted(self.articles_started, self.bytes_fetched)
+        if limit and self.complete:
+            self.complete = False
+            logging.warning(
+                f"Crawl budget '{limit}' exhausted after {self.articles_started} "
+                f"articles; returning partial results"
+            )
+        return limit is not None
+
+    async def _query_api(
+        self, titles: list[str], need_text: bool
+    ) -> dict[str, ApiPage | None]:
+        """Run one batched API query while holding one of the host's request slots."""
+        async with (
+            self._request_slot(get_api_url()),
+            self._phase("fetch", titles=len(titles)),
+        ):
+            query_start = time.perf_counter()
+            pages = await fetch_pages(self._client, titles, need_text)
+            query_time = time.perf_counter() - query_start
         logging.info(
-            f"Calculated frequency for {len(frequency_dict)} unique words from {total_words} total words"
+            f"Fetched {'text' if need_text else 'links'} of {len(titles)} articles "
+            f"through the API in {query_time:.3f}s"
         )
-        return frequency_dict
+        FETCH_SECONDS.labels("api").observe(query_time)
+        return pages
+
+    async def _fetch_from_api(
+        self, article: str, need_links: bool
+    ) -> tuple[Counter, list[str]] | None:
+        page = await self._load_api_page(article, need_text=True)
+        if page is None:
+            return None
+        self.bytes_fetched += page.size
+        ARTICLE_BYTES.observe(page.size)
+        self._annotate(bytes=page.size)
+        parse_start = time.perf_counter()
+        with self._phase("parse"):
+            parsed = await asyncio.to_thread(
+                extract_words_and_links_from_wikitext, page.wikitext, need_links
+            )
+        PARSE_SECONDS.labels("api").observe(time.perf_counter() - parse_start)
+        return parsed
+
+    async def _load_api_page(self, article: str, need_text: bool) -> ApiPage | None:
+        """An article's page from a batched API query, or None if missing or failed."""
+        batcher = self._api_batchers.get(need_text)
+        if batcher is None:
+            batcher = self._api_batchers[need_text] = ApiBatcher(
+                lambda titles: self._query_api(titles, need_text),
+                API_TITLES_PER_QUERY,
+                API_BATCH_WINDOW,
+            )
+        try:
+            page = await batcher.load(article)
+        except httpx.HTTPError as e:
+            logging.error(f"HTTP error querying the API for {article}: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"Unexpected error querying the API for {article}: {e}")
+            return None
+        if page is None:
+            logging.warning(f"Article not found through the API: {article}")
+        return page
+
+    async def _load_from_dump(
+        self, article: str, need_links: bool
+    ) -> tuple[Counter, list[str]] | None:
+        load_start = time.perf_counter()
+        with self._phase("fetch"):
+            loaded = await asyncio.to_thread(self._dump_store.get, article, need_links)
+        PARSE_SECONDS.labels("dump").observe(time.perf_counter() - load_start)
+        if loaded is None:
+            logging.warning(f"Article not found in the dump: {article}")
+            return None
+        word_counter, links, size = loaded
+        self.bytes_fetched += size
+        ARTICLE_BYTES.observe(size)
+        self._annotate(bytes=size)
+        return word_counter, links
+
+    async def _fetch_and_extract(
+        self, article: str, need_links: bool
+    ) -> tuple[Counter, list[str]] | None:
+        if self.backend == "api":
+            return await self._fetch_from_api(article, need_links)
+        if self.backend == "dump":
+            return await self._load_from_dump(article, need_links)
+        html_text = await self._fetch(article)
+        if html_text is None:
+            return None
+        return await self._extract(article, html_text, need_links)
+
+    async def _load_article(
+        self, article: str, need_links: bool
+    ) -> tuple[Counter, list[str]] | None:
+        """Fetch and extract an article, joining an identical in-flight load
+        from any concurrent traversal when single-flight coalescing is enabled."""
+        if self._flights is None:
+            return await self._fetch_and_extract(article, need_links)
+
+        title = normalize_title(article)
+        key = (WIKIPEDIA_LANG, title, need_links)
+        if not need_links and self._flights.in_flight((WIKIPEDIA_LANG, title, True)):
+            # A load that also extracts links serves a words-only request too
+            key = (WIKIPEDIA_LANG, title, True)
+        loaded = await self._flights.do(
+            key, lambda: self._fetch_and_extract(article, key[2])
+        )
+        if loaded is not None and not need_links:
+            return loaded[0], []
+        return loaded
 
     async def process_article(
         self, article: str, current_depth: int
@@ -216,91 +478,402 @@ class WikiFrequencyCounter:
         Returns:
             Tuple of (article_title, success, links_for_next_level)
         """
-        article_start = time.time()
-
-        # Use semaphore to limit concurrent requests
-        async with self._semaphore:
-            # Fetch article HTML
-            html_text = await self.get_article_source(article)
+        article_start = time.perf_counter()
+        queued_at = self._queued_at.pop(article, None)
+        queue_seconds = article_start - queued_at if queued_at is not None else 0.0
+        with self._span(
+            "article",
+            article=article,
+            depth=current_depth,
+            queue_seconds=round(queue_seconds, 6),
+        ):
+            self.articles_started += 1
+            # With link listings, links are discovered separately (see _visit)
+            need_links = (
+                current_depth < self._link_depth and self.link_discovery == "content"
+            )
+            # Indexed links spare the link extraction; only the words are parsed
+            indexed_links = await self._indexed_links(article) if need_links else None
+            loaded = await self._load_article(
+                article, need_links and indexed_links is None
+            )
 
-        if html_text is None:
-            logging.warning(f"Skipping article {article} due to fetch error")
-            return (article, False, [])
-
-        # Offload CPU-bound HTML parsing to thread pool
-        need_links = current_depth < self.depth - 1
-        # loop = asyncio.get_running_loop()
-        # word_counter, links = await loop.run_in_executor(
-        #     None, self.extract_words_and_links, html_text, need_links
-        # )
-
-        word_counter, links = await asyncio.to_thread(
-            self.extract_words_and_links, html_text, need_links
-        )
+            if loaded is None:
+                logging.warning(f"Skipping article {article} due to fetch error")
+                return (article, False, [])
+
+            word_counter, links = loaded
+            if indexed_links is not None:
+                links = indexed_links
+            elif need_links:
+                await self._index_links(article, links)
+
+            # Intern and merge on the event loop thread (single-threaded, safe); only
+            # the (ids, counts) arrays are kept, not the article's word strings
+            with self._phase("merge"):
+                ids, counts = self.vocabulary.encode(word_counter)
+                self.word_counter.add(ids, counts)
+                if self._state is not None:
+                    self._new_levels.setdefault(current_depth, self._level()).add(
+                        ids, counts
+                    )
+                    self._counted_at[article] = current_depth
+            words = int(counts.sum())
+            ARTICLE_WORDS.observe(words)
+            self._annotate(words=words)
+
+            if need_links:
+                logging.debug(
+                    f"Found {len(links)} links in {article} for next depth level"
+                )
 
-        # Merge counter on the event loop thread (single-threaded, safe)
-        self.word_counter += word_counter
+            article_time = time.perf_counter() - article_start
+            logging.info(f"Processed article '{article}' in {article_time:.3f}s")
 
-        if need_links:
-            logging.debug(f"Found {len(links)} links in {article} for next depth level")
+            return (article, True, links)
 
-        article_time = time.time() - article_start
-        logging.info(f"Processed article '{article}' in {article_time:.3f}s")
+    async def _indexed_links(self, article: str) -> list[str] | None:
+        if self._link_graph is None:
+            return None
+        # The lookup waits on the graph's lock, which a commit may be holding
+        return await asyncio.to_thread(self._link_graph.get, WIKIPEDIA_LANG, article)
 
-        return (article, True, links)
+    async def _index_links(self, article: str, links: list[str]) -> None:
+        if self._link_graph is not None:
+            await asyncio.to_thread(
+                self._link_graph.put, WIKIPEDIA_LANG, article, links
+            )
 
-    async def run(self) -> dict:
-        """Process articles up to specified depth using breadth-first traversal with concurrent fetching."""
-        overall_start = time.time()
-        current_depth = 0
-        current_level = [self.article]  # Articles to process at current depth
-        visited = set()  # Track all visited articles
+    async def _fetch_links(self, article: str) -> list[str]:
+        """Re-read the links of an already counted article (words are not counted again).
 
-        await self._open_client()
+        Links already in the link graph are used without downloading the article.
+        """
+        if self.link_discovery == "listing":
+            return await self._list_links(article) or []
+        links = await self._indexed_links(article)
+        if links is not None:
+            return links
+        loaded = await self._load_article(article, True)
+        if loaded is None:
+            return []
+        _, links = loaded
+        await self._index_links(article, links)
+        return links
+
+    async def _list_links(self, article: str) -> list[str] | None:
+        """Links of an article from a lightweight link listing query, or None if missing.
+
+        Unlike links taken from the content, a listing (prop=links) cannot tell
+        apart links transcluded from navboxes, infoboxes and other templates.
+        """
+        links = await self._indexed_links(article)
+        if links is not None:
+            return links
+        page = await self._load_api_page(article, need_text=False)
+        if page is None:
+            return None
+        self.bytes_fetched += page.size
+        await self._index_links(article, page.links)
+        return page.links
+
+    def _discover(self, article: str, depth: int) -> None:
+        """Add an article to the frontier unless it is already known at this depth or shallower."""
+        if depth >= self.depth:
+            if depth == self.depth and self._state is not None:
+                self._next_frontier[article] = None
+            return
+        if self._state is not None and article in self._state.depths:
+            return
+        known_depth = self._depths.get(article)
+        if known_depth is not None and known_depth <= depth:
+            return
+        self._depths[article] = depth
+        self._frontier.put_nowait((depth, next(self._sequence), article))
+        if self.trace is not None:
+            self._queued_at[article] = time.perf_counter()
+            self.trace.instant("queued", article=article, depth=depth)
+
+    def _expand(self, article: str, links: list[str]) -> None:
+        for link in links:
+            self._discover(link, self._depths[article] + 1)
+
+    async def _visit(self, article: str, depth: int) -> None:
+        if article in self._failed or article in self._in_flight:
+            # An in-flight visit picks up a shallower depth when it completes
+            return
+
+        if self._budget_exhausted():
+            # Stop scheduling new work; in-flight articles still finish
+            if article not in self._finished:
+                self.articles_skipped += 1
+            return
+
+        if article in self._finished:
+            # Already counted, but now reached via a shorter path: its links
+            # belong one level shallower than where they were first queued
+            if depth < self._link_depth:
+                self._expand(article, await self._fetch_links(article))
+            return
+
+        self._in_flight.add(article)
+        listing = None
+        if self.link_discovery == "listing" and depth < self._link_depth:
+            # List the links while this article's text is fetched and parsed
+            listing = asyncio.create_task(self._list_links(article))
         try:
-            while current_depth < self.depth and current_level:
-                level_start = time.time()
+            _, success, links = await self.process_article(article, depth)
+            if success and listing is not None:
+                # Like content links, only a counted article's links are followed
+                links = await listing or []
+        finally:
+            self._in_flight.discard(article)
+            if listing is not None and not listing.done():
+                listing.cancel()
+
+        if not success:
+            self._failed.add(article)
+            return
+
+        self._finished.add(article)
+        self.level_counts[depth] += 1
+        best_depth = self._depths[article]
+        if best_depth < self._link_depth <= depth:
+            # Rediscovered at a shallower depth while being processed as a leaf
+            links = await self._fetch_links(article)
+        self._expand(article, links)
+
+    async def _worker(self, lane: int) -> None:
+        if self.trace is not None:
+            bind_lane(lane)
+        while True:
+            depth, _, article = await self._frontier.get()
+            try:
+                # Skip entries superseded by a shallower rediscovery
+                if self._depths.get(article) == depth:
+                    self.current_depth = max(self.current_depth, depth)
+                    await self._visit(article, depth)
+            finally:
+                self._frontier.task_done()
+
+    async def close_batchers(self) -> None:
+        """Close the batched API queries; ends a run of ``crawl_level`` rounds."""
+        for batcher in self._api_batchers.values():
+            await batcher.aclose()
+        # The batchers' queries reference this counter, so drop them
+        self._api_batchers.clear()
+
+    async def crawl_level(self, articles: list[str], depth: int) -> list[str]:
+        """Count ``articles`` as the level at ``depth`` and return their links.
+
+        One round of a level-synchronous sharded crawl (see src.sharding): the
+        caller decides which articles make up the level, so the frontier,
+        budget and crawl state of ``traverse`` are not used. Articles counted
+        or failed in an earlier round are skipped. Links are only collected
+        above the deepest level, and may repeat. Fetches go through the
+        injected client, which must stay open across rounds.
+        """
+        self.current_depth = max(self.current_depth, depth)
+        pending = iter(
+            [
+                article
+                for article in dict.fromkeys(articles)
+                if article not in self._finished and article not in self._failed
+            ]
+        )
+        links: list[str] = []
 
-                # Filter out already visited articles
-                articles_to_process = [
-                    article for article in current_level if article not in visited
-                ]
+        async def worker() -> None:
+            for article in pending:
+                _, success, found = await self.process_article(article, depth)
+                if not success:
+                    self._failed.add(article)
+                    continue
+                self._finished.add(article)
+                self.level_counts[depth] += 1
+                if self.link_discovery == "listing" and depth < self._link_depth:
+                    found = await self._list_links(article) or []
+                links.extend(found)
 
-                # Mark as visited
-                visited.update(articles_to_process)
+        await asyncio.gather(*(worker() for _ in range(CRAWL_WORKERS)))
+        return links
 
-                logging.info(
-                    f"Starting depth level {current_depth + 1} with {len(articles_to_process)} articles to process concurrently"
-                )
+    @property
+    def articles_processed(self) -> int:
+        return self._prior_articles + len(self._finished)
 
-                # Process all articles at this level concurrently
-                tasks = [
-                    self.process_article(article, current_depth)
-                    for article in articles_to_process
-                ]
-                results = await asyncio.gather(*tasks)
-
-                # Collect links for next level
-                next_level = []
-                for article, success, links in results:
-                    if success:
-                        next_level.extend(links)
-
-                current_depth += 1
-                current_level = next_level
-                level_time = time.time() - level_start
-                logging.info(
-                    f"Completed depth level {current_depth} in {level_time:.2f}s, found {len(next_level)} articles for next level"
+    async def _settle_levels(self) -> bool:
+        """Move the words of articles later reached via a shorter path to their final level.
+
+        Returns False if an article could not be reloaded, in which case the
+        per-level counters are not exact and must not be stored.
+        """
+        for article, counted_at in self._counted_at.items():
+            depth = self._depths[article]
+            if depth == counted_at:
+                continue
+            loaded = await self._load_article(article, False)
+            if loaded is None:
+                return False
+            ids, counts = self.vocabulary.encode(loaded[0])
+            self._new_levels[counted_at].add(ids, -counts)
+            self._new_levels.setdefault(depth, self._level()).add(ids, counts)
+        return True
+
+    def _level(self) -> WordCounts:
+        return WordCounts(self.vocabulary)
+
+    def _store_state(self) -> None:
+        """Append the levels of this run to the retained state."""
+        state = self._state
+        if not state.levels:
+            state.created_at = time.monotonic()
+        state.levels.extend(
+            self._new_levels.get(depth, self._level()).nonzero()
+            for depth in range(state.depth, self.depth)
+        )
+        state.depths.update(
+            (article, self._depths[article])
+            for article in itertools.chain(self._finished, self._failed)
+        )
+        state.failed.update(self._failed)
+        state.frontier = [
+            article
+            for article in self._next_frontier
+            if article not in self._depths and article not in state.depths
+        ]
+
+    def progress(self) -> dict[str, int | float | None]:
+        """Snapshot of a running traversal for progress reporting.
+
+        ``articles_queued`` counts frontier entries no worker has taken yet
+        (some may turn out to be superseded). ``eta_seconds`` extrapolates the
+        article rate so far over the queued and in-flight articles, so it is a
+        lower bound while deeper levels are still being discovered; it is
+        None until the first article finishes.
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        done = len(self._finished) + len(self._failed)
+        remaining = self._frontier.qsize() + len(self._in_flight)
+        eta = remaining * elapsed / done if done else None
+        return {
+            # Levels counted like the depth parameter: 1 is the root article
+            "depth": self.current_depth + 1,
+            "max_depth": self.depth,
+            "articles_done": self.articles_processed,
+            "articles_failed": len(self._failed),
+            "articles_in_flight": len(self._in_flight),
+            "articles_queued": self._frontier.qsize(),
+            "bytes_fetched": self.bytes_fetched,
+            "elapsed_seconds": round(elapsed, 3),
+            "eta_seconds": round(eta, 3) if eta is not None else None,
+        }
+
+    def crawl_status(self) -> dict[str, bool | int]:
+        """Completeness of the last run and how many articles it covered."""
+        return {
+            "complete": self.complete,
+            "articles_processed": self.articles_processed,
+            "articles_skipped": self.articles_skipped,
+        }
+
+    async def run(self) -> dict:
+        """Traverse and return the frequency dictionary (see ``traverse``)."""
+        return (await self.traverse()).to_dict()
+
+    async def traverse(self) -> FrequencyTable:
+        """Process articles up to specified depth with a pipelined work-queue scheduler.
+
+        A fixed pool of worker tasks pulls (depth, article) entries from a shared
+        priority frontier, shallowest first. Each finished article immediately
+        queues its unvisited links one level deeper, so fetch slots stay busy
+        instead of waiting for a whole depth level to finish. Articles reached
+        again via a shorter path are re-expanded at the shallower depth, which
+        keeps the visit set identical to a level-by-level breadth-first search.
+
+        With a crawl budget, no new articles are started once a limit is hit;
+        in-flight work drains and the partial result is returned with
+        ``complete`` set to False.
+
+        With a retained CrawlState, a depth the state already covers is answered
+        from its per-level counters without fetching anything, and a deeper one
+        only crawls the missing levels, starting from the stored frontier. Only
+        complete runs extend the state.
+
+        Returns the counted words as a FrequencyTable, which percentages and
+        the frequency dictionary are derived from lazily.
+        """
+        overall_start = time.perf_counter()
+        self._started_at = time.monotonic()
+        self.slot_monitor = self._new_slot_monitor()
+
+        state = self._state
+        if state is not None and state.depth >= self.depth:
+            self.word_counter = state.word_counts(self.depth)
+            self._prior_articles = state.articles_within(self.depth)
+            logging.info(
+                f"Served '{self.article}' at depth {self.depth} from stored levels"
+            )
+            return self.frequency_table()
+
+        with self._span("traverse", article=self.article, depth=self.depth):
+            if state is not None and state.depth:
+                self.word_counter = state.word_counts(state.depth)
+                self._prior_articles = state.articles_within(state.depth)
+                for article in state.frontier:
+                    self._discover(article, state.depth)
+            else:
+                self._discover(self.article, 0)
+
+            await self._open_client()
+            TRAVERSALS.add(self)
+            workers = [
+                asyncio.create_task(self._worker(lane))
+                for lane in range(1, CRAWL_WORKERS + 1)
+            ]
+            drained = asyncio.create_task(self._frontier.join())
+            try:
+                done, _ = await asyncio.wait(
+                    [drained, *workers], return_when=asyncio.FIRST_COMPLETED
                 )
-        finally:
-            await self._close_client()
+                for task in done:
+                    if task is not drained:
+                        task.result()  # Re-raise the failure that stopped a worker
+                if (
+                    state is not None
+                    and self.complete
+                    and self.word_counter  # never pin a root that failed to load
+                    and await self._settle_levels()
+                ):
+                    self._store_state()
+            finally:
+                for task in [drained, *workers]:
+                    task.cancel()
+                await asyncio.gather(drained, *workers, return_exceptions=True)
+                await self.close_batchers()
+                await self._close_client()
+                TRAVERSALS.discard(self)
+            TRAVERSAL_ARTICLES.observe(len(self._finished))
+            self._annotate(articles=len(self._finished), bytes=self.bytes_fetched)
+
+            logging.info(
+                f"Processed {len(self._finished)} articles "
+                f"(per depth: {dict(sorted(self.level_counts.items()))}, "
+                f"failed: {len(self._failed)}, skipped: {self.articles_skipped}), "
+                f"fetch slot utilization: {self.slot_monitor.utilization():.1%}"
+            )
 
-        calc_start = time.time()
-        word_frequency = self.calculate_frequency()
-        calc_time = time.time() - calc_start
+            calc_start = time.perf_counter()
+            with self._phase("frequency"):
+                word_frequency = self.frequency_table()
+            calc_time = time.perf_counter() - calc_start
 
-        total_time = time.time() - overall_start
+        total_time = time.perf_counter() - overall_start
         logging.info(
             f"Total execution time: {total_time:.2f}s (frequency calculation: {calc_time:.3f}s)"
         )
+        if self._article_cache:
+            logging.info(f"Article cache stats: {self._article_cache.stats}")
+        if self._parse_cache is not None:
+            logging.info(f"Parse cache stats: {self._parse_cache.stats}")
         return word_frequency
@@ -0,0 +1,90 @@
+"""Plain text and article links from raw wikitext (as found in XML dumps).
+
+A regex approximation of what the rendered page shows: templates (navboxes,
+infoboxes), tables, references and comments are dropped like their HTML
+counterparts are dropped by the HTML extractors; links keep their label.
+"""
+
+import html
+import re
+from collections import Counter
+
+from config import normalize_title
+from src.extraction import count_words, is_article_title
+
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_REF = re.compile(r"<ref[^>]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+_SKIPPED_TAGS = re.compile(
+    r"<(math|gallery|score|syntaxhighlight|timeline)[^>]*>.*?</\1>",
+    re.DOTALL | re.IGNORECASE,
+)
+# Innermost templates and tables; removed repeatedly to unwrap nesting
+_TEMPLATE = re.compile(r"\{\{[^{}]*\}\}")
+_TABLE = re.compile(r"\{\|(?:(?!\{\|).)*?\|\}", re.DOTALL)
+_WIKILINK = re.compile(r"\[\[([^\[\]|]*)(?:\|([^\[\]]*))?\]\]")
+_LEFTOVER_LINK = re.compile(r"\[\[[^\[\]]*\]\]")  # namespaced: files, categories
+_EXTERNAL_LINK = re.compile(r"\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]")
+_TAG = re.compile(r"<[^>]+>")
+_MARKUP = re.compile(r"'{2,}|={2,}")  # bold/italic quotes and heading markers
+
+
+def _remove_nested(pattern: re.Pattern, text: str) -> str:
+    while True:
+        text, removed = pattern.subn(" ", text)
+        if not removed:
+            return text
+
+
+def _strip_blocks(wikitext: str) -> str:
+    """Drop comments, references, templates and tables."""
+    text = _COMMENT.sub(" ", wikitext)
+    text = _REF.sub(" ", text)
+    text = _SKIPPED_TAGS.sub(" ", text)
+    text = _remove_nested(_TEMPLATE, text)
+    return _remove_nested(_TABLE, text)
+
+
+def _link_title(target: str) -> str | None:
+    """Article title of a wikilink target, filtered like title_from_href."""
+    title = target.split("#", 1)[0].strip()
+    if not title or not is_article_title(title):
+        return None
+    return normalize_title(title)
+
+
+def wikitext_links(wikitext: str) -> list[str]:
+    """Unique main-namespace link targets outside templates, in order of appearance."""
+    links = {}
+    for match in _WIKILINK.finditer(
+        _COMMENT.sub(" ", _remove_nested(_TEMPLATE, wikitext))
+    ):
+        title = _link_title(match.group(1))
+        if title:
+            links[title] = None
+    return list(links)
+
+
+def wikitext_to_text(wikitext: str) -> str:
+    """Readable text of an article, roughly what its rendered content shows."""
+    text = _strip_blocks(wikitext)
+
+    def label(match: re.Match) -> str:
+        target, shown = match.group(1), match.group(2)
+        if not is_article_title(target):
+            return match.group(0)  # files, categories etc., removed below
+        return shown if shown is not None else target.split("#", 1)[0]
+
+    text = _WIKILINK.sub(label, text)
+    text = _remove_nested(_LEFTOVER_LINK, text)
+    text = _EXTERNAL_LINK.sub(r" \1 ", text)
+    text = _TAG.sub(" ", text)
+    text = _MARKUP.sub(" ", text)
+    return html.unescape(text)
+
+
+def extract_words_and_links_from_wikitext(
+    wikitext: str, need_links: bool
+) -> tuple[Counter, list[str]]:
+    """Wikitext counterpart of extract_words_and_links."""
+    links = wikitext_links(wikitext) if need_links else []
+    return count_words(wikitext_to_text(wikitext)), links
@@ -1,12 +1,32 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
+from urllib.parse import parse_qs, unquote, urlsplit
 from fastapi.testclient import TestClient
+import main
 from main import app
+from src.frequency import FrequencyTable
+from src.wiki_client import WikiFrequencyCounter
 
 TEST_FILE_PATH = Path(__file__).parent / "sites"
 
 
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Keep cached frequency results and crawl states from leaking between tests."""
+    if main.result_cache is not None:
+        main.result_cache.clear()
+    if main.crawl_states is not None:
+        main.crawl_states.clear()
+    yield
+
+
 @pytest.fixture
 def test_client():
     """FastAPI test client."""
@@ -52,3 +72,253 @@ def sample_frequency_dict():
         "developers": {"count": 1, "percentage": 7.14},
         "love": {"count": 1, "percentage": 7.14},
     }
+
+
+@pytest.fixture
+def sample_frequency_table(sample_frequency_dict):
+    return FrequencyTable.from_counts(
+        {word: stats["count"] for word, stats in sample_frequency_dict.items()}
+    )
+
+
+class StandInWiki:
+    """Minimal local stand-in for Wikipedia serving /wiki/<title> pages and
+    multi-title /w/api.php wikitext and link queries.
+
+    Like the real API, a response carries at most ``revisions_per_response``
+    revisions and ``links_per_response`` links; the rest follows through
+    continuation tokens. ``failures`` injects throttling: statuses served for
+    a page (with ``retry_after`` as Retry-After) before the page itself.
+    """
+
+    def __init__(self):
+        self.pages: dict[str, str] = {}
+        self.api_pages: dict[str, tuple[str, list[str]]] = {}
+        self.navboxes: dict[str, list[str]] = {}
+        self.redirects: dict[str, str] = {}
+        self.revisions_per_response = 50
+        self.links_per_response = 500
+        self.requests: list[tuple[str, dict]] = []
+        self.failures: dict[str, list[int]] = {}
+        self.retry_after: str | None = None
+        self.delay = 0.0  # seconds each page request takes
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def add_article(
+        self, title: str, text: str, links: list[str], navbox: list[str] = ()
+    ) -> None:
+        """Serve an article as rendered HTML and through the API.
+
+        ``navbox`` links come from a template: they are listed by link queries
+        like on the real API, but sit in a navbox in the HTML and wikitext.
+        """
+        # Links sit in a table, which is dropped from the text like in real pages
+        anchors = "".join(f'<a href="/wiki/{link}">{link}</a>' for link in links)
+        navbox_anchors = "".join(
+            f'<a href="/wiki/{link}">{link}</a>' for link in navbox
+        )
+        self.pages[title] = (
+            f'<div id="mw-content-text"><p>{text}</p>'
+            f"<table><tr><td>{anchors}</td></tr></table>"
+            f'<div class="navbox">{navbox_anchors}</div></div>'
+        )
+        page_title = title.replace("_", " ")
+        self.api_pages[page_title] = (
+            text,
+            [link.replace("_", " ") for link in (*links, *navbox)],
+        )
+        self.navboxes[page_title] = [link.replace("_", " ") for link in navbox]
+
+    def wikitext(self, title: str) -> str:
+        """Wikitext of an API article, its links in a table like in its HTML."""
+        text, links = self.api_pages[title]
+        navbox = self.navboxes.get(title, [])
+        anchors = " ".join(f"[[{link}]]" for link in links if link not in navbox)
+        wikitext = f"{text}\n{{|\n| {anchors}\n|}}"
+        if navbox:
+            wikitext += (
+                "\n{{Navbox|" + " ".join(f"[[{link}]]" for link in navbox) + "}}"
+            )
+        return wikitext
+
+    def api_query(self, params: dict[str, str]) -> dict:
+        requested = params["titles"].split("|")
+        normalized, redirects, titles = [], [], []
+        for title in requested:
+            page_title = title.replace("_", " ")
+            page_title = page_title[:1].upper() + page_title[1:]
+            if page_title != title:
+                normalized.append({"from": title, "to": page_title})
+            if page_title in self.redirects:
+                redirects.append({"from": page_title, "to": self.redirects[page_title]})
+                page_title = self.redirects[page_title]
+            if page_title not in titles:
+                titles.append(page_title)
+
+        pages = []
+        for title in titles:
+            if title in self.api_pages:
+                pages.append({"ns": 0, "title": title})
+            else:
+                pages.append({"ns": 0, "title": title, "missing": True})
+        present = [page for page in pages if "missing" not in page]
+
+        continuation = {}
+        continuing = "continue" in params
+        props = params["prop"].split("|")
+        if "revisions" in props and (not continuing or "rvcontinue" in params):
+            start = int(params.get("rvcontinue", 0))
+            end = start + self.revisions_per_response
+            for page in present[start:end]:
+                content = self.wikitext(page["title"])
+                page["revisions"] = [{"slots": {"main": {"content": content}}}]
+            if end < len(present):
+                continuation["rvcontinue"] = str(end)
+        if "links" in props and (not continuing or "plcontinue" in params):
+            page_index, link_index = map(
+                int, params.get("plcontinue", "0|0").split("|")
+            )
+            budget = self.links_per_response
+            while page_index < len(present) and budget:
+                page = present[page_index]
+                links = self.api_pages[page["title"]][1]
+                chunk = links[link_index : link_index + budget]
+                page["links"] = [{"ns": 0, "title": link} for link in chunk]
+                budget -= len(chunk)
+                link_index += len(chunk)
+                if link_index >= len(links):
+                    page_index, link_index = page_index + 1, 0
+            if page_index < len(present):
+                continuation["plcontinue"] = f"{page_index}|{link_index}"
+
+        response = {
+            "query": {"normalized": normalized, "redirects": redirects, "pages": pages}
+        }
+        if continuation:
+            response["continue"] = {"continue": "||", **continuation}
+        return response
+
+    def _handler(self):
+        wiki = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real thing
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                wiki.requests.append((self.path, dict(self.headers)))
+                url = urlsplit(self.path)
+                if url.path == "/w/api.php":
+                    params = {
+                        key: values[0] for key, values in parse_qs(url.query).items()
+                    }
+                    payload = json.dumps(wiki.api_query(params)).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+
+                title = unquote(self.path.removeprefix("/wiki/"))
+                with wiki._lock:
+                    wiki.active += 1
+                    wiki.peak_active = max(wiki.peak_active, wiki.active)
+                try:
+                    time.sleep(wiki.delay)
+                    self.send_page(title)
+                finally:
+                    with wiki._lock:
+                        wiki.active -= 1
+
+            def send_page(self, title):
+                failures = wiki.failures.get(title)
+                if failures:
+                    self.send_response(failures.pop(0))
+                    if wiki.retry_after is not None:
+                        self.send_header("Retry-After", wiki.retry_after)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body = wiki.pages.get(title)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def standin_wiki(monkeypatch):
+    """Local HTTP server standing in for Wikipedia; article URLs point at it."""
+    import config
+
+    wiki = StandInWiki()
+    wiki.start()
+    monkeypatch.setattr(config, "WIKIPEDIA_DOMAIN", wiki.url)
+    yield wiki
+    wiki.stop()
+
+
+def graph_page(title: str, links: list[str]) -> str:
+    """Minimal article HTML whose only word is its title, linking to `links`."""
+    anchors = "".join(f'<a href="/wiki/{link}">link</a>' for link in links)
+    return f'<div id="mw-content-text"><p>{title}</p>{anchors}</div>'
+
+
+@pytest.fixture
+def graph_counter():
+    """Factory for counters whose fetches are served from an in-memory link graph.
+
+    Articles missing from the graph fail to fetch; `latency` maps titles to
+    simulated fetch delays in seconds.
+    """
+
+    def _make(root, depth, graph, latency=None, **kwargs):
+        wiki = WikiFrequencyCounter(root, depth, **kwargs)
+        delays = latency or {}
+
+        async def fake_source(article):
+            await asyncio.sleep(delays.get(article, 0))
+            if article not in graph:
+                return None
+            return graph_page(article, graph[article])
+
+        wiki.get_article_source = AsyncMock(side_effect=fake_source)
+        wiki._open_client = AsyncMock()
+        wiki._close_client = AsyncMock()
+        return wiki
+
+    return _make
@@ -1,17 +1,21 @@
+import json
+import numpy as np
 import pytest
+import main
 from fastapi import status
 from unittest.mock import patch, AsyncMock
+from src.frequency import STREAM_CHUNK_ROWS, FrequencyTable, json_chunks
 
 
 class TestEndpoints:
     """Test API endpoints."""
 
-    def test_word_frequency_endpoint_success(self, test_client, sample_frequency_dict):
+    def test_word_frequency_endpoint_success(self, test_client, sample_frequency_table):
         """Test /word-frequency endpoint with valid parameters."""
         with patch(
-            "src.wiki_client.WikiFrequencyCounter.run", new_callable=AsyncMock
+            "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
         ) as mock_run:
-            mock_run.return_value = sample_frequency_dict
+            mock_run.return_value = sample_frequency_table
 
             response = test_client.get("/word-frequency?article=Python&depth=1")
 
@@ -39,12 +43,12 @@ class TestEndpoints:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "URL" in response.json()["detail"]["message"]
 
-    def test_keywords_endpoint_success(self, test_client, sample_frequency_dict):
+    def test_keywords_endpoint_success(self, test_client, sample_frequency_table):
         """Test /keywords endpoint with valid parameters."""
         with patch(
-            "src.wiki_client.WikiFrequencyCounter.run", new_callable=AsyncMock
+            "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
         ) as mock_run:
-            mock_run.return_value = sample_frequency_dict
+            mock_run.return_value = sample_frequency_table
 
             payload = {
                 "article": "Python",
@@ -61,13 +65,13 @@ class TestEndpoints:
             assert "a" not in result
 
     def test_keywords_endpoint_empty_ignore_list(
-        self, test_client, sample_frequency_dict
+        self, test_client, sample_frequency_table
     ):
         """Test /keywords endpoint with empty ignore list."""
         with patch(
-            "src.wiki_client.WikiFrequencyCounter.run", new_callable=AsyncMock
+            "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
         ) as mock_run:
-            mock_run.return_value = sample_frequency_dict
+            mock_run.return_value = sample_frequency_table
 
             payload = {
                 "article": "Python",
@@ -106,3 +110,172 @@ class TestEndpoints:
 
         assert response.status_code == 422
         assert "URL" in str(response.json())
+
+    def test_word_frequency_reports_crawl_status_headers(
+        self, test_client, sample_frequency_table
+    ):
+        """Crawl completeness is reported in response headers."""
+        with patch(
+            "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
+        ) as mock_run:
+            mock_run.return_value = sample_frequency_table
+
+            response = test_client.get(
+                "/word-frequency?article=Python&depth=2&max_articles=10&deadline=1.5"
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["X-Crawl-Complete"] == "true"
+            assert response.headers["X-Articles-Skipped"] == "0"
+
+    def test_invalid_budget_rejected(self, test_client):
+        """Budgets must be positive."""
+        response = test_client.get(
+            "/word-frequency?article=Python&depth=1&max_articles=0"
+        )
+        assert response.status_code == 422
+
+        payload = {"article": "Python", "depth": 1, "percentile": 0, "deadline": -1}
+        response = test_client.post("/keywords", json=payload)
+        assert response.status_code == 422
+
+
+class TestStreamingResponses:
+    """Test streamed JSON and NDJSON frequency responses."""
+
+    @pytest.fixture
+    def traverse(self, sample_frequency_table):
+        with patch(
+            "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
+        ) as mock_traverse:
+            mock_traverse.return_value = sample_frequency_table
+            yield mock_traverse
+
+    def test_json_stream_is_byte_identical(self, test_client, traverse):
+        """The streamed JSON object matches the buffered response exactly."""
+        buffered = test_client.get("/word-frequency?article=Python&depth=1")
+        streamed = test_client.get(
+            "/word-frequency?article=Python&depth=1&format=json-stream"
+        )
+
+        assert streamed.status_code == status.HTTP_200_OK
+        assert streamed.content == buffered.content
+        assert streamed.headers["X-Crawl-Complete"] == "true"
+        assert streamed.headers["X-Cache"] == "HIT"
+
+    def test_ndjson_selected_by_accept_header(self, test_client, traverse):
+        response = test_client.get(
+            "/word-frequency?article=Python&depth=1&sort=count",
+            headers={"Accept": "application/x-ndjson"},
+        )
+        rows = [json.loads(line) for line in response.text.splitlines()]
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert rows[0] == {"word": "python", "count": 3, "percentage": 21.4286}
+        assert [row["count"] for row in rows] == sorted(
+            (row["count"] for row in rows), reverse=True
+        )
+
+    def test_keywords_stream_matches_buffered(self, test_client, traverse):
+        payload = {
+            "article": "Python",
+            "depth": 1,
+            "ignore_list": ["a"],
+            "percentile": 40,
+        }
+        buffered = test_client.post("/keywords?sort=word", json=payload).json()
+        streamed = test_client.post("/keywords?format=ndjson&sort=word", json=payload)
+
+        rows = [json.loads(line) for line in streamed.text.splitlines()]
+        assert {row.pop("word"): row for row in rows} == buffered
+        assert list(buffered) == sorted(buffered)
+
+    def test_large_table_streams_in_chunks(self):
+        """Rows are encoded chunk by chunk rather than in one piece."""
+        table = FrequencyTable.from_counts(
+            {f"w{index}": index % 7 + 1 for index in range(3 * STREAM_CHUNK_ROWS)}
+        )
+
+        chunks = list(json_chunks(table))
+
+        assert len(chunks) > 2
+        assert json.loads(b"".join(chunks)) == table.to_dict()
+
+    def test_unknown_format_rejected(self, test_client):
+        response = test_client.get("/word-frequency?article=Python&depth=1&format=xml")
+        assert response.status_code == 422
+
+
+class TestPaging:
+    """Test top_k, min_count and cursor pagination on both endpoints."""
+
+    @pytest.fixture
+    def traverse(self, sample_frequency_table):
+        with patch(
+            "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
+        ) as mock_traverse:
+            mock_traverse.return_value = sample_frequency_table
+            yield mock_traverse
+
+    def test_top_k_returns_most_frequent_words(self, test_client, traverse):
+        response = test_client.get("/word-frequency?article=Python&depth=1&top_k=3")
+
+        assert list(response.json()) == ["python", "programming", "is"]
+        assert response.json()["python"] == {"count": 3, "percentage": 21.4286}
+        assert response.headers["X-Total-Count"] == "10"
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_top_k_selects_by_count_before_sorting_by_word(self, test_client, traverse):
+        traverse.return_value = FrequencyTable.from_counts(
+            {"zebra": 100, "apple": 1, "mango": 50, "kiwi": 2}
+        )
+        response = test_client.get(
+            "/word-frequency?article=Python&depth=1&top_k=2&sort=word"
+        )
+
+        assert list(response.json()) == ["mango", "zebra"]
+
+    def test_cursor_pages_through_cached_result(self, test_client, traverse):
+        url = "/word-frequency?article=Python&depth=1&sort=word&limit=4"
+        words, total = [], None
+        while url:
+            response = test_client.get(url, headers={"Accept": "application/x-ndjson"})
+            words += [json.loads(line)["word"] for line in response.text.splitlines()]
+            total = int(response.headers["X-Total-Count"])
+            cursor = response.headers.get("X-Next-Cursor")
+            url = cursor and f"/word-frequency?article=Python&depth=1&cursor={cursor}"
+
+        assert words == sorted(words) and len(words) == total == 10
+        assert traverse.call_count == 1
+
+    def test_keywords_min_count_and_limit(self, test_client, traverse):
+        payload = {"article": "Python", "depth": 1, "percentile": 0}
+        response = test_client.post("/keywords?min_count=2&limit=2", json=payload)
+
+        assert list(response.json()) == ["python", "programming"]
+        assert response.headers["X-Total-Count"] == "3"
+
+    def test_cursor_expires_when_result_changes(
+        self, test_client, traverse, sample_frequency_table
+    ):
+        first = test_client.get("/word-frequency?article=Python&depth=1&limit=2")
+        main.result_cache.clear()
+        traverse.return_value = sample_frequency_table.take(np.arange(5))
+
+        cursor = first.headers["X-Next-Cursor"]
+        response = test_client.get(
+            f"/word-frequency?article=Python&depth=1&cursor={cursor}"
+        )
+
+        assert response.status_code == status.HTTP_410_GONE
+
+    def test_invalid_paging_rejected(self, test_client, traverse):
+        response = test_client.get(
+            "/word-frequency?article=Python&depth=1&top_k=5&offset=10"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = test_client.get(
+            "/word-frequency?article=Python&depth=1&cursor=bogus"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,100 @@
+import pytest
+from src.article_cache import ArticleCache
+from src.wiki_client import WikiFrequencyCounter
+
+PAGE = '<div id="mw-content-text"><p>Cached article words</p></div>'
+
+
+@pytest.fixture
+def article_cache(tmp_path):
+    cache = ArticleCache(str(tmp_path / "articles.sqlite"), ttl=3600, max_bytes=1024)
+    yield cache
+    cache.close()
+
+
+class TestArticleCache:
+    """Test the persistent article cache against a local stand-in server."""
+
+    @pytest.mark.asyncio
+    async def test_second_fetch_is_served_locally(self, standin_wiki, article_cache):
+        """A fresh cache entry is served without contacting the server."""
+        standin_wiki.pages["Cached"] = PAGE
+        wiki = WikiFrequencyCounter("Cached", 1, article_cache=article_cache)
+        await wiki._open_client()
+        try:
+            first = await wiki.get_article_source("Cached")
+            second = await wiki.get_article_source("cached")
+        finally:
+            await wiki._close_client()
+
+        assert first == second == PAGE
+        assert len(standin_wiki.requests) == 1
+        assert article_cache.stats["misses"] == 1
+        assert article_cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_revalidated(self, standin_wiki, article_cache):
+        """After the TTL expires the entry is revalidated with If-None-Match."""
+        standin_wiki.pages["Cached"] = PAGE
+        article_cache.ttl = 0
+        wiki = WikiFrequencyCounter("Cached", 1, article_cache=article_cache)
+        await wiki._open_client()
+        try:
+            await wiki.get_article_source("Cached")
+            result = await wiki.get_article_source("Cached")
+        finally:
+            await wiki._close_client()
+
+        assert result == PAGE
+        assert "If-None-Match" in standin_wiki.requests[1][1]
+        assert article_cache.stats["revalidations"] == 1
+        assert article_cache.stats["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_article_is_replaced(self, standin_wiki, article_cache):
+        """A revalidation that returns new content replaces the cached body."""
+        standin_wiki.pages["Cached"] = PAGE
+        article_cache.ttl = 0
+        wiki = WikiFrequencyCounter("Cached", 1, article_cache=article_cache)
+        await wiki._open_client()
+        try:
+            await wiki.get_article_source("Cached")
+            standin_wiki.pages["Cached"] = PAGE.replace("words", "changed")
+            result = await wiki.get_article_source("Cached")
+        finally:
+            await wiki._close_client()
+
+        assert "changed" in result
+        assert "changed" in article_cache.get("en", "Cached").body
+
+    def test_size_bound_evicts_least_recently_used(self, article_cache):
+        """Total stored size stays under max_bytes."""
+        article_cache.put("en", "First", "a" * 400)
+        article_cache.put("en", "Second", "b" * 400)
+        article_cache.get("en", "First")
+        article_cache.put("en", "Third", "c" * 400)
+
+        assert article_cache.total_bytes() <= 1024
+        assert article_cache.get("en", "Second") is None
+        assert article_cache.get("en", "First") is not None
+        assert article_cache.stats["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hits_do_not_write_and_downloads_count_bytes(
+        self, standin_wiki, article_cache
+    ):
+        """Reads only note their access time; downloads are counted in bytes."""
+        page = PAGE.replace("words", "szavak és ékezetek")
+        standin_wiki.pages["Cached"] = page
+        wiki = WikiFrequencyCounter("Cached", 1, article_cache=article_cache)
+        await wiki._open_client()
+        try:
+            await wiki.get_article_source("Cached")
+            writes = article_cache._conn.total_changes
+            await wiki.get_article_source("Cached")
+        finally:
+            await wiki._close_client()
+
+        assert article_cache._conn.total_changes == writes
+        assert article_cache.stats["bytes_downloaded"] == len(page.encode("utf-8"))
+        assert wiki.bytes_fetched == len(page.encode("utf-8"))  # the hit is free
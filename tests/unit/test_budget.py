@@ -0,0 +1,91 @@
+import pytest
+from src.article_cache import ArticleCache
+from src.budget import CrawlBudget
+from src.wiki_client import WikiFrequencyCounter
+from tests.conftest import graph_page
+
+GRAPH = {"Root": [f"Child{c}" for c in "abcdefgh"]}
+GRAPH.update({f"Child{c}": ["Root"] for c in "abcdefgh"})
+
+
+class TestCrawlBudget:
+    """Test that crawl budgets stop the traversal and report partial results."""
+
+    @pytest.mark.asyncio
+    async def test_unbounded_run_is_complete(self, graph_counter):
+        """Without a budget every reachable article is processed."""
+        wiki = graph_counter("Root", 2, GRAPH)
+
+        await wiki.run()
+
+        assert wiki.crawl_status() == {
+            "complete": True,
+            "articles_processed": 9,
+            "articles_skipped": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_max_articles_returns_partial_result(self, graph_counter):
+        """Once max_articles is reached no new fetches start."""
+        wiki = graph_counter("Root", 2, GRAPH, budget=CrawlBudget(max_articles=3))
+
+        result = await wiki.run()
+
+        assert "root" in result
+        assert wiki.get_article_source.call_count == 3
+        assert wiki.crawl_status() == {
+            "complete": False,
+            "articles_processed": 3,
+            "articles_skipped": 6,
+        }
+
+    @pytest.mark.asyncio
+    async def test_max_bytes(self, standin_wiki):
+        """The byte budget counts downloaded HTML."""
+        for title, links in GRAPH.items():
+            standin_wiki.pages[title] = graph_page(title, links)
+        wiki = WikiFrequencyCounter("Root", 2, budget=CrawlBudget(max_bytes=1))
+
+        await wiki.run()
+
+        assert wiki.articles_processed == 1
+        assert not wiki.complete
+
+    @pytest.mark.asyncio
+    async def test_max_bytes_does_not_charge_cache_hits(self, standin_wiki, tmp_path):
+        """Articles served fresh from the article cache were not downloaded."""
+        for title, links in GRAPH.items():
+            standin_wiki.pages[title] = graph_page(title, links)
+        cache = ArticleCache(str(tmp_path / "articles.sqlite"), 3600, 2**20)
+        try:
+            await WikiFrequencyCounter("Root", 2, article_cache=cache).run()
+            wiki = WikiFrequencyCounter(
+                "Root", 2, article_cache=cache, budget=CrawlBudget(max_bytes=1)
+            )
+
+            await wiki.run()
+        finally:
+            cache.close()
+
+        assert wiki.bytes_fetched == 0
+        assert wiki.crawl_status()["complete"]
+        assert wiki.articles_processed == 9
+
+    @pytest.mark.asyncio
+    async def test_deadline_drains_in_flight_work(self, graph_counter):
+        """After the deadline, in-flight articles finish but nothing new starts."""
+        graph = {"Root": [f"Child{c}" for c in "abcdefgh"]}
+        graph.update({f"Child{c}": [f"Grand{c}"] for c in "abcdefgh"})
+        graph.update({f"Grand{c}": [] for c in "abcdefgh"})
+        latency = {title: 0.1 for title in graph}
+        wiki = graph_counter(
+            "Root", 3, graph, latency, budget=CrawlBudget(deadline=0.15)
+        )
+
+        result = await wiki.run()
+
+        assert "root" in result
+        assert not wiki.complete
+        assert wiki.articles_processed == wiki.articles_started
+        assert wiki.articles_processed == 9
+        assert wiki.articles_skipped == 8
@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.coalescing import SingleFlight
+from src.frequency import FrequencyTable
+
+GRAPH = {"Root": ["Shared", "Other"], "Shared": [], "Other": []}
+
+
+class TestSingleFlight:
+    """Test single-flight coalescing of concurrent work."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_run(self):
+        """Callers with the same key await one execution."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flights.stats == {"started": 1, "shared": 4}
+        assert not flights.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """The work keeps running while at least one caller still waits."""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return 42
+
+        first = asyncio.create_task(flights.do("key", work))
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == 42
+
+    @pytest.mark.asyncio
+    async def test_last_caller_leaving_cancels_work(self):
+        """Abandoned work is cancelled."""
+        flights = SingleFlight()
+        finished = False
+
+        async def work():
+            nonlocal finished
+            await asyncio.sleep(0.05)
+            finished = True
+
+        caller = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+
+        assert not finished
+
+    @pytest.mark.asyncio
+    async def test_concurrent_traversals_fetch_shared_articles_once(
+        self, graph_counter
+    ):
+        """Articles in flight for one traversal are awaited by another."""
+        flights = SingleFlight()
+        latency = {"Root": 0.01, "Shared": 0.1, "Other": 0.01}
+        first = graph_counter("Root", 2, GRAPH, latency, flights=flights)
+        second = graph_counter("Shared", 1, GRAPH, latency, flights=flights)
+
+        await asyncio.gather(first.run(), second.run())
+
+        fetched = [
+            call.args[0]
+            for wiki in (first, second)
+            for call in wiki.get_article_source.call_args_list
+        ]
+        assert sorted(fetched) == ["Other", "Root", "Shared"]
+        assert first.word_counter == {"root": 1, "shared": 1, "other": 1, "link": 2}
+        assert second.word_counter == {"shared": 1}
+
+    def test_identical_requests_share_one_crawl(self, test_client):
+        """Concurrent identical requests, even with different filters, run once."""
+        from main import _compute_frequency
+
+        async def slow_run():
+            await asyncio.sleep(0.05)
+            return FrequencyTable.from_counts({"word": 1})
+
+        async def fire():
+            return await asyncio.gather(
+                _compute_frequency("Python", 2),
+                _compute_frequency("python", 2),
+                _compute_frequency("Python", 3),
+            )
+
+        with patch(
+            "src.wiki_client.WikiFrequencyCounter.traverse",
+            new_callable=AsyncMock,
+            side_effect=slow_run,
+        ) as mock_run:
+            results = asyncio.run(fire())
+
+        assert mock_run.call_count == 2
+        assert results[0][0] is results[1][0]
@@ -0,0 +1,123 @@
+import pytest
+from src.budget import CrawlBudget
+from src.crawl_state import CrawlState, CrawlStateStore
+
+GRAPH = {
+    "Root": ["A", "B"],
+    "A": ["C", "Root"],
+    "B": ["C", "D"],
+    "C": ["E"],
+    "D": ["A", "F"],
+    "E": [],
+    "F": ["G"],
+    "G": [],
+}
+
+# "Slow" reaches X one level shallower than the Fast -> Mid path does, but only
+# after X has already been counted at the deeper level
+UPGRADE_GRAPH = {
+    "Root": ["Slow", "Fast"],
+    "Slow": ["X"],
+    "Fast": ["Mid"],
+    "Mid": ["X"],
+    "X": ["Y"],
+    "Y": [],
+}
+UPGRADE_LATENCY = {"Slow": 0.2}
+
+
+def fetched(wiki):
+    return sorted(call.args[0] for call in wiki.get_article_source.call_args_list)
+
+
+class TestCrawlState:
+    """Test depth-incremental traversals from retained per-root state."""
+
+    @pytest.mark.asyncio
+    async def test_deeper_request_only_fetches_new_levels(self, graph_counter):
+        """Depth 1 then depth 3 matches a fresh depth-3 run, fetching each article once."""
+        state = CrawlState()
+        shallow = graph_counter("Root", 1, GRAPH, state=state)
+        await shallow.run()
+        deep = graph_counter("Root", 3, GRAPH, state=state)
+        result = await deep.run()
+
+        fresh = graph_counter("Root", 3, GRAPH)
+        assert result == await fresh.run()
+        assert deep.word_counter == fresh.word_counter
+        assert fetched(shallow) == ["Root"]
+        assert fetched(deep) == ["A", "B", "C", "D"]
+        assert deep.articles_processed == fresh.articles_processed == 5
+        assert state.depth == 3
+        assert sorted(state.frontier) == ["E", "F"]
+
+    @pytest.mark.asyncio
+    async def test_shallower_request_is_served_from_levels(self, graph_counter):
+        """A depth the state already covers is answered without fetching."""
+        state = CrawlState()
+        await graph_counter("Root", 4, GRAPH, state=state).run()
+
+        shallow = graph_counter("Root", 2, GRAPH, state=state)
+        result = await shallow.run()
+
+        fresh = graph_counter("Root", 2, GRAPH)
+        assert result == await fresh.run()
+        assert fetched(shallow) == []
+        assert shallow.crawl_status() == fresh.crawl_status()
+
+    @pytest.mark.asyncio
+    async def test_rediscovered_article_moves_to_shallower_level(self, graph_counter):
+        """Words of an article reached later via a shorter path land in its BFS level."""
+        state = CrawlState()
+        await graph_counter(
+            "Root", 4, UPGRADE_GRAPH, UPGRADE_LATENCY, state=state
+        ).run()
+
+        for depth in range(1, 5):
+            fresh = graph_counter("Root", depth, UPGRADE_GRAPH)
+            await fresh.run()
+            assert state.word_counts(depth) == fresh.word_counter
+        assert state.depths["X"] == 2
+
+    @pytest.mark.asyncio
+    async def test_partial_run_does_not_extend_state(self, graph_counter):
+        """A budget-limited traversal leaves the stored levels untouched."""
+        state = CrawlState()
+        await graph_counter("Root", 1, GRAPH, state=state).run()
+
+        partial = graph_counter(
+            "Root", 3, GRAPH, state=state, budget=CrawlBudget(max_articles=1)
+        )
+        await partial.run()
+
+        assert not partial.complete
+        assert state.depth == 1
+        assert sorted(state.frontier) == ["A", "B"]
+
+    @pytest.mark.asyncio
+    async def test_expired_state_is_crawled_again(self, graph_counter):
+        """Levels older than the store's TTL are dropped and refetched."""
+        store = CrawlStateStore(max_entries=2, ttl=60)
+        await graph_counter("Root", 3, GRAPH, state=store.get("Root")).run()
+        served = graph_counter("Root", 2, GRAPH, state=store.get("Root"))
+        await served.run()
+
+        store.get("Root").created_at -= 60
+        refetched = graph_counter("Root", 2, GRAPH, state=store.get("Root"))
+        await refetched.run()
+
+        assert fetched(served) == []
+        assert fetched(refetched) == ["A", "B", "Root"]
+        assert store.get("Root").depth == 2
+
+    def test_store_evicts_least_recently_used_root(self):
+        """The store keeps at most max_entries roots."""
+        store = CrawlStateStore(max_entries=2, ttl=60)
+        first = store.get("a")
+        store.get("b")
+        store.get("a")
+        store.get("c")
+
+        assert len(store) == 2
+        assert store.get("a") is first
+        assert store.get("b") is not None and len(store) == 2
@@ -0,0 +1,128 @@
+import bz2
+import pytest
+from prometheus_client import REGISTRY
+from src.dump_ingest import ingest_dump, iter_pages, open_dump
+from src.dump_store import DumpStore
+from src.wiki_client import WikiFrequencyCounter
+from src.wikitext import wikitext_links, wikitext_to_text
+
+PAGES = [
+    ("Root", 0, None, "'''Root''' links to [[Alpha]] and [[beta page|Beta]]."),
+    (
+        "Alpha",
+        0,
+        None,
+        "{{Infobox|name=[[Hidden]]}}Alpha text [[Gamma#History]]<ref>cited</ref>",
+    ),
+    ("Beta page", 0, None, "Beta text [[File:Map.png|thumb|map]] [[Root]]"),
+    ("Gamma", 0, None, "Gamma text"),
+    ("Old alpha", 0, "Alpha", "#REDIRECT [[Alpha]]"),
+    ("Talk:Root", 1, None, "Talk text"),
+]
+
+
+def synthetic_dump() -> str:
+    pages = []
+    for title, namespace, redirect, text in PAGES:
+        redirect_tag = f'<redirect title="{redirect}" />' if redirect else ""
+        pages.append(f"""
+  <page>
+    <title>{title}</title>
+    <ns>{namespace}</ns>
+    {redirect_tag}
+    <revision><text xml:space="preserve">{text.replace("&", "&amp;").replace("<", "&lt;")}</text></revision>
+  </page>""")
+    return (
+        '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">'
+        f"<siteinfo><sitename>Test</sitename></siteinfo>{''.join(pages)}\n</mediawiki>"
+    )
+
+
+@pytest.fixture(params=["plain", "bz2"])
+def dump_path(request, tmp_path):
+    data = synthetic_dump().encode("utf-8")
+    if request.param == "bz2":
+        path = tmp_path / "dump.xml.bz2"
+        path.write_bytes(bz2.compress(data))
+    else:
+        path = tmp_path / "dump.xml"
+        path.write_bytes(data)
+    return str(path)
+
+
+@pytest.fixture
+def dump_store(dump_path, tmp_path):
+    store = DumpStore(str(tmp_path / "store.sqlite"), "en")
+    ingest_dump(dump_path, store, batch_size=2)
+    yield store
+    store.close()
+
+
+def parse_count(backend: str) -> float:
+    return (
+        REGISTRY.get_sample_value("wiki_parse_seconds_count", {"backend": backend})
+        or 0.0
+    )
+
+
+class TestWikitext:
+    """Test plain text and link extraction from wikitext."""
+
+    def test_text_keeps_link_labels_and_drops_templates(self):
+        wikitext = (
+            "{{Infobox|a={{nested|x}}}}'''Bold''' [[Target|label]] [[Plain]]s "
+            "<ref>{{cite}}</ref>{| table |} [[File:X.png|thumb|caption]] "
+            "[https://example.org site] &amp;"
+        )
+        assert wikitext_to_text(wikitext).split() == [
+            "Bold",
+            "label",
+            "Plains",
+            "site",
+            "&",
+        ]
+
+    def test_links_are_filtered_like_html_links(self):
+        wikitext = (
+            "{{Navbox|[[In template]]}} [[alpha beta|x]] [[Gamma#Section]] "
+            "[[#Local]] [[Category:Things]] [[File:X.png]] [[Alpha_beta]]"
+        )
+        assert wikitext_links(wikitext) == ["Alpha_beta", "Gamma"]
+
+
+class TestDumpIngest:
+    """Test streaming dump ingestion and the dump fetch backend."""
+
+    def test_pages_stream_from_plain_and_bz2(self, dump_path):
+        with open_dump(dump_path) as source:
+            pages = list(iter_pages(source))
+
+        assert [page.title for page in pages] == [title for title, *_ in PAGES]
+        assert pages[4].redirect == "Alpha"
+        assert pages[5].namespace == 1
+
+    def test_ingest_stores_articles_links_and_redirects(self, dump_store):
+        word_counter, links, size = dump_store.get("Old_alpha", need_links=True)
+
+        assert len(dump_store) == 4
+        assert word_counter == {"alpha": 1, "text": 1, "gamma": 1}
+        assert links == ["Gamma"]
+        assert size > 0
+        assert dump_store.get("Talk:Root", need_links=False) is None
+
+    @pytest.mark.asyncio
+    async def test_counter_reads_from_dump(self, dump_store):
+        """A traversal runs entirely from the local store."""
+        parses = parse_count("dump")
+        wiki = WikiFrequencyCounter("Root", 3, backend="dump", dump_store=dump_store)
+        wiki.get_article_source = None  # any HTTP fetch would fail loudly
+        await wiki.run()
+
+        assert wiki.articles_processed == 4
+        assert parse_count("dump") - parses == 4
+        assert wiki.word_counter["text"] == 3
+        assert dump_store.links.plan("en", "Root", 3).size == 4
+
+    def test_dump_backend_requires_store(self):
+        with pytest.raises(ValueError, match="needs a DumpStore"):
+            WikiFrequencyCounter("Root", 1, backend="dump")
@@ -1,5 +1,8 @@
+import numpy as np
 import pytest
-from utils.filters import filter_by_ignore_list, filter_by_percentile
+from src.frequency import FrequencyTable
+from src.vocabulary import Vocabulary, WordCounts
+from utils.filters import filter_by_ignore_list, filter_by_percentile, filter_table
 
 
 class TestFiltering:
@@ -84,3 +87,44 @@ class TestFiltering:
 
         # Should be filtered by percentile
         assert len(result) < len(sample_frequency_dict)
+
+    @pytest.mark.parametrize("percentile", [0, 1, 30, 50, 90, 99, 100])
+    @pytest.mark.parametrize("ignore_list", [[], ["IS", "a", "missing"]])
+    def test_filter_table_matches_dict_filters(
+        self, sample_frequency_table, ignore_list, percentile
+    ):
+        """Filtering the table gives the dictionary the dict filters produce."""
+        expected = filter_by_percentile(
+            filter_by_ignore_list(sample_frequency_table.to_dict(), ignore_list),
+            percentile,
+        )
+
+        result = filter_table(sample_frequency_table, ignore_list, percentile)
+
+        assert result.to_dict() == expected
+
+    @pytest.mark.parametrize("percentile", [0, 10, 50, 75, 97, 100])
+    @pytest.mark.parametrize("lowercase", [True, False])
+    def test_vectorized_filter_matches_on_rounding_collisions(
+        self, percentile, lowercase
+    ):
+        """A large total makes neighbouring counts round to the same percentage,
+        the case where a count threshold alone would differ."""
+        rng = np.random.default_rng(percentile)
+        counts = rng.integers(1, 400, 3000) * 1000 + rng.integers(0, 1000, 3000)
+        words = [f"word{index}" for index in range(len(counts))]
+        if not lowercase:
+            words[::7] = [word.upper() for word in words[::7]]
+        vocabulary = Vocabulary()
+        word_counts = WordCounts(vocabulary)
+        word_counts.update(dict(zip(words, counts.tolist())))
+        table = FrequencyTable.from_counts(word_counts)
+        ignore_list = ["WORD1", "word2", "Word14", "absent"]
+
+        expected = filter_by_percentile(
+            filter_by_ignore_list(table.to_dict(), ignore_list), percentile
+        )
+        result = filter_table(table, ignore_list, percentile)
+
+        assert vocabulary.all_lowercase is table.lowercase is lowercase
+        assert result.to_dict() == expected
@@ -0,0 +1,47 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from src.http_client import create_http_client, pool_stats
+from src.wiki_client import WikiFrequencyCounter
+
+PAGE = '<div id="mw-content-text"><p>Pooled article</p></div>'
+
+
+class TestSharedHttpClient:
+    """Test the app-wide pooled HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_counters_share_pooled_connections(self, standin_wiki):
+        """Consecutive counters reuse one keep-alive connection."""
+        standin_wiki.pages["Pooled"] = PAGE
+        client = create_http_client()
+        try:
+            for _ in range(3):
+                wiki = WikiFrequencyCounter("Pooled", 1, client=client)
+                assert await wiki.run()
+
+            stats = pool_stats(client)
+            assert stats["requests"] == 3
+            assert stats["tcp_connects"] == 1
+            assert stats["connections"] == 1
+        finally:
+            await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_injected_client_is_not_closed(self, standin_wiki):
+        """A counter only closes clients it opened itself."""
+        standin_wiki.pages["Pooled"] = PAGE
+        client = create_http_client()
+        try:
+            await WikiFrequencyCounter("Pooled", 1, client=client).run()
+            assert not client.is_closed
+        finally:
+            await client.aclose()
+
+    def test_lifespan_creates_client_and_exposes_stats(self):
+        """The app creates the shared client at startup and reports pool stats."""
+        with TestClient(app) as client:
+            response = client.get("/stats")
+
+        assert response.status_code == 200
+        assert response.json()["http_pool"]["requests"] == 0
@@ -0,0 +1,119 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from main import app
+
+GRAPH = {"Root": ["A", "B"], "A": ["C"], "B": [], "C": []}
+
+
+def wait_for(client, job_id, predicate, timeout=5.0):
+    """Poll the job status until ``predicate(snapshot)`` holds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        snapshot = client.get(f"/jobs/{job_id}").json()
+        if predicate(snapshot):
+            return snapshot
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach the expected state")
+
+
+class TestJobs:
+    """Test background jobs: submission, progress, results and cancellation."""
+
+    def test_result_matches_keywords_and_is_fetched_once(self, sample_frequency_table):
+        payload = {
+            "article": "Python",
+            "depth": 1,
+            "ignore_list": ["is"],
+            "percentile": 50,
+        }
+        with (
+            patch(
+                "src.wiki_client.WikiFrequencyCounter.traverse",
+                new_callable=AsyncMock,
+                return_value=sample_frequency_table,
+            ),
+            TestClient(app) as client,
+        ):
+            submitted = client.post("/jobs", json=payload)
+            job_id = submitted.json()["id"]
+            wait_for(client, job_id, lambda job: job["status"] == "done")
+
+            result = client.get(f"/jobs/{job_id}/result?sort=count")
+            expected = client.post("/keywords?sort=count", json=payload)
+
+            assert submitted.status_code == 202
+            assert submitted.headers["Location"] == f"/jobs/{job_id}"
+            assert result.content == expected.content
+            assert client.get(f"/jobs/{job_id}/result").status_code == 404
+
+    def test_cancel_stops_the_traversal(self):
+        cancelled = []
+
+        async def endless_traverse(self):
+            self.bytes_fetched = 123
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(self.article)
+                raise
+
+        with (
+            patch("src.wiki_client.WikiFrequencyCounter.traverse", endless_traverse),
+            TestClient(app) as client,
+        ):
+            job_id = client.post("/jobs", json={"article": "Slow", "depth": 3}).json()[
+                "id"
+            ]
+            running = wait_for(
+                client,
+                job_id,
+                lambda job: (job["progress"] or {}).get("bytes_fetched") == 123,
+            )
+            deleted = client.delete(f"/jobs/{job_id}")
+
+            assert running["status"] == "running"
+            assert deleted.json()["status"] == "cancelled"
+            assert cancelled == ["Slow"]
+            assert client.get(f"/jobs/{job_id}").status_code == 404
+
+    def test_event_stream_reports_progress_until_done(self, sample_frequency_table):
+        async def slow_traverse(self):
+            await asyncio.sleep(0.1)
+            return sample_frequency_table
+
+        with (
+            patch("main.JOB_PROGRESS_INTERVAL", 0.01),
+            patch("src.wiki_client.WikiFrequencyCounter.traverse", slow_traverse),
+            TestClient(app) as client,
+        ):
+            job_id = client.post(
+                "/jobs", json={"article": "Python", "depth": 1}
+            ).json()["id"]
+            with client.stream("GET", f"/jobs/{job_id}/events") as stream:
+                events = [
+                    line.removeprefix("event: ")
+                    for line in stream.iter_lines()
+                    if line.startswith("event: ")
+                ]
+
+        assert events.count("progress") >= 2
+        assert events[-1] == "done"
+
+    @pytest.mark.asyncio
+    async def test_counter_progress(self, graph_counter):
+        """Progress reports the current level, in-flight and finished articles."""
+        wiki = graph_counter("Root", 3, GRAPH, latency={"C": 0.2})
+        run = asyncio.create_task(wiki.run())
+        await asyncio.sleep(0.1)
+        during = wiki.progress()
+        await run
+        after = wiki.progress()
+
+        assert during["depth"] == 3 and during["articles_in_flight"] == 1
+        assert during["eta_seconds"] is not None
+        assert after["articles_done"] == 4
+        assert after["articles_queued"] == 0
+        assert after["eta_seconds"] == 0
@@ -0,0 +1,124 @@
+import asyncio
+import time
+import pytest
+from email.utils import formatdate
+from src.http_client import create_http_client
+from src.limiter import (
+    AdaptiveLimiter,
+    RetryBudget,
+    host_limiter,
+    parse_retry_after,
+    split_host_budget,
+)
+from src.wiki_client import WikiFrequencyCounter
+from tests.conftest import graph_page
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr("src.limiter.RETRY_BASE_DELAY", 0.001)
+
+
+class TestAdaptiveLimiter:
+    """Test the AIMD limit, pauses and Retry-After parsing."""
+
+    @pytest.mark.asyncio
+    async def test_limit_grows_when_saturated_and_cuts_once_per_window(self):
+        limiter = AdaptiveLimiter(initial=2, minimum=1, maximum=3, latency_target=1.0)
+        await limiter.acquire()
+        await limiter.acquire()
+        for _ in range(4):
+            limiter.record(time.monotonic(), "ok", latency=0.1)
+        assert limiter.slots == 3
+
+        sent_at = time.monotonic()
+        limiter.record(sent_at, "throttled")
+        limiter.record(sent_at, "throttled")  # same window: no second cut
+        assert limiter.slots == 1
+        assert limiter.stats["cuts"] == 1
+
+        limiter.record(time.monotonic(), "ok", latency=5.0)  # too slow to grow
+        assert limiter.slots == 1
+
+    @pytest.mark.asyncio
+    async def test_pause_holds_back_requests(self):
+        limiter = AdaptiveLimiter(initial=2)
+        limiter.pause(0.1)
+        start = time.monotonic()
+        async with limiter.slot():
+            waited = time.monotonic() - start
+        assert waited >= 0.09
+        assert limiter.in_flight == 0
+
+    def test_split_budget_divides_each_host_limit(self, monkeypatch):
+        monkeypatch.setattr("src.limiter._budget_parts", 1)
+        monkeypatch.setattr("src.limiter.MAX_CONCURRENT_REQUESTS", 8)
+        monkeypatch.setattr("src.limiter.CONCURRENCY_MAX", 30)
+        split_host_budget(4)
+
+        limiter = host_limiter("https://shard.example.org/wiki/Python")
+
+        assert (limiter.limit, limiter.maximum) == (2, 7)
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+        assert parse_retry_after(formatdate(time.time() - 10, usegmt=True)) == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestThrottledFetches:
+    """Test retries and backoff against a stand-in wiki that throttles."""
+
+    @pytest.mark.asyncio
+    async def test_throttled_fetch_is_retried_and_backs_off(self, standin_wiki):
+        standin_wiki.pages["Busy"] = graph_page("Busy", [])
+        standin_wiki.failures["Busy"] = [429, 503]
+        standin_wiki.retry_after = "0"
+
+        result = await WikiFrequencyCounter("Busy", 1).run()
+        limiter = host_limiter(standin_wiki.url)
+
+        assert result["busy"]["count"] == 1
+        assert len(standin_wiki.requests) == 3
+        assert limiter.stats["throttled"] == 2 and limiter.stats["retries"] == 2
+        assert limiter.stats["pauses"] == 2
+        assert limiter.slots < AdaptiveLimiter().slots
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_caps_retries(self, standin_wiki):
+        standin_wiki.pages["Down"] = graph_page("Down", [])
+        standin_wiki.failures["Down"] = [503] * 10
+        host_limiter(standin_wiki.url).retry_budget = RetryBudget(1, 0)
+
+        result = await WikiFrequencyCounter("Down", 1).run()
+
+        assert result == {}
+        assert len(standin_wiki.requests) == 2
+        assert host_limiter(standin_wiki.url).stats["retries_denied"] == 1
+
+    @pytest.mark.asyncio
+    async def test_counters_share_the_host_limit(self, standin_wiki):
+        """Concurrent counters together stay within the host's limit."""
+        links = ["Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta"]
+        for root in ("Left", "Right"):
+            standin_wiki.pages[root] = graph_page(root, links)
+        for link in links:
+            standin_wiki.pages[link] = graph_page(link, [])
+        standin_wiki.delay = 0.02
+        limiter = host_limiter(standin_wiki.url)
+        limiter.limit = limiter.maximum = 2
+
+        client = create_http_client()
+        try:
+            results = await asyncio.gather(
+                WikiFrequencyCounter("Left", 2, client=client).run(),
+                WikiFrequencyCounter("Right", 2).run(),
+            )
+        finally:
+            await client.aclose()
+
+        assert all(result["zeta"]["count"] == 1 for result in results)
+        assert standin_wiki.peak_active <= 2
+        assert limiter.peak == 2
@@ -0,0 +1,121 @@
+import pytest
+from unittest.mock import patch
+import main
+from src.link_graph import LinkGraph
+
+GRAPH = {
+    "Root": ["A", "B"],
+    "A": ["C", "Root"],
+    "B": ["C", "D"],
+    "C": ["E"],
+    "D": [],
+    "E": [],
+}
+
+UPGRADE_GRAPH = {
+    "Root": ["Slow", "Fast"],
+    "Slow": ["X"],
+    "Fast": ["Mid"],
+    "Mid": ["X"],
+    "X": ["Y"],
+    "Y": [],
+}
+
+
+@pytest.fixture
+def link_graph():
+    graph = LinkGraph(":memory:", ttl=3600)
+    yield graph
+    graph.close()
+
+
+def index(link_graph, graph):
+    for title, links in graph.items():
+        link_graph.put("en", title, links)
+
+
+class TestLinkGraph:
+    """Test the persistent link graph and traversal planning."""
+
+    def test_put_get_and_expiry(self, link_graph):
+        """Entries round-trip until they are older than the TTL."""
+        link_graph.put("en", "some article", ["Foo", "Bar_baz"])
+        link_graph.put("en", "Empty", [])
+
+        assert link_graph.get("en", "Some_article") == ["Foo", "Bar_baz"]
+        assert link_graph.get("en", "Empty") == []
+        assert link_graph.get("hu", "Some_article") is None
+
+        with patch("src.link_graph.time.time", return_value=10**12):
+            assert link_graph.get("en", "Some_article") is None
+
+    def test_plan_expands_indexed_links_breadth_first(self, link_graph):
+        """A fully indexed graph plans every article with its shortest depth."""
+        index(link_graph, GRAPH)
+
+        crawl_plan = link_graph.plan("en", "Root", 3)
+
+        assert crawl_plan.complete
+        assert crawl_plan.depths == {"Root": 0, "A": 1, "B": 1, "C": 2, "D": 2}
+
+    def test_plan_reports_unindexed_articles(self, link_graph):
+        """Articles whose links are unknown bound what can be planned."""
+        link_graph.put("en", "Root", ["A", "B"])
+        link_graph.put("en", "A", ["C"])
+
+        crawl_plan = link_graph.plan("en", "Root", 3)
+
+        assert not crawl_plan.complete
+        assert crawl_plan.unknown == {"B"}
+        assert crawl_plan.size == 4
+
+    @pytest.mark.asyncio
+    async def test_traversal_indexes_links(self, link_graph, graph_counter):
+        """run() stores the links of every article it expanded."""
+        with patch("src.wiki_client.WIKIPEDIA_LANG", "en"):
+            wiki = graph_counter("Root", 3, GRAPH, link_graph=link_graph)
+            await wiki.run()
+
+        crawl_plan = link_graph.plan("en", "Root", 3)
+        assert crawl_plan.complete
+        assert crawl_plan.size == wiki.articles_processed
+
+    @pytest.mark.asyncio
+    async def test_indexed_links_skip_link_only_downloads(
+        self, link_graph, graph_counter
+    ):
+        """Re-expanding an article reached via a shorter path uses the index."""
+        latency = {"Slow": 0.2}
+        with patch("src.wiki_client.WIKIPEDIA_LANG", "en"):
+            unindexed = graph_counter("Root", 4, UPGRADE_GRAPH, latency)
+            await unindexed.run()
+            index(link_graph, UPGRADE_GRAPH)
+            indexed = graph_counter(
+                "Root", 4, UPGRADE_GRAPH, latency, link_graph=link_graph
+            )
+            await indexed.run()
+
+        fetched = [call.args[0] for call in indexed.get_article_source.call_args_list]
+        assert unindexed.get_article_source.call_count == 7  # X fetched twice
+        assert sorted(fetched) == ["Fast", "Mid", "Root", "Slow", "X", "Y"]
+        assert indexed.word_counter == unindexed.word_counter
+
+    def test_plan_endpoint(self, test_client, link_graph):
+        """/plan reports the planned visit set size, or 503 when disabled."""
+        assert test_client.get("/plan?article=Root&depth=2").status_code == 503
+
+        index(link_graph, GRAPH)
+        with (
+            patch.object(main, "link_graph", link_graph),
+            patch("main.WIKIPEDIA_LANG", "en"),
+        ):
+            response = test_client.get("/plan?article=root&depth=2")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "article": "Root",
+            "depth": 2,
+            "articles": 3,
+            "complete": True,
+            "unknown": 0,
+        }
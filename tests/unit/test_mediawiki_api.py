@@ -0,0 +1,206 @@
+import asyncio
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from src.http_client import create_http_client
+from src.mediawiki_api import ApiBatcher, ApiPage, fetch_pages
+from src.wiki_client import WikiFrequencyCounter
+
+GRAPH = {
+    "Root": ("root words here", ["Alpha", "Beta_page", "Gamma"]),
+    "Alpha": ("alpha words", ["Beta_page", "Delta"]),
+    "Beta_page": ("beta words", ["Root", "Delta", "Epsilon"]),
+    "Gamma": ("gamma", []),
+    "Delta": ("delta text", ["Alpha"]),
+    "Epsilon": ("epsilon text", ["Zeta"]),
+}
+
+
+@pytest.fixture
+def api_wiki(standin_wiki):
+    for title, (text, links) in GRAPH.items():
+        standin_wiki.add_article(title, text, links)
+    return standin_wiki
+
+
+def api_requests(wiki):
+    return [path for path, _ in wiki.requests if path.startswith("/w/api.php")]
+
+
+def parse_count(backend: str) -> float:
+    return (
+        REGISTRY.get_sample_value("wiki_parse_seconds_count", {"backend": backend})
+        or 0.0
+    )
+
+
+class TestMediaWikiApi:
+    """Test the batched MediaWiki Action API fetch backend."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_pages_follows_continuation(self, api_wiki):
+        """Revisions and links arriving over several responses are merged per title."""
+        api_wiki.revisions_per_response = 1
+        api_wiki.links_per_response = 2
+        api_wiki.redirects["Beta"] = "Beta page"
+        titles = ["Root", "alpha", "Beta", "Missing"]
+
+        async with create_http_client() as client:
+            pages = await fetch_pages(client, titles)
+            listed = await fetch_pages(client, titles, need_text=False)
+
+        assert pages["Root"].wikitext == api_wiki.wikitext("Root")
+        assert pages["alpha"].wikitext == api_wiki.wikitext("Alpha")
+        assert pages["Beta"].wikitext.startswith("beta words")
+        assert pages["Missing"] is None
+        assert listed["Root"].links == ["Alpha", "Beta_page", "Gamma"]
+        assert listed["alpha"].links == ["Beta_page", "Delta"]
+        assert listed["Beta"].links == ["Root", "Delta", "Epsilon"]
+        assert listed["Missing"] is None
+        assert len(api_requests(api_wiki)) == 3 + 4
+
+    @pytest.mark.asyncio
+    async def test_batcher_respects_titles_per_query(self):
+        """Concurrent loads are grouped into queries of at most titles_per_query."""
+        batches = []
+
+        async def query(titles):
+            batches.append(titles)
+            return {title: ApiPage(wikitext=title) for title in titles}
+
+        batcher = ApiBatcher(query, titles_per_query=2, window=0.01)
+        pages = await asyncio.gather(
+            *(batcher.load(title) for title in ["A", "B", "C", "D_e", "A"])
+        )
+
+        assert [page.wikitext for page in pages] == ["A", "B", "C", "D e", "A"]
+        assert batches == [["A", "B"], ["C", "D e"]]  # "A" joins the sent batch
+
+    @pytest.mark.asyncio
+    async def test_failed_query_fails_its_loads(self):
+        """A failed batch raises in every load instead of reporting missing pages."""
+
+        async def query(titles):
+            raise httpx.ConnectError("connection refused")
+
+        batcher = ApiBatcher(query, titles_per_query=2, window=0.01)
+        results = await asyncio.gather(
+            batcher.load("A"), batcher.load("B"), return_exceptions=True
+        )
+
+        assert all(isinstance(result, httpx.ConnectError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_api_backend_matches_html_backend(self, api_wiki):
+        """Both backends count the same words and follow the same links; the
+        API needs far fewer round-trips."""
+        html = WikiFrequencyCounter("Root", 3, backend="html")
+        html_result = await html.run()
+        html_requests = len(api_wiki.requests)
+
+        parses = parse_count("api")
+        api = WikiFrequencyCounter("Root", 3, backend="api")
+        api_result = await api.run()
+
+        assert api_result == html_result
+        assert parse_count("api") - parses == 6
+        assert api.articles_processed == html.articles_processed == 6
+        assert len(api_requests(api_wiki)) < html_requests
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown fetch backend"):
+            WikiFrequencyCounter("Root", 1, backend="ftp")
+
+
+class TestLinkListing:
+    """Test link discovery through link listings, separate from text fetches."""
+
+    @pytest.mark.asyncio
+    async def test_listing_matches_content_links(self, api_wiki):
+        """Listing mode visits the same articles and counts the same words."""
+        content = WikiFrequencyCounter("Root", 3)
+        content_result = await content.run()
+        api_wiki.requests.clear()
+
+        listing = WikiFrequencyCounter("Root", 3, link_discovery="listing")
+        listing_result = await listing.run()
+
+        assert listing_result == content_result
+        assert listing.articles_processed == content.articles_processed
+        assert api_requests(api_wiki)
+        assert all("revisions" not in path for path in api_requests(api_wiki))
+
+    @pytest.mark.asyncio
+    async def test_listing_runs_while_the_article_is_parsed(self, api_wiki):
+        """The listing arrives while the article is still being parsed; its
+        links are followed once the article is counted."""
+        events = []
+        wiki = WikiFrequencyCounter("Root", 2, link_discovery="listing")
+        list_links, extract = wiki._list_links, wiki._extract
+
+        async def recorded_list_links(article):
+            links = await list_links(article)
+            events.append(("listed", article))
+            return links
+
+        async def slow_extract(article, html_text, need_links):
+            if article == "Root":
+                await asyncio.sleep(0.3)
+            events.append(("parsed", article))
+            return await extract(article, html_text, need_links)
+
+        wiki._list_links = recorded_list_links
+        wiki._extract = slow_extract
+        await wiki.run()
+
+        assert events.index(("listed", "Root")) < events.index(("parsed", "Root"))
+        assert events.index(("parsed", "Root")) < events.index(("parsed", "Alpha"))
+
+    @pytest.mark.asyncio
+    async def test_listing_of_a_failed_article_is_not_followed(self, api_wiki):
+        """An article whose text cannot be fetched contributes no links, as
+        with content links, even though its listing succeeded."""
+        del api_wiki.pages["Root"]
+
+        wiki = WikiFrequencyCounter("Root", 3, link_discovery="listing")
+        result = await wiki.run()
+
+        assert result == {}
+        assert wiki.crawl_status()["articles_processed"] == 0
+        assert not any(path.startswith("/wiki/Alpha") for path, _ in api_wiki.requests)
+
+    @pytest.mark.asyncio
+    async def test_listing_includes_template_links(self, api_wiki):
+        """Link listings cannot drop navbox links like content links do, so a
+        listing crawl reaches the articles of templates too (documented)."""
+        api_wiki.add_article("Boxed", "boxed", ["Alpha"], navbox=["Gamma"])
+
+        content = WikiFrequencyCounter("Boxed", 2)
+        content_result = await content.run()
+        api = WikiFrequencyCounter("Boxed", 2, backend="api")
+        api_result = await api.run()
+        listing = WikiFrequencyCounter("Boxed", 2, link_discovery="listing")
+        listing_result = await listing.run()
+
+        assert api_result == content_result
+        assert content.articles_processed == api.articles_processed == 2
+        assert listing.articles_processed == 3
+        assert "gamma" in listing_result and "gamma" not in content_result
+
+    @pytest.mark.asyncio
+    async def test_listing_filters_like_html_links(self, api_wiki):
+        """Namespaced titles are dropped from listings as from article HTML."""
+        api_wiki.add_article(
+            "Mixed", "mixed", ["File:Map.png", "Category:Things", "Alpha"]
+        )
+        wiki = WikiFrequencyCounter("Mixed", 2, link_discovery="listing")
+        await wiki._open_client()
+        try:
+            links = await wiki._list_links("Mixed")
+        finally:
+            await wiki._close_client()
+
+        html_links = WikiFrequencyCounter("Mixed", 2).extract_words_and_links(
+            api_wiki.pages["Mixed"], True
+        )[1]
+        assert links == html_links == ["Alpha"]
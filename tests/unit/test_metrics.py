@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from main import app
+from src.wiki_client import WikiFrequencyCounter
+from tests.conftest import graph_page
+
+GRAPH = {"Root": ["A", "B"], "A": ["C"], "B": [], "C": []}
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Test the Prometheus metrics of the crawl and parse hot paths."""
+
+    @pytest.mark.asyncio
+    async def test_traversal_observes_histograms_and_gauges(self, graph_counter):
+        parses = sample("wiki_parse_seconds_count", backend="html")
+        before = {
+            name: sample(name)
+            for name in (
+                "wiki_article_words_sum",
+                "wiki_article_bytes_count",
+                "wiki_traversal_articles_sum",
+            )
+        }
+        wiki = graph_counter("Root", 3, GRAPH, latency={"C": 0.2})
+        run = asyncio.create_task(wiki.run())
+        await asyncio.sleep(0.1)
+        during = {
+            name: sample(name)
+            for name in ("wiki_traversals_in_progress", "wiki_fetches_in_flight")
+        }
+        await run
+
+        assert during == {
+            "wiki_traversals_in_progress": 1,
+            "wiki_fetches_in_flight": 1,
+        }
+        assert sample("wiki_traversals_in_progress") == 0
+        assert sample("wiki_parse_seconds_count", backend="html") - parses == len(GRAPH)
+        # Each page holds its title and a "link" per outbound link
+        words = sum(1 + len(links) for links in GRAPH.values())
+        assert (
+            sample("wiki_article_words_sum") - before["wiki_article_words_sum"] == words
+        )
+        assert sample("wiki_article_bytes_count") - before[
+            "wiki_article_bytes_count"
+        ] == len(GRAPH)
+        assert sample("wiki_traversal_articles_sum") - before[
+            "wiki_traversal_articles_sum"
+        ] == len(GRAPH)
+
+    @pytest.mark.asyncio
+    async def test_fetch_latency_and_errors_by_status(self, standin_wiki):
+        standin_wiki.pages["Root"] = graph_page("Root", ["Missing"])
+        fetches = sample("wiki_fetch_seconds_count", backend="html")
+        not_found = sample("wiki_http_errors_total", status="404")
+
+        await WikiFrequencyCounter("Root", 2).run()
+
+        assert sample("wiki_fetch_seconds_count", backend="html") - fetches == 2
+        assert sample("wiki_http_errors_total", status="404") - not_found == 1
+
+    def test_metrics_endpoint(self, sample_frequency_table):
+        with patch(
+            "src.wiki_client.WikiFrequencyCounter.traverse",
+            new_callable=AsyncMock,
+            return_value=sample_frequency_table,
+        ):
+            client = TestClient(app)
+            client.get("/word-frequency?article=Python&depth=1")
+            client.get("/word-frequency?article=Python&depth=1")
+            response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE wiki_fetch_seconds histogram" in response.text
+        assert "wiki_frontier_size" in response.text
+        assert 'wiki_cache_events_total{cache="result",event="fresh_hits"}' in (
+            response.text
+        )
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from src.frequency import FrequencyTable
+from src.pagination import PageQuery, decode_cursor, encode_cursor, paginate
+
+
+@pytest.fixture
+def tied_table():
+    """Many words sharing few distinct counts, so selection hits ties."""
+    rng = np.random.default_rng(7)
+    counts = rng.integers(1, 6, 500)
+    words = [f"w{index:03d}" for index in rng.permutation(500)]
+    return FrequencyTable(words, counts, int(counts.sum()))
+
+
+class TestPagination:
+    """Test partial top-k selection and cursor pagination."""
+
+    @pytest.mark.parametrize("sort", [None, "count", "word"])
+    @pytest.mark.parametrize("k", [0, 1, 37, 499, 500, 600])
+    def test_first_is_prefix_of_full_order(self, tied_table, sort, k):
+        expected = tied_table.order(sort)[:k]
+        assert tied_table.first(k, sort).tolist() == expected.tolist()
+
+    def test_cursor_pages_cover_result_once(self, tied_table):
+        """Following next cursors yields the sorted, filtered result exactly once."""
+        query, rows, matching = PageQuery("count", 2, 0, 64), [], None
+        while True:
+            page = paginate(tied_table, query)
+            rows.extend(page.table.words)
+            matching = page.matching
+            if page.next_cursor is None:
+                break
+            fingerprint, query = decode_cursor(page.next_cursor)
+            assert fingerprint == tied_table.fingerprint
+
+        expected = tied_table.select(tied_table.counts >= 2).order("count")
+        assert len(rows) == matching == len(expected)
+        assert rows == [
+            tied_table.select(tied_table.counts >= 2).words[i] for i in expected
+        ]
+
+    def test_malformed_cursor_rejected(self):
+        valid = encode_cursor("abc", PageQuery(offset=5))
+        assert decode_cursor(valid) == ("abc", PageQuery(offset=5))
+
+        for cursor in ["", "not a cursor", valid[:-3], encode_cursor(1, PageQuery())]:
+            with pytest.raises(ValueError):
+                decode_cursor(cursor)
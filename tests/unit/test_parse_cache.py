@@ -0,0 +1,75 @@
+import pytest
+from collections import Counter
+from unittest.mock import AsyncMock, patch
+from src.parse_cache import ParseCache, article_version
+from src.wiki_client import WikiFrequencyCounter
+
+
+class TestParseCache:
+    """Test memoization of per-article parse results."""
+
+    def test_article_version_prefers_revision_id(self, gyorzamoly_html):
+        """The MediaWiki revision id is used when present, else a content hash."""
+        assert article_version(gyorzamoly_html) == "rev:27796152"
+        assert article_version("<p>no revision</p>").startswith("sha1:")
+
+    def test_entry_without_links_misses_when_links_needed(self):
+        """A leaf-level parse cannot serve a lookup that needs links."""
+        cache = ParseCache(max_entries=10)
+        cache.put(("A", "rev:1"), Counter(a=1), None)
+
+        assert cache.get(("A", "rev:1"), need_links=False) == (Counter(a=1), [])
+        assert cache.get(("A", "rev:1"), need_links=True) is None
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        cache = ParseCache(max_entries=2)
+        cache.put(("A", "1"), Counter(a=1), [])
+        cache.put(("B", "1"), Counter(b=1), [])
+        cache.get(("A", "1"), need_links=False)
+        cache.put(("C", "1"), Counter(c=1), [])
+
+        assert cache.get(("B", "1"), need_links=False) is None
+        assert cache.get(("A", "1"), need_links=False) is not None
+        assert len(cache) == 2
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Results written to the SQLite tier are found by a new cache instance."""
+        path = str(tmp_path / "parse.sqlite")
+        ParseCache(max_entries=10, path=path).put(
+            ("A", "rev:1"), Counter(word=3), ["Link"]
+        )
+
+        cache = ParseCache(max_entries=10, path=path)
+        assert cache.get(("A", "rev:1"), need_links=True) == (
+            Counter(word=3),
+            ["Link"],
+        )
+        assert cache.stats["disk_hits"] == 1
+
+    def test_memory_lookup_leaves_disk_misses_to_the_disk_lookup(self, tmp_path):
+        path = str(tmp_path / "parse.sqlite")
+        ParseCache(max_entries=10, path=path).put(("A", "rev:1"), Counter(a=1), [])
+
+        cache = ParseCache(max_entries=10, path=path)
+        assert cache.get(("A", "rev:1"), need_links=True, disk=False) is None
+        assert cache.get(("A", "rev:1"), need_links=True) == (Counter(a=1), [])
+        assert cache.get(("A", "rev:1"), need_links=True, disk=False) is not None
+        assert cache.stats == {"hits": 2, "disk_hits": 1, "misses": 0, "evictions": 0}
+
+    @pytest.mark.asyncio
+    async def test_process_article_skips_parsing_on_hit(self, gyorzamoly_html):
+        """A warm cache serves process_article without calling the extractor."""
+        cache = ParseCache(max_entries=10)
+        first = WikiFrequencyCounter("Győrzámoly", 1, parse_cache=cache)
+        first.get_article_source = AsyncMock(return_value=gyorzamoly_html)
+        await first.process_article("Győrzámoly", 0)
+
+        second = WikiFrequencyCounter("Győrzámoly", 1, parse_cache=cache)
+        second.get_article_source = AsyncMock(return_value=gyorzamoly_html)
+        with patch.object(second, "extract_words_and_links") as mock_extract:
+            await second.process_article("Győrzámoly", 0)
+
+        mock_extract.assert_not_called()
+        assert second.word_counter == first.word_counter
+        assert cache.stats["hits"] == 1
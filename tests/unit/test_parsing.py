@@ -0,0 +1,35 @@
+import pytest
+from src.extraction import expand_compact, extract_compact, extract_words_and_links
+from src.parsing import ParserEngine
+
+
+class TestParserEngine:
+    """Test the pluggable parsing backends produce identical results."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", ["inline", "thread", "process"])
+    async def test_backends_match_direct_extraction(self, backend, gyorzamoly_html):
+        """Every backend returns the same words and links as a direct call."""
+        expected_words, expected_links = extract_words_and_links(gyorzamoly_html, True)
+
+        engine = ParserEngine(backend, workers=2)
+        try:
+            words, links = await engine.parse(gyorzamoly_html, True)
+        finally:
+            engine.shutdown()
+
+        assert words == expected_words
+        assert sorted(links) == sorted(expected_links)
+
+    def test_compact_round_trip(self, msci_html):
+        """The compact (words, counts) transport format rebuilds the same Counter."""
+        expected, _ = extract_words_and_links(msci_html, False)
+        words, counts, links = extract_compact(msci_html, False)
+
+        assert expand_compact(words, counts) == expected
+        assert links == []
+
+    def test_unknown_backend_rejected(self):
+        """Unknown backend names fail fast."""
+        with pytest.raises(ValueError):
+            ParserEngine("gpu")
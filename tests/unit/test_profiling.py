@@ -0,0 +1,97 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.profiling import NO_PHASE, SamplingProfiler
+from src.sharding import ShardPool
+from src.wiki_client import WikiFrequencyCounter
+from tests.conftest import graph_page
+
+GRAPH = {"Root": ["A", "B"], "A": [], "B": []}
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+async def slow_source(self, article):
+    await asyncio.sleep(0.02)
+    return graph_page(article, GRAPH.get(article, []))
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestProfiling:
+    """Test admin-gated per-request profiling."""
+
+    @pytest.mark.parametrize("token", ["", "secret"])
+    def test_profile_requires_the_admin_token(self, token):
+        with patch("main.ADMIN_TOKEN", token):
+            response = TestClient(app).get(
+                "/word-frequency?article=Root&depth=1&profile=true",
+                headers={"X-Admin-Token": "wrong"},
+            )
+        assert response.status_code == 403
+
+    def test_profiled_request_reports_phases_and_stores_stacks(self):
+        with (
+            patch("main.ADMIN_TOKEN", "secret"),
+            patch("main.PROFILE_INTERVAL", 0.001),
+            patch(
+                "src.wiki_client.WikiFrequencyCounter.get_article_source", slow_source
+            ),
+        ):
+            client = TestClient(app)
+            profiled = client.get(
+                "/word-frequency?article=Root&depth=2&profile=true", headers=ADMIN
+            )
+            plain = client.get("/word-frequency?article=Root&depth=2")
+            profile_id = profiled.headers["X-Profile-Id"]
+            summary = client.get(f"/profiles/{profile_id}", headers=ADMIN).json()
+            stacks = client.get(f"/profiles/{profile_id}/stacks", headers=ADMIN)
+            forbidden = client.get(f"/profiles/{profile_id}")
+
+        assert profiled.json() == plain.json()
+        assert plain.headers["X-Cache"] == "HIT"  # the profiled run was cached
+        assert "X-Profile-Id" not in plain.headers
+        assert "parse;dur=" in profiled.headers["Server-Timing"]
+        assert summary["samples"] > 0
+        assert summary["phases"]["parse"] > 0 and summary["phases"]["merge"] > 0
+        assert "attachment" in stacks.headers["Content-Disposition"]
+        assert all(
+            line.rsplit(" ", 1)[1].isdigit() for line in stacks.text.splitlines()
+        )
+        assert "traverse" in stacks.text
+        assert forbidden.status_code == 403
+
+    def test_profiled_traversals_are_not_sharded(self):
+        with (
+            patch("main.ADMIN_TOKEN", "secret"),
+            patch("main.shard_pool", ShardPool(2)),  # unstarted: any crawl fails
+            patch("main.CRAWL_SHARD_MIN_DEPTH", 1),
+            patch(
+                "src.wiki_client.WikiFrequencyCounter.get_article_source", slow_source
+            ),
+        ):
+            profiled = TestClient(app).get(
+                "/word-frequency?article=Root&depth=2&profile=true", headers=ADMIN
+            )
+
+        assert profiled.status_code == 200
+        assert "parse;dur=" in profiled.headers["Server-Timing"]
+
+    def test_unprofiled_counters_skip_phase_timing(self):
+        wiki = WikiFrequencyCounter("Root", 1)
+        assert wiki.phases is None
+        assert wiki._phase("parse") is NO_PHASE
+
+    def test_sampler_collapses_stacks_per_thread(self):
+        with SamplingProfiler(0.001) as profiler:
+            busy_wait(0.05)
+
+        assert profiler.samples > 0
+        busy = [stack for stack in profiler.stacks if "busy_wait" in stack]
+        assert busy and all(stack.startswith("MainThread;") for stack in busy)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+import main
+from src.result_cache import ResultCache
+
+
+@pytest.fixture
+def clock():
+    """Controllable monotonic clock for the result cache."""
+    now = [1000.0]
+    with patch("src.result_cache.time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+class TestResultCache:
+    """Test the TTL and memory-bounded result cache."""
+
+    def test_fresh_stale_and_expired(self, clock):
+        """Entries go from fresh to stale to expired."""
+        cache = ResultCache(ttl=10, max_bytes=10_000, stale_ttl=5)
+        cache.put("key", "value", 100)
+
+        assert cache.get("key") == ("value", "fresh")
+        clock[0] += 12
+        assert cache.get("key") == ("value", "stale")
+        clock[0] += 5
+        assert cache.get("key") == (None, None)
+        assert len(cache) == 0
+
+    def test_eviction_by_estimated_size(self):
+        """Eviction is driven by total size, least recently used first."""
+        cache = ResultCache(ttl=60, max_bytes=1000)
+        cache.put("a", "A", 400)
+        cache.put("b", "B", 400)
+        cache.get("a")
+        cache.put("c", "C", 400)
+
+        assert cache.get("b") == (None, None)
+        assert cache.get("a")[0] == "A"
+        assert cache.total_bytes == 800
+
+    def test_estimated_size_grows_with_vocabulary(self, sample_frequency_table):
+        """Bigger results are estimated as bigger."""
+        small = sample_frequency_table.select(np.arange(10) < 2)
+        assert sample_frequency_table.nbytes > small.nbytes > 0
+
+    def test_repeated_request_is_served_from_cache(
+        self, test_client, sample_frequency_table
+    ):
+        """The second identical request, and /keywords on it, skip the traversal."""
+        with patch(
+            "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
+        ) as mock_run:
+            mock_run.return_value = sample_frequency_table
+
+            first = test_client.get("/word-frequency?article=Python&depth=1")
+            second = test_client.get("/word-frequency?article=python&depth=1")
+            keywords = test_client.post(
+                "/keywords",
+                json={"article": "Python", "depth": 1, "percentile": 90},
+            )
+
+            assert first.headers["X-Cache"] == "MISS"
+            assert second.headers["X-Cache"] == "HIT"
+            assert keywords.headers["X-Cache"] == "HIT"
+            assert second.json() == first.json()
+            assert "python" in keywords.json()
+            assert mock_run.call_count == 1
+
+    def test_partial_results_are_not_cached(self, test_client, sample_frequency_table):
+        """Budget-limited results are never stored."""
+
+        async def partial_run(self):
+            self.complete = False
+            return sample_frequency_table
+
+        with patch("src.wiki_client.WikiFrequencyCounter.traverse", partial_run):
+            test_client.get("/word-frequency?article=Python&depth=2&max_articles=1")
+
+        assert len(main.result_cache) == 0
+
+    def test_stale_while_revalidate(self, test_client, sample_frequency_table, clock):
+        """A stale entry is served immediately and refreshed in the background."""
+        with (
+            patch.object(main.result_cache, "stale_ttl", 60),
+            patch(
+                "src.wiki_client.WikiFrequencyCounter.traverse", new_callable=AsyncMock
+            ) as mock_run,
+        ):
+            mock_run.return_value = sample_frequency_table
+            test_client.get("/word-frequency?article=Python&depth=1")
+            clock[0] += main.result_cache.ttl + 1
+
+            stale = test_client.get("/word-frequency?article=Python&depth=1")
+
+            assert stale.headers["X-Cache"] == "STALE"
+            assert stale.json() == sample_frequency_table.to_dict()
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.instrumentation import SlotMonitor
+
+
+def _bfs_visit_set(root: str, depth: int, graph: dict[str, list[str]]) -> set[str]:
+    """Reference level-synchronous traversal (the previous run() semantics)."""
+    visited, level = set(), [root]
+    for _ in range(depth):
+        level = [a for a in dict.fromkeys(level) if a not in visited]
+        visited.update(level)
+        level = [link for a in level if a in graph for link in graph[a]]
+    return {a for a in visited if a in graph}
+
+
+class TestPipelinedScheduler:
+    """Test the work-queue scheduler keeps breadth-first depth semantics."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "latency",
+        [{"Slow": 0.2}, {"Slow": 0.1, "Shared": 0.3}],
+        ids=["after-leaf-finished", "while-leaf-in-flight"],
+    )
+    async def test_shallower_rediscovery_is_expanded(self, graph_counter, latency):
+        """An article first reached at the leaf level via a fast path is
+        re-expanded when a slow path later reaches it one level shallower."""
+        graph = {
+            "Root": ["Slow", "Fast"],
+            "Slow": ["Shared"],
+            "Fast": ["Middle"],
+            "Middle": ["Shared"],
+            "Shared": ["Deep"],
+            "Deep": [],
+        }
+        wiki = graph_counter("Root", 4, graph, latency)
+
+        result = await wiki.run()
+
+        assert "deep" in result
+        assert set(result) - {"link"} == {
+            a.lower() for a in _bfs_visit_set("Root", 4, graph)
+        }
+        assert result["shared"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_matches_level_synchronous_bfs(self, graph_counter):
+        """On a denser graph with failures the visit set matches BFS exactly."""
+        titles = [f"Page{chr(ord('a') + i)}" for i in range(12)]
+        graph = {
+            title: [titles[(i * 5 + k) % 12] for k in (1, 2, 3)]
+            for i, title in enumerate(titles)
+            if i != 7
+        }
+        latency = {title: 0.001 * ((i * 7) % 5) for i, title in enumerate(titles)}
+
+        for depth in (1, 2, 3):
+            wiki = graph_counter("Pagea", depth, graph, latency)
+            result = await wiki.run()
+            expected = _bfs_visit_set("Pagea", depth, graph)
+            assert set(result) - {"link"} == {a.lower() for a in expected}
+            assert sum(wiki.level_counts.values()) == len(expected)
+
+    @pytest.mark.asyncio
+    async def test_worker_failure_is_raised(self, graph_counter):
+        """An unexpected error in a worker aborts the run instead of hanging."""
+        wiki = graph_counter("Root", 2, {"Root": ["Other"]}, {})
+
+        with patch.object(
+            wiki, "extract_words_and_links", side_effect=RuntimeError("boom")
+        ):
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(wiki.run(), timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_reports_slot_utilization(self, graph_counter):
+        """Slot utilization is measured over the run."""
+        graph = {"Root": [f"Child{c}" for c in "abcdefgh"]}
+        graph.update({f"Child{c}": [] for c in "abcdefgh"})
+        wiki = graph_counter("Root", 2, graph, {})
+
+        await wiki.run()
+
+        assert 0 < wiki.slot_monitor.utilization() <= 1
+        assert wiki.slot_monitor.peak <= wiki.slot_monitor.capacity
+
+    def test_utilization_follows_the_current_limit(self):
+        """Busy slots are weighed against the limit in force at the time."""
+        clock, limit = [0.0], [2]
+        with patch("src.instrumentation.time.monotonic", lambda: clock[0]):
+            monitor = SlotMonitor(lambda: limit[0])
+            monitor.acquired()
+            monitor.acquired()
+            clock[0] = 1.0  # 2 of 2 slots busy for 1s
+            limit[0] = 8
+            monitor.released()
+            clock[0] = 2.0  # 1 of 8 slots busy for 1s
+
+            assert monitor.utilization() == pytest.approx(3 / 10)
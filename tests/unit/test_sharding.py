@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+import main
+from main import app
+from src.budget import CrawlBudget
+from src.sharding import ShardedCrawl, ShardPool, shard_of
+from src.wiki_client import WikiFrequencyCounter
+from tests.conftest import graph_page
+
+# Cycles, a shortcut to a deeper article and a link to a missing one
+GRAPH = {
+    "Root": ["A", "B", "C"],
+    "A": ["D", "Root", "Missing"],
+    "B": ["D", "E"],
+    "C": ["F", "B"],
+    "D": ["G"],
+    "E": ["A"],
+    "F": ["G", "H"],
+    "G": [],
+    "H": ["Root"],
+}
+
+
+def serve_graph(standin_wiki) -> None:
+    for title, links in GRAPH.items():
+        standin_wiki.pages[title] = graph_page(title, links)
+
+
+class TestSharding:
+    """Test crawls sharded across worker processes."""
+
+    def test_titles_have_one_stable_owner(self):
+        owners = [shard_of(f"Article_{index}", 4) for index in range(1000)]
+
+        assert owners == [shard_of(f"Article_{index}", 4) for index in range(1000)]
+        assert set(owners) == {0, 1, 2, 3}
+
+    @pytest.mark.asyncio
+    async def test_crawl_level_skips_articles_seen_in_earlier_rounds(
+        self, graph_counter
+    ):
+        wiki = graph_counter("Root", 3, GRAPH)
+
+        first = await wiki.crawl_level(["Root"], 0)
+        second = await wiki.crawl_level(["A", "B", "B", "Root", "Missing"], 1)
+        last = await wiki.crawl_level(["D"], 2)
+
+        assert sorted(first) == ["A", "B", "C"]
+        assert sorted(second) == ["D", "D", "E", "Missing", "Root"]
+        assert last == []  # the deepest level collects no links
+        assert wiki.get_article_source.await_count == 5
+        assert wiki.crawl_status()["articles_processed"] == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("depth", [1, 3])
+    async def test_sharded_crawl_matches_single_process(self, standin_wiki, depth):
+        serve_graph(standin_wiki)
+        single = WikiFrequencyCounter("Root", depth)
+        async with ShardPool(3) as pool:
+            sharded = ShardedCrawl("Root", depth, pool)
+
+            assert await sharded.run() == await single.run()
+        assert sharded.crawl_status() == single.crawl_status()
+        assert sharded.progress()["articles_done"] == single.articles_processed
+
+    @pytest.mark.asyncio
+    async def test_pool_serves_crawls_one_after_another(self, standin_wiki):
+        serve_graph(standin_wiki)
+        async with ShardPool(2) as pool:
+            processes = list(pool._processes)
+            first, second = ShardedCrawl("Root", 2, pool), ShardedCrawl("C", 2, pool)
+            results = await asyncio.gather(first.run(), second.run())
+
+            assert pool._processes == processes  # no process was replaced
+        assert results[0] == await WikiFrequencyCounter("Root", 2).run()
+        assert results[1] == await WikiFrequencyCounter("C", 2).run()
+
+    @pytest.mark.asyncio
+    async def test_pool_is_replaced_after_a_shard_dies(self, standin_wiki):
+        serve_graph(standin_wiki)
+        async with ShardPool(2) as pool:
+            pool._processes[0].kill()
+            with pytest.raises(RuntimeError, match="exited unexpectedly"):
+                await ShardedCrawl("Root", 2, pool).run()
+
+            assert await ShardedCrawl("Root", 2, pool).run()
+
+    def test_requests_run_sharded_when_configured(self, standin_wiki):
+        serve_graph(standin_wiki)
+        with patch("main.CRAWL_SHARDS", 2), TestClient(app) as client:
+            response = client.get("/word-frequency?article=Root&depth=4")
+
+        expected = sum(1 + len(links) for links in GRAPH.values())
+        assert response.status_code == 200
+        assert sum(row["count"] for row in response.json().values()) == expected
+        assert "X-Trace-Id" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_only_deep_traversals_on_an_idle_pool_are_sharded(self):
+        pool = ShardPool(2)  # never started; only its lock is consulted
+        with patch("main.shard_pool", pool), patch("main.CRAWL_SHARD_MIN_DEPTH", 3):
+            assert main._shardable(3, None)
+            assert not main._shardable(2, None)
+            assert not main._shardable(4, CrawlBudget(max_articles=10))
+            async with pool.lock:
+                assert not main._shardable(4, None)
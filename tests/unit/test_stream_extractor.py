@@ -0,0 +1,53 @@
+import pytest
+from src.extraction import extract_words_and_links
+from src.parsing import ParserEngine
+from src.stream_extractor import stream_extract_words_and_links
+
+
+class TestStreamExtractor:
+    """Test the streaming lxml extractor against the BeautifulSoup pipeline."""
+
+    @pytest.mark.parametrize("fixture", ["gyorzamoly_html", "msci_html"])
+    @pytest.mark.parametrize("need_links", [True, False])
+    def test_matches_soup_pipeline(self, fixture, need_links, request):
+        """Words and links are identical to the BeautifulSoup extractor."""
+        html = request.getfixturevalue(fixture)
+
+        expected_words, expected_links = extract_words_and_links(html, need_links)
+        words, links = stream_extract_words_and_links(html, need_links)
+
+        assert words == expected_words
+        assert sorted(links) == sorted(expected_links)
+
+    def test_skips_excluded_subtrees(self):
+        """Tables drop text but keep links; excluded classes drop both."""
+        html = """
+        <div id="mw-content-text">
+            <p>Kept text <a href="/wiki/Kept">kept</a></p>
+            <table><tr><td>tabletext <a href="/wiki/InTable">x</a></td></tr></table>
+            <div class="navbox-inner"><a href="/wiki/InNavbox">navboxtext</a></div>
+            <script>scripttext</script>
+        </div>
+        <p>outside</p>
+        """
+        words, links = stream_extract_words_and_links(html, True)
+
+        assert set(words) == {"kept", "text"}
+        assert sorted(links) == ["InTable", "Kept"]
+
+    def test_missing_content_div(self):
+        """Pages without mw-content-text yield nothing."""
+        assert stream_extract_words_and_links("<p>no content</p>", True) == (
+            {},
+            [],
+        )
+
+    @pytest.mark.asyncio
+    async def test_selectable_in_parser_engine(self, msci_html):
+        """The parser engine runs the extractor chosen by name."""
+        engine = ParserEngine("inline", extractor="stream")
+        words, _ = await engine.parse(msci_html, False)
+
+        assert words == extract_words_and_links(msci_html, False)[0]
+        with pytest.raises(ValueError):
+            ParserEngine("inline", extractor="regex")
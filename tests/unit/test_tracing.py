@@ -0,0 +1,135 @@
+import json
+import httpx
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from main import app
+from src.tracing import CrawlTrace, export_otlp
+from src.wiki_client import WikiFrequencyCounter
+from tests.conftest import graph_page
+
+GRAPH = {"Root": ["A", "B"], "A": ["C"], "B": [], "C": []}
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+class TestTracing:
+    """Test per-article crawl traces and their export."""
+
+    @pytest.mark.asyncio
+    async def test_traversal_records_nested_spans_per_article(self, standin_wiki):
+        for title, links in GRAPH.items():
+            standin_wiki.pages[title] = graph_page(title, links)
+        trace = CrawlTrace(1000)
+
+        await WikiFrequencyCounter("Root", 3, trace=trace).run()
+
+        spans = {span.span_id: span for span in trace.spans}
+        articles = {
+            span.attrs["article"]: span
+            for span in spans.values()
+            if span.name == "article"
+        }
+        assert set(articles) == set(GRAPH)
+        assert articles["C"].attrs["depth"] == 2
+        assert articles["Root"].attrs["bytes"] == len(graph_page("Root", GRAPH["Root"]))
+        assert all(span.lane > 0 for span in articles.values())
+        for span in articles.values():
+            children = [
+                child.name
+                for child in spans.values()
+                if child.parent_id == span.span_id
+            ]
+            assert children == ["slot_wait", "fetch", "parse", "merge"]
+        (root,) = [span for span in spans.values() if span.name == "traverse"]
+        assert {span.parent_id for span in articles.values()} == {root.span_id}
+        assert root.attrs["articles"] == len(GRAPH)
+        queued = [
+            span.attrs["article"] for span in spans.values() if span.name == "queued"
+        ]
+        assert sorted(queued) == sorted(GRAPH)
+        assert trace.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_keeps_the_latest_spans(self, graph_counter):
+        trace = CrawlTrace(5)
+        wiki = graph_counter("Root", 3, GRAPH, trace=trace)
+
+        await wiki.run()
+
+        assert len(trace.spans) == 5
+        assert trace.dropped > 0
+        assert trace.spans[-1].name == "traverse"
+
+    @pytest.mark.asyncio
+    async def test_chrome_and_otlp_exports(self, graph_counter):
+        trace = CrawlTrace(1000)
+        await graph_counter("Root", 2, GRAPH, trace=trace).run()
+
+        chrome = json.loads(json.dumps(trace.chrome()))
+        events = chrome["traceEvents"]
+        lanes = {event["args"]["name"] for event in events if event["ph"] == "M"}
+        assert "traversal" in lanes and "worker 1" in lanes
+        assert all("dur" in event for event in events if event["ph"] == "X")
+        assert {event["name"] for event in events if event["ph"] == "i"} == {"queued"}
+
+        otlp = json.loads(json.dumps(trace.otlp()))
+        spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert len(spans) == len(trace.spans)
+        assert all(span["traceId"] == trace.id for span in spans)
+        span_ids = {span["spanId"] for span in spans}
+        assert all(
+            span["parentSpanId"] in span_ids for span in spans if "parentSpanId" in span
+        )
+        attributes = [
+            {attribute["key"]: attribute["value"] for attribute in span["attributes"]}
+            for span in spans
+            if span["name"] == "article"
+        ]
+        root = next(
+            attrs for attrs in attributes if attrs["article"]["stringValue"] == "Root"
+        )
+        assert root["depth"] == {"intValue": "0"}
+
+    @pytest.mark.asyncio
+    async def test_export_posts_to_the_collector(self):
+        trace = CrawlTrace(10)
+        with trace.span("traverse", article="Root"):
+            pass
+        received = []
+
+        def collector(request: httpx.Request) -> httpx.Response:
+            received.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(200)
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(collector)
+        ) as client:
+            await export_otlp(client, "http://collector:4318/", trace)
+
+        assert received == [("/v1/traces", trace.otlp())]
+
+    def test_responses_name_their_trace(self):
+        async def source(self, article):
+            return graph_page(article, GRAPH.get(article, []))
+
+        with (
+            patch("main.ADMIN_TOKEN", "secret"),
+            patch("src.wiki_client.WikiFrequencyCounter.get_article_source", source),
+        ):
+            client = TestClient(app)
+            response = client.get("/word-frequency?article=Root&depth=3")
+            cached = client.get("/word-frequency?article=Root&depth=3")
+            trace_id = response.headers["X-Trace-Id"]
+            chrome = client.get(f"/traces/{trace_id}", headers=ADMIN)
+            otlp = client.get(f"/traces/{trace_id}?format=otlp", headers=ADMIN)
+            forbidden = client.get(f"/traces/{trace_id}")
+            missing = client.get("/traces/unknown", headers=ADMIN)
+
+        assert cached.headers["X-Cache"] == "HIT"
+        assert "X-Trace-Id" not in cached.headers  # it ran no traversal
+        names = [event["name"] for event in chrome.json()["traceEvents"]]
+        assert names.count("article") == len(GRAPH)
+        assert "attachment" in chrome.headers["Content-Disposition"]
+        assert otlp.json()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert forbidden.status_code == 403
+        assert missing.status_code == 404
@@ -0,0 +1,70 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from src.crawl_state import CrawlState
+from src.vocabulary import Vocabulary, WordCounts
+from src.wiki_client import WikiFrequencyCounter
+
+ARTICLES = [
+    Counter({"the": 5, "wiki": 2, "python": 1}),
+    Counter({"the": 3, "snake": 4}),
+    Counter({"python": 2, "language": 1, "the": 1}),
+]
+
+
+class TestVocabulary:
+    """Test word interning and array-backed word counts."""
+
+    def test_interning_gives_stable_ids_and_one_string(self):
+        vocabulary = Vocabulary()
+        first_ids, _ = vocabulary.encode(Counter({"alpha": 1, "beta": 2}))
+        second_ids, counts = vocabulary.encode(Counter({"beta": 3, "gamma": 1}))
+
+        assert first_ids.tolist() == [0, 1]
+        assert second_ids.tolist() == [1, 2]
+        assert counts.tolist() == [3, 1]
+        assert vocabulary.decode(np.array([2, 0])) == ["gamma", "alpha"]
+        assert len(vocabulary) == 3
+
+    def test_word_counts_match_counter_sum(self):
+        """Adding, growing and subtracting behaves like summing Counters."""
+        vocabulary = Vocabulary()
+        word_counts = WordCounts(vocabulary)
+        for word_counter in ARTICLES:
+            word_counts.add(*vocabulary.encode(word_counter))
+        ids, counts = vocabulary.encode(ARTICLES[1])
+        word_counts.add(ids, -counts)
+
+        expected = ARTICLES[0] + ARTICLES[2]
+        assert word_counts == dict(expected)
+        assert word_counts.total() == expected.total()
+        assert "snake" not in word_counts
+        assert "unknown" not in word_counts
+
+    def test_frequency_is_identical_to_counter_path(self):
+        wiki = WikiFrequencyCounter("Test", 1)
+        counter_total = Counter()
+        for word_counter in ARTICLES:
+            wiki.word_counter += word_counter
+            counter_total += word_counter
+        array_frequency = wiki.calculate_frequency()
+
+        wiki.word_counter = counter_total
+        assert array_frequency == wiki.calculate_frequency()
+
+    @pytest.mark.asyncio
+    async def test_traversals_intern_into_their_own_vocabulary(self, graph_counter):
+        """Counts are sized by the traversal's own words; a crawl state keeps
+        the vocabulary its levels refer to, and results do not keep any."""
+        graph = {"Root": ["A"], "A": []}
+        state = CrawlState()
+        first = graph_counter("Root", 1, graph)
+        table = await first.traverse()
+        resumed = graph_counter("Root", 2, graph, state=state)
+        await resumed.traverse()
+
+        assert first.vocabulary is not resumed.vocabulary
+        assert resumed.vocabulary is state.vocabulary
+        assert len(first.vocabulary) == len(table)
+        assert not hasattr(table, "vocabulary") and table.lowercase
@@ -2,6 +2,10 @@
 
 import logging
 
+import numpy as np
+
+from src.frequency import FrequencyTable
+
 
 def filter_by_ignore_list(
     frequency_dict: dict[str, dict[str, float | int]], ignore_list: list[str]
@@ -68,25 +72,26 @@ def filter_by_percentile(
     if not frequency_dict:
         return {}
 
-    # Extract and sort all percentage values
-    percentages = sorted([stats["percentage"] for stats in frequency_dict.values()])
-
-    # Calculate percentile index
-    n = len(percentages)
-
     if percentile == 0:
         return frequency_dict.copy()
 
+    percentages = np.fromiter(
+        (stats["percentage"] for stats in frequency_dict.values()),
+        dtype=np.float64,
+        count=len(frequency_dict),
+    )
+    n = len(percentages)
+
     if percentile == 100:
         # Keep only words at maximum percentage
-        max_percentage = max(percentages)
-        threshold = max_percentage
+        threshold = float(percentages.max())
     else:
-        # Calculate threshold at the given percentile
+        # Threshold at the given position of the sorted percentages; a
+        # partition finds it without sorting every value
         index = int((percentile / 100) * n)
         if index >= n:
             return {}
-        threshold = percentages[index]
+        threshold = float(np.partition(percentages, index)[index])
 
     # Filter words above threshold
     filtered = {
@@ -101,3 +106,64 @@ def filter_by_percentile(
     )
 
     return filtered
+
+
+def filter_table(
+    table: FrequencyTable, ignore_list: list[str], percentile: int
+) -> FrequencyTable:
+    """Apply filter_by_ignore_list and then filter_by_percentile to a table.
+
+    Same semantics as the dictionary filters, with percentages relative to
+    the unfiltered total, but computed on the counts array in one fused pass:
+    the ignore list becomes a vectorized row mask, the percentile threshold
+    is found with a partition of the remaining counts, and a single
+    selection applies both. Percentages are never built for the rows.
+
+    Rounded percentages grow monotonically with the count, so "percentage >=
+    threshold" is "count >= the smallest count that rounds to the
+    threshold", found with a binary search over counts.
+    """
+    keep = None
+    if ignore_list:
+        keep = ~table.rows_matching({word.lower() for word in ignore_list})
+
+    if percentile == 0 or not table:
+        return table if keep is None else table.select(keep)
+
+    counts = table.counts if keep is None else table.counts[keep]
+    n = len(counts)
+    if n == 0:
+        return table.select(keep)
+
+    if percentile == 100:
+        # Keep only words at maximum percentage
+        threshold_count = int(counts.max())
+    else:
+        index = int((percentile / 100) * n)
+        if index >= n:
+            return table.take(np.zeros(0, dtype=np.int64))
+        threshold_count = int(np.partition(counts, index)[index])
+    min_count = _smallest_count_with_percentage(table, threshold_count)
+
+    selected = table.counts >= min_count
+    if keep is not None:
+        selected &= keep
+
+    logging.debug(
+        f"Filtered to {int(selected.sum())} words at {percentile}th percentile "
+        f"(threshold: {table.percentage(threshold_count):.4f}%)"
+    )
+    return table.select(selected)
+
+
+def _smallest_count_with_percentage(table: FrequencyTable, count: int) -> int:
+    """Smallest count whose rounded percentage equals that of ``count``."""
+    threshold = table.percentage(count)
+    low, high = 1, count
+    while low < high:
+        middle = (low + high) // 2
+        if table.percentage(middle) >= threshold:
+            high = middle
+        else:
+            low = middle + 1
+    return low